@@ -0,0 +1,205 @@
+# AdminPanel/app/activity_buffer.py
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ActivityBuffer:
+    """Write-behind buffer for activity events
+
+    Events are collected in memory and handed to ``write_batch`` in one call
+    once ``batch_size`` events are pending or ``flush_interval`` seconds have
+    passed. Repeated ``last_active`` updates for a user collapse into one.
+
+    A write failing with one of ``retry_on`` (a locked or busy database) is
+    requeued and retried with exponential backoff. While writes keep
+    failing, at most ``max_buffered`` events are held; older ones are
+    dropped (and counted) first. Any other error is taken to be caused by
+    the rows themselves: the batch is written one event at a time and the
+    events that still fail are logged and dropped.
+    """
+
+    def __init__(self, write_batch, batch_size=200, flush_interval=0.05,
+                 max_pending=10000, max_buffered=100_000, max_backoff=5.0,
+                 retry_on=(sqlite3.OperationalError,)):
+        self.write_batch = write_batch
+        self.retry_on = retry_on
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_buffered = max(max_buffered, max_pending)
+        self.max_backoff = max_backoff
+
+        self._events = []
+        self._last_active = {}
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._worker = None
+        self._stopped = False
+        self._backoff = 0.0
+        self._retry_at = 0.0  # no flushes before this (monotonic) after a failure
+
+        # Metrics
+        self.flushes = 0
+        self.events_written = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+        atexit.register(self.close)
+
+    def append(self, event, user_id, last_active):
+        """Queue one event row and the user's latest activity time"""
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Activity buffer is closed")
+            self._events.append(event)
+            self._last_active[user_id] = last_active
+            self._trim()
+            pending = len(self._events)
+            if pending >= self.batch_size:
+                self._cond.notify()
+            if self._worker is None:
+                self._start_worker()
+            backing_off = time.monotonic() < self._retry_at
+
+        # Backpressure: the writer has fallen far behind, flush inline
+        # (unless writes are failing; then callers must not pay for retries)
+        if pending >= self.max_pending and not backing_off:
+            self.flush()
+
+    def _trim(self):
+        """Drop the oldest events past max_buffered (caller holds _cond)"""
+        excess = len(self._events) - self.max_buffered
+        if excess > 0:
+            del self._events[:excess]
+            self.dropped += excess
+            logger.error("Activity buffer full, dropped %d oldest events", excess)
+
+    def _start_worker(self):
+        self._worker = threading.Thread(
+            target=self._run, name='activity-buffer', daemon=True
+        )
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._events and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                # Wait out any backoff, then give the batch up to
+                # flush_interval to fill
+                while not self._stopped and time.monotonic() < self._retry_at:
+                    self._cond.wait(self._retry_at - time.monotonic())
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._events) < self.batch_size and not self._stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self.flush()
+
+    def flush(self):
+        """Write all pending events now; returns the number written"""
+        with self._flush_lock:
+            with self._cond:
+                events, self._events = self._events, []
+                last_active, self._last_active = self._last_active, {}
+            if not events:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                self.write_batch(events, list(last_active.items()))
+                written = len(events)
+            except self.retry_on as e:
+                self.failed_flushes += 1
+                self._requeue(events, last_active, e)
+                return 0
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.error("Activity flush failed, writing %d events one at a time: %s",
+                             len(events), e)
+                written, requeued = self._write_each(events, last_active)
+                if requeued:
+                    self.events_written += written
+                    return written
+
+            with self._cond:
+                self._backoff = self._retry_at = 0.0
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flushes += 1
+            self.events_written += written
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+            return written
+
+    def _requeue(self, events, last_active, error):
+        """Put unwritten events back at the front and back off (caller holds _flush_lock)"""
+        with self._cond:
+            self._events[:0] = events
+            self._trim()
+            for user_id, ts in last_active.items():
+                self._last_active.setdefault(user_id, ts)
+            self._backoff = min(self.max_backoff, max(self._backoff * 2, self.flush_interval))
+            self._retry_at = time.monotonic() + self._backoff
+        logger.error("Activity flush failed, requeueing %d events (retry in %.2fs): %s",
+                     len(events), self._backoff, error)
+
+    def _write_each(self, events, last_active):
+        """Write events singly, dropping the bad ones; returns (written, requeued)"""
+        written = 0
+        for i, event in enumerate(events):
+            try:
+                self.write_batch([event], [])
+            except self.retry_on as e:
+                self._requeue(events[i:], last_active, e)
+                return written, True
+            except Exception as e:
+                self.dropped += 1
+                logger.error("Dropped activity event %r: %s", event, e)
+            else:
+                written += 1
+        try:
+            self.write_batch([], list(last_active.items()))
+        except self.retry_on as e:
+            self._requeue([], last_active, e)
+            return written, True
+        except Exception as e:
+            logger.error("Dropped last_active updates for %d users: %s", len(last_active), e)
+        return written, False
+
+    def close(self):
+        """Stop the worker and flush whatever is still pending"""
+        with self._cond:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+        self.flush()
+        atexit.unregister(self.close)
+
+    def metrics(self):
+        """Queue depth and flush latency figures"""
+        with self._cond:
+            depth = len(self._events)
+        return {
+            'queue_depth': depth,
+            'flushes': self.flushes,
+            'failed_flushes': self.failed_flushes,
+            'dropped': self.dropped,
+            'events_written': self.events_written,
+            'last_flush_ms': round(self.last_flush_ms, 3),
+            'avg_flush_ms': round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+            'max_flush_ms': round(self.max_flush_ms, 3),
+        }
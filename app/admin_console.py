@@ -1,22 +1,35 @@
+from datetime import datetime
 from config.telegram_config import TelegramConfig
+from app.live_stats import get_live_stats
 
 class AdminConsole:
     @staticmethod
     def system_status():
-        """Get current system status"""
+        """Get current system status (from incrementally kept counters)"""
+        stats = get_live_stats().snapshot()
+        last = stats['last_activity']
         return {
             'bot_active': True,
-            'last_activity': '2023-08-25 14:30',
-            'users_connected': 5
+            'last_activity': datetime.fromtimestamp(last).strftime('%Y-%m-%d %H:%M') if last else 'never',
+            'users_connected': stats['active_users']['5m'],
+            'active_users': stats['active_users'],
+            'events': stats['events'],
+            'commands': stats['commands'],
+            'errors': stats['errors']
         }
 
     @classmethod
     def generate_report(cls):
         """Generate admin report"""
         status = cls.system_status()
+        active = status['active_users']
+        top_commands = sorted(status['commands'].items(), key=lambda item: -item[1])[:3]
         return (
             f"📊 Admin Report\n"
             f"Bot Token: {TelegramConfig.BOT_TOKEN[:5]}...\n"
             f"Last Active: {status['last_activity']}\n"
-            f"Connected Users: {status['users_connected']}"
+            f"Connected Users: {status['users_connected']}\n"
+            f"Active Users: {active['5m']} (5m) / {active['1h']} (1h) / {active['24h']} (24h)\n"
+            f"Events (1h): {status['events']['1h']}, Errors: {status['errors']}\n"
+            f"Top Commands: {', '.join(f'{c} ×{n}' for c, n in top_commands) or '-'}"
         )
@@ -1,23 +1,26 @@
 import logging
-from telegram_bot.bot import setup_bot
+from app.database import get_db
+from app.outbox import outbox_for
+from app.telegram_client import get_bot
 from config.telegram_config import TELEGRAM_ADMIN_ID
 
 class AdminPanel:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.bot = setup_bot()
+        # Send-only: the bot process does the polling
+        self.bot = get_bot()
         self.admin_id = TELEGRAM_ADMIN_ID
 
     def send_admin_notification(self, message):
-        """Send notification to admin via Telegram"""
-        try:
-            self.bot.bot.send_message(chat_id=self.admin_id, text=message)
-            self.logger.info(f"Notification sent to admin: {message}")
-        except Exception as e:
-            self.logger.error(f"Failed to send notification: {e}")
+        """Queue notification to admin via Telegram"""
+        if outbox_for(self.bot).send(self.admin_id, message, coalesce='activity'):
+            self.logger.info("Notification queued for admin: %s", message)
+        else:
+            self.logger.error("Failed to queue notification: %s", message)
 
     def monitor_activity(self, activity):
         """Monitor and log activities"""
-        log_message = f"Activity detected: {activity}"
-        self.logger.info(log_message)
-        self.send_admin_notification(log_message)
\ No newline at end of file
+        self.logger.info("Activity detected: %s", activity)
+        # Recorded so /find can search it later
+        get_db().log_activity(0, 'monitor', activity)
+        self.send_admin_notification(f"Activity detected: {activity}")
\ No newline at end of file
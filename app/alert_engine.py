@@ -0,0 +1,173 @@
+# AdminPanel/app/alert_engine.py
+import logging
+import operator
+import threading
+import time
+
+from app.monitor import SystemMonitor, summarize
+
+logger = logging.getLogger(__name__)
+
+COMPARATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+
+class Rule:
+    """Declarative alert rule over one sampled metric
+
+    ``aggregate`` is applied to the last ``window`` seconds of samples:
+    'last', 'min', 'avg', 'max', 'p95', or 'rate' (change per second, for
+    rate-of-change rules). The rule fires once the comparison has held for
+    ``for_seconds``. An open alert clears only when the value passes
+    ``clear`` (hysteresis; defaults to ``threshold``).
+    """
+
+    def __init__(self, name, metric, op, threshold, clear=None, window=0,
+                 aggregate='last', for_seconds=0, severity='medium', message=None):
+        if op not in COMPARATORS:
+            raise ValueError(f"Unknown comparison: {op}")
+        self.name = name
+        self.metric = metric
+        self.op = op
+        self.threshold = threshold
+        self.clear = threshold if clear is None else clear
+        self.window = window
+        self.aggregate = 'last' if window == 0 else aggregate
+        self.for_seconds = for_seconds
+        self.severity = severity
+        self.message = message or f"{metric} {self.aggregate} {op} {threshold}"
+
+    def firing(self, value):
+        return COMPARATORS[self.op](value, self.threshold)
+
+    def cleared(self, value):
+        # Cleared means the value is back on the safe side of ``clear``
+        return not COMPARATORS[self.op](value, self.clear)
+
+DEFAULT_RULES = (
+    Rule('high_memory', 'memory', '>', 80, clear=75, for_seconds=60,
+         message="High memory usage"),
+    Rule('high_cpu', 'cpu', '>', 90, clear=80, window=60, aggregate='avg',
+         message="Sustained high CPU"),
+    Rule('disk_full', 'disk', '>', 90, clear=85, severity='high',
+         message="Disk almost full"),
+    Rule('memory_leak', 'proc_rss', '>', 1024 * 1024, window=300, aggregate='rate',
+         for_seconds=300, severity='low', message="Bot RSS growing steadily"),
+)
+
+class WindowStats:
+    """Aggregates per (metric, window), each computed once per tick"""
+
+    def __init__(self, ring, interval, now):
+        self.ring = ring
+        self.interval = interval
+        self.now = now
+        self._values = {}
+        self._aggregates = {}
+
+    def value(self, metric, window, aggregate):
+        key = (metric, window, aggregate)
+        if key in self._aggregates:
+            return self._aggregates[key]
+
+        if window == 0:
+            latest = self.ring.latest()
+            result = None if latest is None else latest[metric]
+        else:
+            values = self._values.get((metric, window))
+            if values is None:
+                values = self._values[(metric, window)] = self.ring.window(metric, window, self.now)
+            if aggregate == 'rate':
+                # Newest first, one sample per interval
+                result = ((values[0] - values[-1]) / ((len(values) - 1) * self.interval)
+                          if len(values) > 1 else None)
+            elif aggregate == 'last':
+                result = values[0] if values else None
+            else:
+                stats = self._aggregates.get((metric, window, 'summary'))
+                if stats is None:
+                    stats = self._aggregates[(metric, window, 'summary')] = summarize(values)
+                result = None if stats is None else stats[aggregate]
+
+        self._aggregates[key] = result
+        return result
+
+class AlertEngine:
+    """Evaluates rules on a schedule and keeps one alert row per condition"""
+
+    def __init__(self, database, rules=DEFAULT_RULES, interval=10.0, notify=None):
+        self.db = database
+        self.rules = list(rules)
+        self.interval = interval
+        self.notify = notify
+        self._pending_since = {}  # rule name -> first time the condition held
+        self._open = {}           # rule name -> alert_id
+        self._stop = threading.Event()
+        self._thread = None
+        self._load_open_alerts()
+
+    def _load_open_alerts(self):
+        """Adopt unresolved rows so a restart does not duplicate alerts"""
+        names = {rule.name for rule in self.rules}
+        for alert in self.db.get_unresolved_alerts():
+            if alert['alert_type'] in names:
+                self._open.setdefault(alert['alert_type'], alert['alert_id'])
+
+    def evaluate(self, now=None):
+        """Run every rule once against the current sample window"""
+        sampler = SystemMonitor.start_sampler()
+        now = time.time() if now is None else now
+        stats = WindowStats(sampler.ring, sampler.interval, now)
+
+        for rule in self.rules:
+            value = stats.value(rule.metric, rule.window, rule.aggregate)
+            if value is not None:
+                self._apply(rule, value, now)
+
+    def _apply(self, rule, value, now):
+        alert_id = self._open.get(rule.name)
+
+        if alert_id is not None:
+            if rule.cleared(value):
+                del self._open[rule.name]
+                self._pending_since.pop(rule.name, None)
+                if self.db.resolve_alert(alert_id):
+                    self._send(f"✅ Resolved: {rule.message} ({rule.metric} {value:.1f})")
+            return
+
+        if not rule.firing(value):
+            self._pending_since.pop(rule.name, None)
+            return
+
+        since = self._pending_since.setdefault(rule.name, now)
+        if now - since >= rule.for_seconds:
+            message = f"{rule.message} ({rule.metric} {value:.1f})"
+            self._open[rule.name] = self.db.create_alert(rule.name, message, rule.severity)
+            self._send(message)
+
+    def _send(self, message):
+        if self.notify is not None:
+            try:
+                self.notify(message)
+            except Exception as e:
+                logger.error("Alert notification failed: %s", e)
+
+    def open_alerts(self):
+        return dict(self._open)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='alert-engine', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                logger.error("Alert evaluation failed: %s", e)
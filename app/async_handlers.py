@@ -0,0 +1,255 @@
+# AdminPanel/app/async_handlers.py
+"""
+Asyncio handler mode for the bot commands.
+
+python-telegram-bot 13 dispatches every update on a small pool of worker
+threads, so a handler blocked on SQLite or on a slow ``reply_text`` holds a
+worker for the whole call. In this mode the dispatcher callback only
+schedules a coroutine on a dedicated event loop and returns. Blocking calls
+are awaited on a bounded executor, so hundreds of updates can be in flight
+on a fixed number of threads.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from telegram import ParseMode
+from telegram.ext import CallbackQueryHandler, CommandHandler
+
+from app import bot_handlers
+from app.auth import get_auth
+from app.database import get_db
+from app.metrics import timed, timer
+from app.utilities import offload, rate_limited
+
+logger = logging.getLogger(__name__)
+
+class AsyncCommandRunner:
+    """Event loop thread that runs command coroutines"""
+
+    def __init__(self, max_in_flight=1000, io_workers=32):
+        self.max_in_flight = max_in_flight
+        self.executor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix='bot-io'
+        )
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(self.executor)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.loop.run_forever, name='bot-async', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.executor.shutdown(wait=False)
+
+    def submit(self, coro_func, update, context):
+        """Schedule a command coroutine; blocks only when max_in_flight is reached"""
+        self._slots.acquire()
+        try:
+            coro = coro_func(update, context)
+        except Exception:
+            self._slots.release()
+            raise
+        if not asyncio.iscoroutine(coro):
+            # Answered synchronously by a plain callback
+            self._slots.release()
+            return None
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        self._slots.release()
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Async command failed: %s", future.exception())
+
+    def callback(self, coro_func):
+        """Dispatcher callback that hands the update to the event loop"""
+        @functools.wraps(coro_func)
+        def dispatch(update, context):
+            self.submit(coro_func, update, context)
+        return dispatch
+
+async def reply(update, text, **kwargs):
+    with timer('telegram', 'reply_text'):
+        return await offload(update.message.reply_text, text, **kwargs)
+
+def restricted(command):
+    """Run the coroutine only for users whose role covers ``command``"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(update, context):
+            user_id = update.effective_user.id
+            if not get_auth().allowed(user_id, command):
+                await reply(update, bot_handlers.unauthorized_message(command))
+                logger.warning("Unauthorized /%s attempt by %s", command, user_id)
+                return
+            return await func(update, context)
+        return wrapper
+    return decorator
+
+# Core Commands
+@rate_limited(5, 60)  # 5 calls per minute
+@timed('handler')
+async def start(update, context):
+    """Welcome message and user registration"""
+    user = update.effective_user
+    await offload(bot_handlers.register_user, user)
+    await reply(update, bot_handlers.welcome_message(user), parse_mode=ParseMode.MARKDOWN)
+    get_db().log_activity(user.id, 'command', '/start')
+    logger.info("New start command from %s", user.id)
+
+@restricted('status')
+@timed('handler')
+async def status(update, context):
+    """System status overview (Admin only)"""
+    message = await offload(bot_handlers.status_message)
+    await reply(update, message, parse_mode=ParseMode.MARKDOWN)
+    get_db().log_activity(update.effective_user.id, 'command', '/status')
+
+# Admin Commands
+@restricted('alerts')
+@timed('handler')
+async def alerts(update, context):
+    """Show unresolved alerts a page at a time (Admin only)"""
+    options, error = bot_handlers.alert_options(context.args)
+    if error:
+        await reply(update, f"❌ {error}")
+        return
+    text, keyboard = await offload(bot_handlers.alerts_page, **options)
+    if text is None:
+        await reply(update, bot_handlers.empty_page_message('alerts'))
+        return
+    await reply(update, text, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
+    get_db().log_activity(update.effective_user.id, 'command', '/alerts')
+
+@restricted('log')
+@timed('handler')
+async def log(update, context):
+    """Show recent activities a page at a time (Admin only)"""
+    options, error = bot_handlers.log_options(context.args)
+    if error:
+        await reply(update, f"❌ {error}")
+        return
+    text, keyboard = await offload(bot_handlers.log_page, **options)
+    if text is None:
+        await reply(update, bot_handlers.empty_page_message('log'))
+        return
+    await reply(update, text, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
+    get_db().log_activity(update.effective_user.id, 'command', '/log')
+
+@timed('handler')
+async def page_callback(update, context):
+    """Next/previous page buttons of /log and /alerts (Admin only)"""
+    query = update.callback_query
+    command = query.data.split(':', 1)[0]
+    if not get_auth().allowed(query.from_user.id, command):
+        await offload(query.answer, bot_handlers.unauthorized_message(command), show_alert=True)
+        logger.warning("Unauthorized page request by %s", query.from_user.id)
+        return
+    text, keyboard = await offload(bot_handlers.callback_page, query.data)
+    await offload(query.answer)
+    with timer('telegram', 'edit_message_text'):
+        await offload(
+            query.edit_message_text,
+            text or bot_handlers.empty_page_message(command),
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=keyboard
+        )
+
+@restricted('broadcast')
+@timed('handler')
+async def broadcast(update, context):
+    """Send a message to every registered user (Owner only)"""
+    message = await offload(
+        bot_handlers.broadcast_command, context.bot,
+        update.effective_user.id, update.message.text
+    )
+    await reply(update, message)
+    get_db().log_activity(update.effective_user.id, 'command', '/broadcast')
+
+@restricted('metrics')
+@timed('handler')
+async def metrics(update, context):
+    """Call counts and latency histograms (Admin only)"""
+    for message in bot_handlers.metrics_messages():
+        await reply(update, message)
+
+@restricted('find')
+@timed('handler')
+async def find(update, context):
+    """Full-text search of activities or alerts, best match first (Admin only)"""
+    text, keyboard = await offload(bot_handlers.find_reply, context.args)
+    await reply(update, text, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
+    get_db().log_activity(update.effective_user.id, 'command', '/find')
+
+@restricted('stats')
+@timed('handler')
+async def stats(update, context):
+    """Activity counts per minute/hour/day from the rollups (Admin only)"""
+    for message in await offload(bot_handlers.stats_messages, context.args):
+        await reply(update, message, parse_mode=ParseMode.MARKDOWN)
+    get_db().log_activity(update.effective_user.id, 'command', '/stats')
+
+@restricted('export')
+@timed('handler')
+async def export(update, context):
+    """Stream a table to a file and send it (Admin only)"""
+    message = await offload(
+        bot_handlers.export_command, context.bot, update.message.chat_id, context.args
+    )
+    await reply(update, message)
+    get_db().log_activity(update.effective_user.id, 'command', f"/export {' '.join(context.args)}")
+
+@restricted('grant')
+@timed('handler')
+async def grant(update, context):
+    """Give a user admin rights (Owner only)"""
+    await reply(update, await offload(bot_handlers.role_command, 'grant', context.args))
+    get_db().log_activity(update.effective_user.id, 'command', f"/grant {' '.join(context.args)}")
+
+@restricted('revoke')
+@timed('handler')
+async def revoke(update, context):
+    """Take a user's admin rights away (Owner only)"""
+    await reply(update, await offload(bot_handlers.role_command, 'revoke', context.args))
+    get_db().log_activity(update.effective_user.id, 'command', f"/revoke {' '.join(context.args)}")
+
+COMMANDS = {
+    'start': start,
+    'status': status,
+    'alerts': alerts,
+    'log': log,
+    'metrics': metrics,
+    'broadcast': broadcast,
+    'find': find,
+    'stats': stats,
+    'export': export,
+    'grant': grant,
+    'revoke': revoke,
+}
+
+def setup_async_handlers(dispatcher, runner=None):
+    """Register the asyncio command handlers; returns the runner"""
+    runner = (runner or AsyncCommandRunner()).start()
+    for name, coro_func in COMMANDS.items():
+        dispatcher.add_handler(CommandHandler(name, runner.callback(coro_func)))
+    dispatcher.add_handler(CallbackQueryHandler(
+        runner.callback(page_callback), pattern=bot_handlers.PAGE_CALLBACK_PATTERN
+    ))
+
+    logger.info("Async bot command handlers registered")
+    return runner
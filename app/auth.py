@@ -0,0 +1,164 @@
+# AdminPanel/app/auth.py
+"""
+Who may run which bot command.
+
+Roles, lowest to highest:
+- user:  anyone
+- admin: users.is_admin = 1 in the database
+- owner: TelegramConfig.ADMIN_ID (and ADMIN_IDS, if configured)
+
+Each command needs a role (COMMAND_ROLES); a user may run it when their
+role is at least that high. The admin and owner IDs are held in memory as
+frozensets, so a check is a set lookup. Every change to users.is_admin,
+from /grant, /revoke or any other process sharing the database, bumps a
+version number stored in the database (migration 8). At most once every
+``refresh_interval`` seconds a check compares it with ``version`` and
+reloads the sets when it has moved.
+"""
+
+import logging
+import threading
+import time
+
+from config.telegram_config import TelegramConfig
+
+logger = logging.getLogger(__name__)
+
+ROLES = ('user', 'admin', 'owner')
+ROLE_LEVELS = {role: level for level, role in enumerate(ROLES)}
+
+# Command -> lowest role allowed to run it; unlisted commands need 'admin'
+COMMAND_ROLES = {
+    'start': 'user',
+    'status': 'admin',
+    'alerts': 'admin',
+    'log': 'admin',
+    'metrics': 'admin',
+    'broadcast': 'owner',
+    'find': 'admin',
+    'stats': 'admin',
+    'export': 'admin',
+    'grant': 'owner',
+    'revoke': 'owner',
+}
+DEFAULT_ROLE = 'admin'
+
+def configured_owner_ids():
+    """Owner IDs from TelegramConfig.ADMIN_ID and the optional ADMIN_IDS"""
+    ids = set(getattr(TelegramConfig, 'ADMIN_IDS', None) or ())
+    ids.add(TelegramConfig.ADMIN_ID)
+    return frozenset(int(user_id) for user_id in ids if str(user_id).lstrip('-').isdigit())
+
+class AuthService:
+    """Role checks against in-memory admin and owner sets"""
+
+    def __init__(self, database, owners=None, command_roles=None, refresh_interval=1.0):
+        self.db = database
+        self.owners = frozenset(owners) if owners is not None else configured_owner_ids()
+        self.command_roles = dict(COMMAND_ROLES, **(command_roles or {}))
+        self.refresh_interval = refresh_interval
+        self.version = None
+        self._admins = frozenset()
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Re-read users.is_admin; returns the stored version loaded"""
+        with self._lock:
+            self._load()
+            return self.version
+
+    def _load(self):
+        # Version first: a change in between only causes one extra reload
+        version = self.db.get_auth_version()
+        self._admins = frozenset(self.db.get_admin_ids()) | self.owners
+        self.version = version
+        self._next_check = time.monotonic() + self.refresh_interval
+        logger.info("Loaded %d admins (auth version %d)", len(self._admins), version)
+
+    def refresh(self):
+        """Reload if the stored version moved; returns whether it did"""
+        with self._lock:
+            self._next_check = time.monotonic() + self.refresh_interval
+            if self.db.get_auth_version() == self.version:
+                return False
+            self._load()
+            return True
+
+    def _check(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.refresh_interval  # one thread checks, not all
+        try:
+            self.refresh()
+        except Exception as e:
+            # Keep answering from the sets already loaded
+            logger.error("Auth refresh failed: %s", e)
+
+    # Checks
+    def role(self, user_id):
+        self._check()
+        if user_id in self.owners:
+            return 'owner'
+        if user_id in self._admins:
+            return 'admin'
+        return 'user'
+
+    def required_role(self, command):
+        return self.command_roles.get(command, DEFAULT_ROLE)
+
+    def allowed(self, user_id, command):
+        """Whether ``user_id`` may run ``command``"""
+        required = self.command_roles.get(command, DEFAULT_ROLE)
+        if required == 'user':
+            return True
+        self._check()
+        if required == 'admin':
+            return user_id in self._admins
+        return user_id in self.owners
+
+    def is_admin(self, user_id):
+        self._check()
+        return user_id in self._admins
+
+    def admins(self):
+        self._check()
+        return self._admins
+
+    # Changes
+    def grant(self, user_id):
+        """Make a user an admin; False if they already were"""
+        return self._set_admin(user_id, True)
+
+    def revoke(self, user_id):
+        """Take admin rights away; owners from config cannot be revoked"""
+        if user_id in self.owners:
+            raise ValueError(f"User {user_id} is an owner set in the config")
+        return self._set_admin(user_id, False)
+
+    def _set_admin(self, user_id, admin):
+        with self._lock:
+            self._load()  # decide on the current set, not a stale one
+            if (user_id in self._admins) == admin:
+                return False
+            # Database first: if the write fails the cached sets are unchanged
+            self.db.set_admin(user_id, admin)
+            self._load()
+        logger.info("%s admin rights for %s (auth version %d)",
+                    "Granted" if admin else "Revoked", user_id, self.version)
+        return True
+
+_auth = None
+_auth_lock = threading.Lock()
+
+def get_auth():
+    """Process-wide AuthService over the shared database"""
+    global _auth
+    if _auth is None:
+        with _auth_lock:
+            if _auth is None:
+                from app.database import get_db
+                _auth = AuthService(get_db())
+    return _auth
@@ -1,62 +1,67 @@
 # AdminPanel/app/bot_handlers.py
-from telegram import Update, ParseMode
-from telegram.ext import CallbackContext, CommandHandler
-from config.telegram_config import TelegramConfig
-from app.database import db
+from telegram import Update, ParseMode, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import CallbackContext, CommandHandler, CallbackQueryHandler
+from telegram.utils.helpers import escape_markdown
+from app.auth import get_auth
+from app.database import get_db
 from app.notifications import send_alert
 from app.utilities import timestamp, rate_limited
+from app.metrics import summary_lines, timed, timer
+import functools
+import itertools
 import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
-# Decorator to restrict commands to admin only
-def admin_only(func):
-    def wrapper(update: Update, context: CallbackContext):
-        user_id = update.effective_user.id
-        if str(user_id) != TelegramConfig.ADMIN_ID:
-            update.message.reply_text("⛔ Unauthorized: Admin access required")
-            logger.warning(f"Unauthorized access attempt by {user_id}")
-            return
-        return func(update, context)
-    return wrapper
+def unauthorized_message(command):
+    return f"⛔ Unauthorized: {get_auth().required_role(command).title()} access required"
 
-# Core Commands
-@rate_limited(5, 60)  # 5 calls per minute
-def start(update: Update, context: CallbackContext):
-    """Welcome message and user registration"""
-    user = update.effective_user
-    db.add_user({
+# Decorator to restrict commands by role (scopes in app/auth.py)
+def restricted(command):
+    """Run the handler only for users whose role covers ``command``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(update: Update, context: CallbackContext):
+            user_id = update.effective_user.id
+            if not get_auth().allowed(user_id, command):
+                reply(update, unauthorized_message(command))
+                logger.warning("Unauthorized /%s attempt by %s", command, user_id)
+                return
+            return func(update, context)
+        return wrapper
+    return decorator
+
+# Message builders (shared by the sync and asyncio handler modes)
+def register_user(user):
+    """Store the Telegram user behind an update"""
+    get_db().add_user({
         'id': user.id,
         'username': user.username,
         'first_name': user.first_name,
         'last_name': user.last_name
     })
-    
-    welcome_msg = (
+
+def welcome_message(user):
+    return (
         f"👋 Welcome *{user.first_name}*!\n"
         f"🆔 Your ID: `{user.id}`\n"
         f"🕒 {timestamp()}"
     )
-    
-    update.message.reply_text(
-        welcome_msg,
-        parse_mode=ParseMode.MARKDOWN
-    )
-    
-    # Log activity
-    db.log_activity(user.id, 'command', '/start')
-    logger.info(f"New start command from {user.id}")
 
-@admin_only
-def status(update: Update, context: CallbackContext):
-    """System status overview (Admin only)"""
+RESOURCE_LABELS = {'cpu': 'CPU', 'memory': 'Memory', 'disk': 'Disk'}
+
+def status_message():
     from app.monitor import SystemMonitor
     from app.admin_console import AdminConsole
     
     resources = SystemMonitor.check_resources()
     report = AdminConsole.generate_report()
     
-    status_msg = (
+    message = (
         "📊 *System Status*\n"
         "━━━━━━━━━━━━━━\n"
         f"{report}\n\n"
@@ -67,68 +72,729 @@ def status(update: Update, context: CallbackContext):
         f"• Disk: {resources['disk']}%"
     )
     
-    update.message.reply_text(
-        status_msg,
+    # avg/p95 over the sampler's 1m/5m/15m windows, once it has data
+    trends = [
+        f"• {RESOURCE_LABELS[field]}: " + "  ".join(
+            f"{name} {s['avg']:.0f}/{s['p95']:.0f}%"
+            for name, s in windows.items() if s
+        )
+        for field, windows in SystemMonitor.resource_stats().items()
+        if any(windows.values())
+    ]
+    if trends:
+        message += "\n\n📈 *Load avg/p95*\n━━━━━━━━━━━━━━\n" + "\n".join(trends)
+    return message
+
+# Paged listings: keyset cursors (log_id/alert_id) travel in the callback data
+PAGE_SIZE = 10
+MAX_PAGE_SIZE = 25
+LINE_LIMIT = 150        # characters of user text shown per row
+MESSAGE_LIMIT = 4096    # Telegram's limit for one message
+FILTER_LIMIT = 24       # UTF-8 bytes; keeps callback data under Telegram's 64 bytes
+SEPARATOR = "━━━━━━━━━━━━━━"
+PAGE_CALLBACK_PATTERN = r'^(log|alerts):[no]\d+:|^find:\d+:\d+$'
+
+def shorten(text, limit=LINE_LIMIT):
+    text = str(text or '')
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def md(text, limit=LINE_LIMIT):
+    """User text made safe to embed in a Markdown message"""
+    return escape_markdown(shorten(text, limit))
+
+def chunk_lines(lines, header='', limit=MESSAGE_LIMIT):
+    """Yield lists of lines that each fit in one message after the header
+
+    Messages are split only between lines, and every line is a complete
+    Markdown unit, so no entity is ever left open across a split.
+    """
+    chunk, size = [], len(header)
+    for line in lines:
+        line = line[:limit - len(header) - 1]
+        if chunk and size + 1 + len(line) > limit:
+            yield chunk
+            chunk, size = [], len(header)
+        chunk.append(line)
+        size += 1 + len(line)
+    if chunk:
+        yield chunk
+
+def parse_page_args(args, bare=None):
+    """Parse `[n] [key=value ...]` command arguments
+
+    A bare number is the page size; any other bare word is stored under
+    ``bare``. Returns (options, error).
+    """
+    options = {}
+    for arg in args or ():
+        key, sep, value = arg.partition('=')
+        if not sep:
+            if arg.isdigit():
+                options['limit'] = max(1, min(int(arg), MAX_PAGE_SIZE))
+                continue
+            key, value = bare, arg
+        if key is None:
+            return None, f"Unknown argument: {arg}"
+        if not value or ':' in value or len(value.encode()) > FILTER_LIMIT:
+            return None, f"Invalid value for {key}"
+        options[key] = value
+    return options, None
+
+def fetch_page(get_page, key, before_id=None, after_id=None, limit=PAGE_SIZE, **filters):
+    """One page of rows plus whether older/newer rows exist
+
+    Asks for one extra row to find out if there is another page.
+    """
+    rows = get_page(before_id=before_id, after_id=after_id, limit=limit + 1, **filters)
+    if after_id is not None:
+        has_newer, has_older = len(rows) > limit, True
+        rows = rows[-limit:]
+        if not rows:
+            # Everything newer is gone; start over from the newest row
+            return fetch_page(get_page, key, limit=limit, **filters)
+    else:
+        has_newer, has_older = before_id is not None, len(rows) > limit
+        rows = rows[:limit]
+    return rows, has_older, has_newer
+
+def page_keyboard(kind, rows, key, shown, has_older, has_newer, limit, filters):
+    """◀ Newer / Older ▶ buttons; each click fetches exactly one page"""
+    if shown < len(rows):
+        has_older = True  # rows cut to fit the message come next
+    suffix = ':'.join([str(limit)] + [str(value or '') for value in filters])
+    buttons = []
+    if has_newer:
+        buttons.append(InlineKeyboardButton(
+            "◀ Newer", callback_data=f"{kind}:n{rows[0][key]}:{suffix}"
+        ))
+    if has_older:
+        buttons.append(InlineKeyboardButton(
+            "Older ▶", callback_data=f"{kind}:o{rows[shown - 1][key]}:{suffix}"
+        ))
+    return InlineKeyboardMarkup([buttons]) if buttons else None
+
+def render_page(kind, title, rows, lines, key, has_older, has_newer, limit, filters):
+    """Message text and keyboard for the rows that fit in one message"""
+    header = f"{title}\n{SEPARATOR}\n"
+    shown = next(chunk_lines(lines, header))
+    keyboard = page_keyboard(kind, rows, key, len(shown), has_older, has_newer, limit, filters)
+    return header + "\n".join(shown), keyboard
+
+def alerts_page(before_id=None, after_id=None, limit=PAGE_SIZE, severity=None):
+    """Unresolved alerts page as (text, keyboard), or (None, None) when empty"""
+    rows, has_older, has_newer = fetch_page(
+        get_db().get_alert_page, 'alert_id', before_id, after_id, limit, severity=severity
+    )
+    if not rows:
+        return None, None
+
+    lines = [
+        f"⚠️ {md(alert['alert_type']).upper()}: {md(alert['message'])}"
+        f" (ID: {alert['alert_id']})"
+        for alert in rows
+    ]
+    title = "🚨 *Active Alerts*" + (f" ({md(severity)})" if severity else "")
+    return render_page('alerts', title, rows, lines, 'alert_id',
+                       has_older, has_newer, limit, (severity,))
+
+def log_page(before_id=None, after_id=None, limit=PAGE_SIZE, user_id=None, activity_type=None):
+    """Activity log page as (text, keyboard), or (None, None) when empty"""
+    rows, has_older, has_newer = fetch_page(
+        get_db().get_activity_page, 'log_id', before_id, after_id, limit,
+        user_id=user_id, activity_type=activity_type
+    )
+    if not rows:
+        return None, None
+
+    lines = [
+        f"{a['timestamp']} - {md(a['activity_type'])}: {md(a['details'])}"
+        for a in rows
+    ]
+    title = "📝 *Recent Activities*"
+    if activity_type or user_id is not None:
+        title += " (" + ", ".join(
+            f"{name}={md(value)}" for name, value in
+            (('type', activity_type), ('user', user_id)) if value is not None
+        ) + ")"
+    return render_page('log', title, rows, lines, 'log_id',
+                       has_older, has_newer, limit, (activity_type, user_id))
+
+def log_options(args):
+    """Keyword arguments for log_page from `/log [n] [type=..] [user=..]`"""
+    options, error = parse_page_args(args)
+    if error:
+        return None, error
+    unknown = set(options) - {'limit', 'type', 'user'}
+    if unknown:
+        return None, f"Unknown filter: {', '.join(sorted(unknown))}"
+    user = options.pop('user', None)
+    if user is not None:
+        if not user.lstrip('-').isdigit():
+            return None, "user must be a numeric ID"
+        options['user_id'] = int(user)
+    if 'type' in options:
+        options['activity_type'] = options.pop('type')
+    return options, None
+
+def alert_options(args):
+    """Keyword arguments for alerts_page from `/alerts [n] [severity]`"""
+    options, error = parse_page_args(args, bare='severity')
+    if error:
+        return None, error
+    unknown = set(options) - {'limit', 'severity'}
+    if unknown:
+        return None, f"Unknown filter: {', '.join(sorted(unknown))}"
+    return options, None
+
+# Full-text search: ranked pages by offset; the query stays server-side
+# (callback data is capped at 64 bytes) under a short search number
+FIND_USAGE = (
+    "Usage: /find <words or FTS5 query> [in=alerts] [since=YYYY-MM-DD]"
+    " [until=YYYY-MM-DD] [type=..] [severity=..] [sort=new]"
+)
+FIND_OPERATORS = ('AND', 'OR', 'NOT', 'NEAR')
+MAX_FIND_OFFSET = 500
+SEARCHES_KEPT = 256
+
+_searches = OrderedDict()  # search number -> find options
+_search_numbers = itertools.count(1)
+_searches_lock = threading.Lock()
+
+def fts_query(text):
+    """Plain words become an AND of quoted terms; FTS5 syntax passes through"""
+    words = text.split()
+    if '"' in text or '*' in text or '(' in text or any(w in FIND_OPERATORS for w in words):
+        return text
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in words)
+
+def find_options(args):
+    """Options for find_page from `/find` arguments; returns (options, error)"""
+    from app.export import parse_time
+
+    options, words = {'source': 'log', 'newest': False}, []
+    for arg in args or ():
+        key, sep, value = arg.partition('=')
+        if not sep or key not in ('in', 'since', 'until', 'type', 'severity', 'sort'):
+            words.append(arg)
+        elif key == 'in' and value in ('log', 'alerts'):
+            options['source'] = value
+        elif key == 'sort' and value in ('new', 'rank'):
+            options['newest'] = value == 'new'
+        elif key in ('since', 'until'):
+            try:
+                options[key] = parse_time(value)
+            except ValueError:
+                return None, f"Invalid date for {key}: {value}"
+        elif key in ('type', 'severity') and value and len(value.encode()) <= FILTER_LIMIT:
+            options['kind' if key == 'type' else key] = value
+        else:
+            return None, f"Invalid value for {key}"
+    if not words:
+        return None, FIND_USAGE
+    if 'severity' in options and options['source'] != 'alerts':
+        return None, "severity= needs in=alerts"
+    options['text'] = ' '.join(words)
+    return options, None
+
+def remember_search(options):
+    with _searches_lock:
+        number = next(_search_numbers)
+        _searches[number] = options
+        if len(_searches) > SEARCHES_KEPT:
+            _searches.popitem(last=False)
+    return number
+
+def highlight(snippet):
+    """Escaped snippet with the matched terms in bold"""
+    from app.database import MATCH_END, MATCH_START
+
+    text = md(snippet)
+    if text.count(MATCH_START) > text.count(MATCH_END):
+        text += MATCH_END  # the match was cut off by shorten()
+    return text.replace(MATCH_START, '*').replace(MATCH_END, '*')
+
+def find_page(number, offset=0, limit=PAGE_SIZE):
+    """Search results page as (text, keyboard); text is None when nothing matches
+
+    Raises sqlite3.OperationalError for an invalid FTS5 query.
+    """
+    options = _searches.get(number)
+    if options is None:
+        return "⌛ This search has expired; run /find again", None
+    if options['source'] == 'alerts':
+        search = get_db().search_alerts
+        filters = {'alert_type': options.get('kind'), 'severity': options.get('severity')}
+    else:
+        search = get_db().search_activities
+        filters = {'activity_type': options.get('kind')}
+    rows = search(
+        fts_query(options['text']), limit=limit + 1, offset=offset,
+        since=options.get('since'), until=options.get('until'),
+        newest=options['newest'], **filters
+    )
+    if not rows:
+        return None, None
+
+    if options['source'] == 'alerts':
+        lines = [
+            f"{'✅' if row['resolved'] else '⚠️'} {row['created_at']} {md(row['alert_type']).upper()}:"
+            f" {highlight(row['snippet'])} (ID: {row['alert_id']})"
+            for row in rows[:limit]
+        ]
+    else:
+        lines = [
+            f"{row['timestamp']} - {md(row['activity_type'])}: {highlight(row['snippet'])}"
+            for row in rows[:limit]
+        ]
+    title = f"🔎 *{'Alerts' if options['source'] == 'alerts' else 'Activities'} matching* {md(options['text'], 60)}"
+    header = f"{title}\n{SEPARATOR}\n"
+    shown = next(chunk_lines(lines, header))
+
+    buttons = []
+    if offset:
+        buttons.append(InlineKeyboardButton(
+            "◀ Previous", callback_data=f"find:{number}:{max(0, offset - limit)}"
+        ))
+    next_offset = offset + len(shown)
+    if (len(rows) > limit or len(shown) < len(lines)) and next_offset <= MAX_FIND_OFFSET:
+        buttons.append(InlineKeyboardButton("Next ▶", callback_data=f"find:{number}:{next_offset}"))
+    return header + "\n".join(shown), InlineKeyboardMarkup([buttons]) if buttons else None
+
+def callback_page(data):
+    """Re-render the page a navigation button points at
+
+    Returns (text, keyboard); text is None when the listing is empty.
+    """
+    if data.startswith('find:'):
+        _, number, offset = data.split(':')
+        return find_page(int(number), min(int(offset), MAX_FIND_OFFSET))
+    kind, cursor, limit, *filters = data.split(':')
+    position = {'n': 'after_id', 'o': 'before_id'}[cursor[0]]
+    options = {position: int(cursor[1:]), 'limit': max(1, min(int(limit), MAX_PAGE_SIZE))}
+    if kind == 'alerts':
+        return alerts_page(severity=filters[0] or None, **options)
+    activity_type, user_id = filters
+    return log_page(
+        activity_type=activity_type or None,
+        user_id=int(user_id) if user_id else None,
+        **options
+    )
+
+def empty_page_message(kind):
+    if kind == 'find':
+        return "🔎 No matches"
+    return "✅ No active alerts" if kind == 'alerts' else "📭 No matching activities"
+
+def find_reply(args):
+    """Reply (text, keyboard) for a /find command"""
+    options, error = find_options(args)
+    if error:
+        return (error if error == FIND_USAGE else f"❌ {error}"), None
+    try:
+        text, keyboard = find_page(remember_search(options))
+    except sqlite3.OperationalError as e:
+        return f"❌ Invalid search: {e}", None
+    return text or empty_page_message('find'), keyboard
+
+def reply(update, text, **kwargs):
+    """update.message.reply_text, timed as a Telegram API call"""
+    with timer('telegram', 'reply_text'):
+        return update.message.reply_text(text, **kwargs)
+
+def metrics_messages():
+    """Per-call latency summary, split into messages that fit Telegram"""
+    lines = summary_lines()
+    if not lines:
+        return ["📈 No calls recorded yet"]
+    header = "📈 Metrics (latency bucket upper bounds)\n"
+    return [header + "\n".join(chunk) for chunk in chunk_lines(lines, header)]
+
+BROADCAST_USAGE = (
+    "Usage:\n"
+    "/broadcast <message> - send to every registered user\n"
+    "/broadcast status|resume|cancel <id>"
+)
+
+def broadcast_command(bot, user_id, text):
+    """Carry out a /broadcast command; returns the reply text"""
+    from app.broadcast import broadcaster_for
+
+    parts = (text or '').split(None, 1)
+    body = parts[1].strip() if len(parts) > 1 else ''
+    if not body:
+        return BROADCAST_USAGE
+
+    broadcaster = broadcaster_for(bot)
+    action, _, argument = body.partition(' ')
+    if action not in ('status', 'resume', 'cancel'):
+        broadcast_id = broadcaster.start(body, created_by=user_id)
+        return f"📣 Broadcast #{broadcast_id} started; a report follows when it finishes"
+    # Never broadcast a mistyped management command to everyone
+    argument = argument.strip().lstrip('#')
+    if not argument.isdigit():
+        return BROADCAST_USAGE
+
+    broadcast_id = int(argument)
+    state = broadcaster.status(broadcast_id)
+    if state is None:
+        return f"❌ No broadcast #{broadcast_id}"
+    if action == 'resume':
+        if state['status'] == 'done':
+            return f"✅ Broadcast #{broadcast_id} already finished"
+        if not broadcaster.resume(broadcast_id):
+            return f"⏳ Broadcast #{broadcast_id} is already running"
+        return f"▶️ Resuming broadcast #{broadcast_id} after user {state['last_user_id']}"
+    if action == 'cancel':
+        if not broadcaster.cancel(broadcast_id):
+            return f"❌ Broadcast #{broadcast_id} is not running"
+        return f"⏹ Cancelling broadcast #{broadcast_id}"
+
+    handled = state['sent'] + state['failed'] + state['blocked']
+    return (
+        f"📣 Broadcast #{broadcast_id}: {state['status']}, {handled}/{state['total']} handled\n"
+        f"Sent: {state['sent']}, Blocked: {state['blocked']}, Failed: {state['failed']}"
+    )
+
+def role_command(action, args):
+    """Carry out /grant or /revoke <user_id>; returns the reply text"""
+    if len(args or ()) != 1 or not args[0].lstrip('-').isdigit():
+        return f"Usage: /{action} <user_id>"
+    user_id = int(args[0])
+    auth = get_auth()
+    try:
+        changed = auth.grant(user_id) if action == 'grant' else auth.revoke(user_id)
+    except ValueError as e:
+        return f"❌ {e}"
+    if action == 'grant':
+        return f"✅ {user_id} is now an admin" if changed else f"ℹ️ {user_id} is already an admin"
+    return f"✅ {user_id} is no longer an admin" if changed else f"ℹ️ {user_id} is not an admin"
+
+EXPORT_USAGE = (
+    "Usage: /export <activity_log|alerts|users> [csv|jsonl|parquet]"
+    " [since=YYYY-MM-DD] [until=YYYY-MM-DD] [type=...]"
+)
+
+def export_command(bot, chat_id, args):
+    """Start an /export; the file follows as a document. Returns the reply text"""
+    from app.export import FORMATS, TABLES, export_to_chat, parse_time
+
+    args = list(args or ())
+    if not args or args[0] not in TABLES:
+        return EXPORT_USAGE
+    table, fmt, filters = args[0], 'csv', {}
+    for arg in args[1:]:
+        key, sep, value = arg.partition('=')
+        if not sep and arg in FORMATS:
+            fmt = arg
+        elif key in ('since', 'until') and value:
+            try:
+                parse_time(value)
+            except ValueError:
+                return f"❌ Invalid date for {key}: {value}"
+            filters[key] = value
+        elif key == 'type' and value and TABLES[table][1]:
+            filters['kind'] = value
+        else:
+            return f"❌ Unknown argument: {arg}\n{EXPORT_USAGE}"
+
+    if not export_to_chat(bot, chat_id, table, fmt, **filters):
+        return "⏳ An export is already running"
+    return f"📦 Exporting {table} as {fmt}; the file follows when it is ready"
+
+STATS_USAGE = (
+    "Usage: /stats [30m|24h|7d|...] [type=..] [command=/start] [user=<id>]"
+    " [by=minute|hour|day]"
+)
+STATS_SPANS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+MAX_STATS_SPAN = 400  # days
+MAX_STATS_BUCKETS = 400  # lines of series: 400d by day, but not 7d by minute
+
+def stats_messages(args):
+    """Activity counts over a time range, answered from the rollup tables"""
+    from datetime import timedelta
+    from app.rollups import PERIODS, STEPS, USER_PERIODS, get_rollups, last, pick_period
+
+    span, label, options = timedelta(hours=24), '24h', {}
+    for arg in args or ():
+        key, sep, value = arg.partition('=')
+        if not sep and arg[:-1].isdigit() and arg[-1:] in STATS_SPANS and int(arg[:-1]):
+            span, label = timedelta(**{STATS_SPANS[arg[-1]]: int(arg[:-1])}), arg
+        elif key in ('type', 'command', 'by') and value and len(value.encode()) <= FILTER_LIMIT:
+            options[key] = value
+        elif key == 'user' and value.lstrip('-').isdigit():
+            options['user_id'] = int(value)
+        else:
+            return [f"❌ Unknown argument: {arg}\n{STATS_USAGE}"]
+    if span > timedelta(days=MAX_STATS_SPAN):
+        return [f"❌ The longest range is {MAX_STATS_SPAN}d"]
+
+    user_id = options.get('user_id')
+    period = options.pop('by', None) or pick_period(span, user_id)
+    if period not in PERIODS or (user_id is not None and period not in USER_PERIODS):
+        return [f"❌ by= must be {' or '.join(USER_PERIODS if user_id is not None else PERIODS)}"]
+    if span / STEPS[period] > MAX_STATS_BUCKETS:
+        return [f"❌ {label} by {period} is over {MAX_STATS_BUCKETS} rows; use a coarser by="]
+    if user_id is not None and 'command' in options:
+        return ["❌ command= cannot be combined with user="]
+    activity_type = options.get('type')
+    command = options.get('command')
+    if command is not None:
+        activity_type = 'command'
+
+    started = time.perf_counter()
+    rollups = get_rollups()
+    # Count what arrived since the last background run; one batch at most,
+    # and none if the background compactor is busy catching up
+    rollups.compact(max_batches=1, blocking=False)
+    since, until = last(span, period)
+    series = rollups.series(since, until, period, activity_type, command, user_id)
+    top = rollups.top(since, until, period, activity_type, command, user_id)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    filters = [f"{name}={md(value)}" for name, value in
+               (('type', activity_type), ('command', command), ('user', user_id))
+               if value is not None]
+    title = f"📊 *Activity, last {md(label)} by {period}*"
+    if filters:
+        title += f" ({', '.join(filters)})"
+    total = sum(events for _, events in series)
+    lines = [f"Total: {total} events"]
+    if top and command is None:
+        lines.append("*Top commands*" if activity_type == 'command' and user_id is None else "*Top types*")
+        lines.extend(f"• {md(name or '-')}: {events}" for name, events in top)
+    if series:
+        lines.append(f"*Per {period}*")
+        suffix = ':00' if period == 'hour' else ''
+        lines.extend(f"`{bucket}{suffix}` {events}" for bucket, events in series)
+    lines.append(f"_{elapsed:.1f} ms from rollups_")
+
+    header = f"{title}\n{SEPARATOR}\n"
+    return [header + "\n".join(chunk) for chunk in chunk_lines(lines, header)]
+
+def send_page(update, text, keyboard):
+    reply(
+        update,
+        text,
+        parse_mode=ParseMode.MARKDOWN,
+        reply_markup=keyboard
+    )
+
+# Core Commands
+@rate_limited(5, 60)  # 5 calls per minute
+@timed('handler')
+def start(update: Update, context: CallbackContext):
+    """Welcome message and user registration"""
+    user = update.effective_user
+    register_user(user)
+    
+    reply(
+        update,
+        welcome_message(user),
+        parse_mode=ParseMode.MARKDOWN
+    )
+    
+    # Log activity
+    get_db().log_activity(user.id, 'command', '/start')
+    logger.info("New start command from %s", user.id)
+
+@restricted('status')
+@timed('handler')
+def status(update: Update, context: CallbackContext):
+    """System status overview (Admin only)"""
+    reply(
+        update,
+        status_message(),
         parse_mode=ParseMode.MARKDOWN
     )
-    db.log_activity(update.effective_user.id, 'command', '/status')
+    get_db().log_activity(update.effective_user.id, 'command', '/status')
 
 # Admin Commands
-@admin_only
+@restricted('alerts')
+@timed('handler')
 def alerts(update: Update, context: CallbackContext):
-    """Show unresolved alerts (Admin only)"""
-    alerts = db.get_unresolved_alerts()
-    
-    if not alerts:
-        update.message.reply_text("✅ No active alerts")
+    """Show unresolved alerts a page at a time (Admin only)
+
+    Usage: /alerts [n] [severity]
+    """
+    options, error = alert_options(context.args)
+    if error:
+        reply(update, f"❌ {error}")
         return
     
-    alert_list = "\n".join(
-        f"⚠️ {alert['alert_type'].upper()}: {alert['message']}"
-        f" (ID: {alert['alert_id']})"
-        for alert in alerts
-    )
+    text, keyboard = alerts_page(**options)
+    if text is None:
+        reply(update, empty_page_message('alerts'))
+        return
     
-    update.message.reply_text(
-        f"🚨 *Active Alerts*\n━━━━━━━━━━━━━━\n{alert_list}",
-        parse_mode=ParseMode.MARKDOWN
-    )
-    db.log_activity(update.effective_user.id, 'command', '/alerts')
+    send_page(update, text, keyboard)
+    get_db().log_activity(update.effective_user.id, 'command', '/alerts')
 
-@admin_only
+@restricted('log')
+@timed('handler')
 def log(update: Update, context: CallbackContext):
-    """Show recent activities (Admin only)"""
-    activities = db.get_recent_activities(5)
+    """Show recent activities a page at a time (Admin only)
+
+    Usage: /log [n] [type=<activity_type>] [user=<user_id>]
+    """
+    options, error = log_options(context.args)
+    if error:
+        reply(update, f"❌ {error}")
+        return
     
-    activity_list = "\n".join(
-        f"{a['timestamp']} - {a['activity_type']}: {a['details'] or ''}"
-        for a in activities
-    )
+    text, keyboard = log_page(**options)
+    if text is None:
+        reply(update, empty_page_message('log'))
+        return
     
-    update.message.reply_text(
-        f"📝 *Recent Activities*\n━━━━━━━━━━━━━━\n{activity_list}",
-        parse_mode=ParseMode.MARKDOWN
-    )
-    db.log_activity(update.effective_user.id, 'command', '/log')
+    send_page(update, text, keyboard)
+    get_db().log_activity(update.effective_user.id, 'command', '/log')
+
+@timed('handler')
+def page_callback(update: Update, context: CallbackContext):
+    """Next/previous page buttons of /log and /alerts (Admin only)"""
+    query = update.callback_query
+    command = query.data.split(':', 1)[0]
+    if not get_auth().allowed(query.from_user.id, command):
+        query.answer(unauthorized_message(command), show_alert=True)
+        logger.warning("Unauthorized page request by %s", query.from_user.id)
+        return
+    
+    text, keyboard = callback_page(query.data)
+    query.answer()
+    with timer('telegram', 'edit_message_text'):
+        query.edit_message_text(
+            text or empty_page_message(command),
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=keyboard
+        )
+
+@restricted('broadcast')
+@timed('handler')
+def broadcast(update: Update, context: CallbackContext):
+    """Send a message to every registered user (Owner only)"""
+    reply(update, broadcast_command(context.bot, update.effective_user.id, update.message.text))
+    get_db().log_activity(update.effective_user.id, 'command', '/broadcast')
+
+@restricted('metrics')
+@timed('handler')
+def metrics(update: Update, context: CallbackContext):
+    """Call counts and latency histograms (Admin only)"""
+    for message in metrics_messages():
+        reply(update, message)
+
+@restricted('find')
+@timed('handler')
+def find(update: Update, context: CallbackContext):
+    """Full-text search of activities or alerts, best match first (Admin only)
+
+    Usage: /find <query> [in=alerts] [since=..] [until=..] [type=..] [sort=new]
+    """
+    text, keyboard = find_reply(context.args)
+    send_page(update, text, keyboard)
+    get_db().log_activity(update.effective_user.id, 'command', '/find')
+
+@restricted('stats')
+@timed('handler')
+def stats(update: Update, context: CallbackContext):
+    """Activity counts per minute/hour/day from the rollups (Admin only)
+
+    Usage: /stats [24h|7d|...] [type=..] [command=/start] [user=<id>] [by=hour]
+    """
+    for message in stats_messages(context.args):
+        reply(update, message, parse_mode=ParseMode.MARKDOWN)
+    get_db().log_activity(update.effective_user.id, 'command', '/stats')
+
+@restricted('export')
+@timed('handler')
+def export(update: Update, context: CallbackContext):
+    """Stream a table to a file and send it (Admin only)
+
+    Usage: /export <table> [csv|jsonl|parquet] [since=..] [until=..] [type=..]
+    """
+    reply(update, export_command(context.bot, update.message.chat_id, context.args))
+    get_db().log_activity(update.effective_user.id, 'command', f"/export {' '.join(context.args)}")
+
+@restricted('grant')
+@timed('handler')
+def grant(update: Update, context: CallbackContext):
+    """Give a user admin rights (Owner only)
+
+    Usage: /grant <user_id>
+    """
+    reply(update, role_command('grant', context.args))
+    get_db().log_activity(update.effective_user.id, 'command', f"/grant {' '.join(context.args)}")
+
+@restricted('revoke')
+@timed('handler')
+def revoke(update: Update, context: CallbackContext):
+    """Take a user's admin rights away (Owner only)
+
+    Usage: /revoke <user_id>
+    """
+    reply(update, role_command('revoke', context.args))
+    get_db().log_activity(update.effective_user.id, 'command', f"/revoke {' '.join(context.args)}")
 
 # Command Handlers Setup
-def setup_handlers(dispatcher):
-    """Register all command handlers"""
+def setup_handlers(dispatcher, mode='sync'):
+    """Register all command handlers
+
+    mode='async' runs the commands as coroutines on a dedicated event loop
+    instead of blocking the dispatcher worker threads.
+    """
+    if mode == 'async':
+        from app.async_handlers import setup_async_handlers
+        return setup_async_handlers(dispatcher)
+    if mode != 'sync':
+        raise ValueError(f"Unknown handler mode: {mode}")
+
     dispatcher.add_handler(CommandHandler("start", start))
     dispatcher.add_handler(CommandHandler("status", status))
     dispatcher.add_handler(CommandHandler("alerts", alerts))
     dispatcher.add_handler(CommandHandler("log", log))
+    dispatcher.add_handler(CommandHandler("metrics", metrics))
+    dispatcher.add_handler(CommandHandler("broadcast", broadcast))
+    dispatcher.add_handler(CommandHandler("find", find))
+    dispatcher.add_handler(CommandHandler("stats", stats))
+    dispatcher.add_handler(CommandHandler("export", export))
+    dispatcher.add_handler(CommandHandler("grant", grant))
+    dispatcher.add_handler(CommandHandler("revoke", revoke))
+    dispatcher.add_handler(CallbackQueryHandler(page_callback, pattern=PAGE_CALLBACK_PATTERN))
     
     logger.info("Bot command handlers registered")
 
 # Example usage when testing
 if __name__ == '__main__':
-    from telegram.ext import Updater
+    import os
+    import sys
+    from app.telegram_client import updater_for
     logging.basicConfig(level=logging.INFO)
     
-    updater = Updater(token=TelegramConfig.BOT_TOKEN, use_context=True)
-    setup_handlers(updater.dispatcher)
+    # BOT_HANDLER_MODE=async or --async selects the asyncio handlers
+    mode = 'async' if '--async' in sys.argv else os.environ.get('BOT_HANDLER_MODE', 'sync')
+    
+    updater = updater_for()
+    setup_handlers(updater.dispatcher, mode=mode)
+    
+    # Periodic resource alerts
+    from app.alert_engine import AlertEngine
+    AlertEngine(get_db(), notify=send_alert).start()
+    
+    # Keep the /stats rollups current, and count activity for /status from
+    # the first event rather than the first /status
+    from app.rollups import get_rollups
+    from app.live_stats import get_live_stats
+    get_rollups()
+    get_live_stats()
+    
+    # Pick up broadcasts interrupted by the last shutdown
+    from app.broadcast import broadcaster_for
+    broadcaster_for(updater.bot).resume_unfinished()
+    
+    # Prometheus scrape endpoint, e.g. METRICS_PORT=9108
+    if os.environ.get('METRICS_PORT'):
+        from app.metrics import start_metrics_server
+        start_metrics_server(int(os.environ['METRICS_PORT']))
     
-    print("Test handlers registered. Use /start, /status, etc.")
+    print(f"Test handlers registered ({mode} mode). Use /start, /status, etc.")
     updater.start_polling()
-    updater.idle()
\ No newline at end of file
+    updater.idle()
@@ -0,0 +1,243 @@
+# AdminPanel/app/broadcast.py
+"""
+Resumable broadcast of one message to every registered user.
+
+User IDs are streamed from SQLite in keyset-paged chunks, so memory stays
+flat however large the users table is. Each chunk is sent by a fixed pool
+of worker threads under a global token bucket, slightly below Telegram's
+~30 messages/sec bot limit. Every chat gets one message per broadcast, so
+the per-chat limit is never reached.
+
+After each chunk, progress is written to the ``broadcasts`` table: every
+user up to ``last_user_id`` has been handled. A broadcast interrupted by a
+crash or restart resumes from there and re-sends at most the chunk that
+was in flight.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from telegram.error import BadRequest, NetworkError, RetryAfter, Unauthorized
+
+from app.metrics import timer
+from app.rate_limit import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ('sent', 'failed', 'blocked')
+
+class Broadcaster:
+    """Sends broadcasts with bounded concurrency and checkpoints progress"""
+
+    def __init__(self, bot, database, concurrency=8, global_rate=25, chunk_size=500,
+                 max_retries=3, max_flood_waits=20, on_complete=None):
+        self.bot = bot
+        self.db = database
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.max_flood_waits = max_flood_waits  # RetryAfter, counted apart from max_retries
+        self.on_complete = on_complete
+        self.limiter = TokenBucketLimiter(global_rate, 1.0)
+        self._pause_until = 0.0  # flood control applies to the whole bot
+        self._active = {}
+        self._cancelled = set()
+        self._lock = threading.Lock()
+
+    # Broadcast records
+    def create(self, text, created_by=None):
+        """Record a new broadcast; returns its ID"""
+        with self.db._get_connection() as conn:
+            cursor = conn.execute('''
+                INSERT INTO broadcasts (text, created_by, total, updated_at)
+                VALUES (?, ?, (SELECT COUNT(*) FROM users), CURRENT_TIMESTAMP)
+            ''', (text, created_by))
+            conn.commit()
+        return cursor.lastrowid
+
+    def status(self, broadcast_id):
+        """The broadcast row as a dict, or None"""
+        with self.db._get_connection() as conn:
+            row = conn.execute(
+                'SELECT * FROM broadcasts WHERE broadcast_id = ?', (broadcast_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def _checkpoint(self, broadcast_id, last_user_id, counts, status='running'):
+        with self.db._get_connection() as conn:
+            conn.execute('''
+                UPDATE broadcasts
+                SET last_user_id = ?, sent = ?, failed = ?, blocked = ?, status = ?,
+                    updated_at = CURRENT_TIMESTAMP,
+                    finished_at = CASE WHEN ? = 'running' THEN NULL ELSE CURRENT_TIMESTAMP END
+                WHERE broadcast_id = ?
+            ''', (last_user_id, counts['sent'], counts['failed'], counts['blocked'],
+                  status, status, broadcast_id))
+            conn.commit()
+
+    # Running
+    def start(self, text, created_by=None):
+        """Create a broadcast and send it in the background; returns its ID"""
+        broadcast_id = self.create(text, created_by)
+        self.resume(broadcast_id)
+        return broadcast_id
+
+    def resume(self, broadcast_id):
+        """Continue a broadcast from its checkpoint in the background"""
+        with self._lock:
+            if broadcast_id in self._active:
+                return False
+            self._cancelled.discard(broadcast_id)
+            thread = threading.Thread(
+                target=self._run_and_report, args=(broadcast_id,),
+                name=f'broadcast-{broadcast_id}', daemon=True
+            )
+            self._active[broadcast_id] = thread
+        thread.start()
+        return True
+
+    def resume_unfinished(self):
+        """Resume broadcasts left running by a previous process"""
+        with self.db._get_connection() as conn:
+            ids = [row[0] for row in conn.execute(
+                "SELECT broadcast_id FROM broadcasts WHERE status = 'running'"
+            )]
+        return [broadcast_id for broadcast_id in ids if self.resume(broadcast_id)]
+
+    def cancel(self, broadcast_id):
+        with self._lock:
+            if broadcast_id not in self._active:
+                return False
+            self._cancelled.add(broadcast_id)
+        return True
+
+    def _run_and_report(self, broadcast_id):
+        try:
+            stats = self.run(broadcast_id)
+        except Exception as e:
+            logger.error("Broadcast %s failed: %s", broadcast_id, e)
+            return
+        finally:
+            with self._lock:
+                self._active.pop(broadcast_id, None)
+        if self.on_complete is not None:
+            self.on_complete(stats)
+
+    def run(self, broadcast_id):
+        """Send a broadcast to completion (or cancellation); returns stats"""
+        state = self.status(broadcast_id)
+        if state is None:
+            raise KeyError(f"No broadcast {broadcast_id}")
+        text = state['text']
+        last_user_id = state['last_user_id']
+        counts = {outcome: state[outcome] for outcome in OUTCOMES}
+        handled = 0
+        status = 'done'
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix='broadcast') as pool:
+            while True:
+                if broadcast_id in self._cancelled:
+                    status = 'cancelled'
+                    break
+                chunk = self.db.get_user_ids(last_user_id, self.chunk_size)
+                if not chunk:
+                    break
+                for outcome in pool.map(lambda user_id: self._send(user_id, text), chunk):
+                    counts[outcome] += 1
+                handled += len(chunk)
+                last_user_id = chunk[-1]
+                self._checkpoint(broadcast_id, last_user_id, counts)
+
+        self._checkpoint(broadcast_id, last_user_id, counts, status)
+        elapsed = time.monotonic() - started
+        stats = dict(
+            counts,
+            broadcast_id=broadcast_id,
+            status=status,
+            total=state['total'],
+            handled=handled,
+            elapsed=elapsed,
+            rate=handled / elapsed if elapsed else 0.0,
+        )
+        logger.info("Broadcast %s %s: %d sent, %d failed, %d blocked (%.1f msg/s)",
+                    broadcast_id, status, counts['sent'], counts['failed'],
+                    counts['blocked'], stats['rate'])
+        return stats
+
+    def _wait_turn(self):
+        while True:
+            pause = self._pause_until - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+                continue
+            wait = self.limiter.check('broadcast')
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def _send(self, user_id, text):
+        """Deliver to one chat; returns 'sent', 'failed' or 'blocked'"""
+        attempt = flood_waits = 0
+        while attempt <= self.max_retries:
+            self._wait_turn()
+            try:
+                with timer('telegram', 'broadcast_send'):
+                    self.bot.send_message(chat_id=user_id, text=text)
+                return 'sent'
+            except RetryAfter as e:
+                # Flood control says nothing about this chat: wait it out
+                # without using up one of its attempts
+                self._pause_until = max(self._pause_until, time.monotonic() + e.retry_after)
+                flood_waits += 1
+                if flood_waits > self.max_flood_waits:
+                    return 'failed'
+                continue
+            except Unauthorized:
+                # The user blocked the bot or deleted their account
+                return 'blocked'
+            except BadRequest:
+                # Subclass of NetworkError in PTB 13; e.g. chat not found
+                return 'failed'
+            except NetworkError:
+                time.sleep(min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0))
+            except Exception as e:
+                logger.error("Broadcast to %s failed: %s", user_id, e)
+                return 'failed'
+            attempt += 1
+        return 'failed'
+
+def broadcast_summary(stats):
+    """Completion report sent back to the admin"""
+    return (
+        f"📣 Broadcast #{stats['broadcast_id']} {stats['status']}\n"
+        f"Sent: {stats['sent']}, Blocked: {stats['blocked']}, Failed: {stats['failed']}"
+        f" (of {stats['total']} users)\n"
+        f"Took {stats['elapsed']:.1f}s at {stats['rate']:.1f} msg/s"
+    )
+
+_broadcasters = {}
+_broadcasters_lock = threading.Lock()
+
+def broadcaster_for(bot):
+    """Shared Broadcaster per bot; completion reports go to the admin"""
+    broadcaster = _broadcasters.get(id(bot))
+    if broadcaster is None:
+        with _broadcasters_lock:
+            broadcaster = _broadcasters.get(id(bot))
+            if broadcaster is None:
+                from app.database import get_db
+                from app.outbox import outbox_for
+                from config.telegram_config import TelegramConfig
+                outbox = outbox_for(bot)
+                broadcaster = Broadcaster(
+                    bot, get_db(),
+                    on_complete=lambda stats: outbox.send(
+                        TelegramConfig.ADMIN_ID, broadcast_summary(stats)
+                    )
+                )
+                _broadcasters[id(bot)] = broadcaster
+    return broadcaster
@@ -1,29 +1,290 @@
 # AdminPanel/app/database.py
 import sqlite3
+import queue
+import threading
 from contextlib import contextmanager
 from config.telegram_config import TelegramConfig
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from app.activity_buffer import ActivityBuffer
+from app.metrics import timed
+from app.user_cache import BloomFilter, UserCache
 
 logger = logging.getLogger(__name__)
 
+# Connection tuning applied to every pooled connection
+PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -16000',     # ~16 MB page cache
+    'PRAGMA mmap_size = 268435456',   # 256 MB memory-mapped I/O
+    'PRAGMA temp_store = MEMORY',
+)
+
+# Prepared statements kept per connection (sqlite3 caches by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version.
+# Append new steps; never edit or reorder existing ones.
+MIGRATIONS = (
+    # 1: indexes for the newest-first /log and /alerts listings
+    (
+        '''CREATE INDEX IF NOT EXISTS idx_activity_log_timestamp
+           ON activity_log (timestamp DESC)''',
+        '''CREATE INDEX IF NOT EXISTS idx_activity_log_user
+           ON activity_log (user_id, timestamp)''',
+        # Partial index: only open alerts, so it stays small as history grows
+        '''CREATE INDEX IF NOT EXISTS idx_alerts_unresolved
+           ON alerts (created_at DESC, alert_id) WHERE resolved = 0''',
+    ),
+    # 2: checkpoints of the in-memory live counters (app/live_stats.py)
+    (
+        '''CREATE TABLE IF NOT EXISTS live_stats (
+               name TEXT PRIMARY KEY,
+               value TEXT NOT NULL,
+               updated_at TIMESTAMP
+           )''',
+    ),
+    # 3: keyset pagination by log_id/alert_id with type and severity filters.
+    # Index entries end in the rowid, so each filter value is log_id ordered.
+    (
+        '''CREATE INDEX IF NOT EXISTS idx_activity_log_type
+           ON activity_log (activity_type)''',
+        '''CREATE INDEX IF NOT EXISTS idx_activity_log_user_id
+           ON activity_log (user_id, log_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_alerts_open_id
+           ON alerts (alert_id) WHERE resolved = 0''',
+        '''CREATE INDEX IF NOT EXISTS idx_alerts_open_severity
+           ON alerts (severity, alert_id) WHERE resolved = 0''',
+    ),
+    # 4: resumable broadcasts (app/broadcast.py); last_user_id is the
+    # checkpoint below which every user has been handled
+    (
+        '''CREATE TABLE IF NOT EXISTS broadcasts (
+               broadcast_id INTEGER PRIMARY KEY AUTOINCREMENT,
+               text TEXT NOT NULL,
+               created_by INTEGER,
+               status TEXT NOT NULL DEFAULT 'running',
+               total INTEGER DEFAULT 0,
+               last_user_id INTEGER DEFAULT 0,
+               sent INTEGER DEFAULT 0,
+               failed INTEGER DEFAULT 0,
+               blocked INTEGER DEFAULT 0,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               updated_at TIMESTAMP,
+               finished_at TIMESTAMP
+           )''',
+    ),
+    # 5: admin IDs for the role checks in app/auth.py
+    (
+        '''CREATE INDEX IF NOT EXISTS idx_users_admin
+           ON users (user_id) WHERE is_admin = 1''',
+    ),
+    # 6: activity rollups for /stats (app/rollups.py); rollup_state holds
+    # the high-water log_id already counted
+    (
+        '''CREATE TABLE IF NOT EXISTS activity_rollup (
+               period TEXT NOT NULL,
+               bucket TEXT NOT NULL,
+               activity_type TEXT NOT NULL,
+               command TEXT NOT NULL DEFAULT '',
+               events INTEGER NOT NULL,
+               PRIMARY KEY (period, bucket, activity_type, command)
+           ) WITHOUT ROWID''',
+        '''CREATE TABLE IF NOT EXISTS user_activity_rollup (
+               period TEXT NOT NULL,
+               user_id INTEGER NOT NULL,
+               bucket TEXT NOT NULL,
+               activity_type TEXT NOT NULL,
+               events INTEGER NOT NULL,
+               PRIMARY KEY (period, user_id, bucket, activity_type)
+           ) WITHOUT ROWID''',
+        '''CREATE TABLE IF NOT EXISTS rollup_state (
+               name TEXT PRIMARY KEY,
+               last_log_id INTEGER NOT NULL DEFAULT 0
+           )''',
+    ),
+    # 7: full-text search (/find) over activity details and alert messages.
+    # External-content FTS5 tables store only the index; triggers keep them
+    # in step with every insert, delete (e.g. archiving) and edit.
+    (
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS activity_fts USING fts5(
+               details, content='activity_log', content_rowid='log_id'
+           )''',
+        '''CREATE TRIGGER IF NOT EXISTS activity_fts_insert AFTER INSERT ON activity_log
+           BEGIN
+               INSERT INTO activity_fts (rowid, details) VALUES (new.log_id, new.details);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS activity_fts_delete AFTER DELETE ON activity_log
+           BEGIN
+               INSERT INTO activity_fts (activity_fts, rowid, details)
+               VALUES ('delete', old.log_id, old.details);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS activity_fts_update AFTER UPDATE OF details ON activity_log
+           BEGIN
+               INSERT INTO activity_fts (activity_fts, rowid, details)
+               VALUES ('delete', old.log_id, old.details);
+               INSERT INTO activity_fts (rowid, details) VALUES (new.log_id, new.details);
+           END''',
+        "INSERT INTO activity_fts (activity_fts) VALUES ('rebuild')",
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS alerts_fts USING fts5(
+               message, content='alerts', content_rowid='alert_id'
+           )''',
+        '''CREATE TRIGGER IF NOT EXISTS alerts_fts_insert AFTER INSERT ON alerts
+           BEGIN
+               INSERT INTO alerts_fts (rowid, message) VALUES (new.alert_id, new.message);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS alerts_fts_delete AFTER DELETE ON alerts
+           BEGIN
+               INSERT INTO alerts_fts (alerts_fts, rowid, message)
+               VALUES ('delete', old.alert_id, old.message);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS alerts_fts_update AFTER UPDATE OF message ON alerts
+           BEGIN
+               INSERT INTO alerts_fts (alerts_fts, rowid, message)
+               VALUES ('delete', old.alert_id, old.message);
+               INSERT INTO alerts_fts (rowid, message) VALUES (new.alert_id, new.message);
+           END''',
+        "INSERT INTO alerts_fts (alerts_fts) VALUES ('rebuild')",
+    ),
+    # 8: a version bumped by every change to the admin set, whichever
+    # process makes it, so app/auth.py knows when to reload
+    (
+        '''CREATE TABLE IF NOT EXISTS auth_state (
+               id INTEGER PRIMARY KEY CHECK (id = 1),
+               version INTEGER NOT NULL DEFAULT 0
+           )''',
+        "INSERT OR IGNORE INTO auth_state (id, version) VALUES (1, 0)",
+        '''CREATE TRIGGER IF NOT EXISTS users_admin_insert AFTER INSERT ON users
+           WHEN new.is_admin = 1
+           BEGIN
+               UPDATE auth_state SET version = version + 1 WHERE id = 1;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS users_admin_update AFTER UPDATE OF is_admin ON users
+           WHEN old.is_admin IS NOT new.is_admin
+           BEGIN
+               UPDATE auth_state SET version = version + 1 WHERE id = 1;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS users_admin_delete AFTER DELETE ON users
+           WHEN old.is_admin = 1
+           BEGIN
+               UPDATE auth_state SET version = version + 1 WHERE id = 1;
+           END''',
+    ),
+)
+
+# Full-text sources: FTS table -> (content table, key, time, filter columns)
+SEARCH_SOURCES = {
+    'activity_fts': ('activity_log', 'log_id', 'timestamp', ('activity_type',)),
+    'alerts_fts': ('alerts', 'alert_id', 'created_at', ('alert_type', 'severity')),
+}
+# Marks around matched terms in search snippets
+MATCH_START, MATCH_END = '\x02', '\x03'
+# Ranked searches score only the newest this many matches, so a common
+# term costs the same at 10M rows as at 100k
+RANK_WINDOW = 5000
+
+class ConnectionPool:
+    """Bounded pool of persistent SQLite connections"""
+
+    def __init__(self, db_path, size=5, timeout=30.0):
+        self.db_path = db_path
+        # Every ':memory:' connection is a separate database
+        self.size = 1 if db_path == ':memory:' else size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row  # Return dict-like rows
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, opening a new one while below size"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._created < self.size
+            if can_open:
+                self._created += 1
+        if can_open:
+            try:
+                return self._connect()
+            except sqlite3.Error:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No database connection available after {self.timeout}s"
+            )
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding open transactions"""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    def close(self):
+        """Close all idle connections; busy ones close on release"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
 class AdminDatabase:
-    def __init__(self, db_path='admin_panel.db'):
+    def __init__(self, db_path='admin_panel.db', pool_size=5, buffered_activity=True):
         self.db_path = db_path
+        self._pool = ConnectionPool(db_path, size=pool_size)
+        self._activity_buffer = (
+            ActivityBuffer(self._write_activity_batch) if buffered_activity else None
+        )
+        self._activity_listeners = []
+        self._user_cache = UserCache()
+        self._known_users = None  # BloomFilter of user_ids, loaded on first lookup
+        self._known_users_lock = threading.Lock()
         self._init_db()
 
     @contextmanager
     def _get_connection(self):
-        """Managed database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return dict-like rows
+        """Managed database connection (borrowed from the pool)"""
+        conn = self._pool.acquire()
         try:
             yield conn
         except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             raise
         finally:
-            conn.close()
+            self._pool.release(conn)
+
+    def close(self):
+        """Flush buffered activity and close pooled connections"""
+        if self._activity_buffer is not None:
+            self._activity_buffer.close()
+        self._pool.close()
 
     def _init_db(self):
         """Initialize database tables"""
@@ -75,46 +336,112 @@ class AdminDatabase:
                 (user_id, username, first_name, is_admin)
                 VALUES (?, ?, ?, 1)
             ''', (TelegramConfig.ADMIN_ID, "admin", "Admin"))
-            
+
             conn.commit()
+            self._migrate(conn)
+
+    def _migrate(self, conn):
+        """Apply pending schema migrations"""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {number}')
+            conn.commit()
+            logger.info("Applied schema migration %d", number)
 
     # User Management
+    @timed('db')
     def add_user(self, user_data):
-        """Add new user to database"""
+        """Add or update a user; no write when the cached profile is unchanged"""
+        user_id = user_data['id']
+        profile = (
+            user_data.get('username') or '',
+            user_data.get('first_name') or '',
+            user_data.get('last_name') or ''
+        )
+        cached = self._user_cache.get(user_id)
+        if cached is not None and (cached['username'], cached['first_name'], cached['last_name']) == profile:
+            return
+
         with self._get_connection() as conn:
-            conn.execute('''
+            cursor = conn.execute('''
                 INSERT INTO users 
                 (user_id, username, first_name, last_name)
                 VALUES (?, ?, ?, ?)
-            ''', (
-                user_data['id'],
-                user_data.get('username', ''),
-                user_data.get('first_name', ''),
-                user_data.get('last_name', '')
-            ))
+                ON CONFLICT(user_id) DO UPDATE SET
+                    username = excluded.username,
+                    first_name = excluded.first_name,
+                    last_name = excluded.last_name
+                WHERE users.username IS NOT excluded.username
+                   OR users.first_name IS NOT excluded.first_name
+                   OR users.last_name IS NOT excluded.last_name
+            ''', (user_id,) + profile)
+            changed = cursor.rowcount
             conn.commit()
-        logger.info(f"Added new user: {user_data['id']}")
+            row = conn.execute('SELECT * FROM users WHERE user_id = ?', (user_id,)).fetchone()
 
+        self._user_cache.put(user_id, row)
+        self._known_user_ids().add(user_id)
+        if changed:
+            logger.info("Added or updated user: %s", user_id)
+
+    @timed('db')
     def log_activity(self, user_id, activity_type, details=None, ip=None):
-        """Record user activity"""
+        """Record user activity (written behind unless buffering is off)"""
+        now = datetime.now()
+        # Same format as CURRENT_TIMESTAMP, but taken when the event happened
+        logged_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        event = (user_id, activity_type, details, ip, logged_at)
+
+        if self._activity_buffer is not None:
+            self._activity_buffer.append(event, user_id, now)
+        else:
+            self._write_activity_batch([event], [(user_id, now)])
+        for listener in self._activity_listeners:
+            try:
+                listener(user_id, activity_type, details)
+            except Exception as e:
+                logger.error("Activity listener failed: %s", e)
+        logger.debug("Logged activity: %s - %s", user_id, activity_type)
+
+    def add_activity_listener(self, listener):
+        """Call listener(user_id, activity_type, details) for every logged activity"""
+        self._activity_listeners.append(listener)
+
+    @timed('db', 'write_activity_batch')
+    def _write_activity_batch(self, events, last_active):
+        """Insert activity rows and update last_active in one transaction"""
         with self._get_connection() as conn:
-            conn.execute('''
+            conn.executemany('''
                 INSERT INTO activity_log 
-                (user_id, activity_type, details, ip_address)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, activity_type, details, ip))
+                (user_id, activity_type, details, ip_address, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+            ''', events)
             
             # Update last active timestamp
-            conn.execute('''
+            conn.executemany('''
                 UPDATE users 
                 SET last_active = ?
                 WHERE user_id = ?
-            ''', (datetime.now(), user_id))
+            ''', [(ts, user_id) for user_id, ts in last_active])
             
             conn.commit()
-        logger.debug(f"Logged activity: {user_id} - {activity_type}")
+
+    @timed('db')
+    def flush_activity(self):
+        """Write any buffered activity to disk now"""
+        if self._activity_buffer is not None:
+            self._activity_buffer.flush()
+
+    def activity_metrics(self):
+        """Write-behind queue depth and flush latency"""
+        if self._activity_buffer is None:
+            return {}
+        return self._activity_buffer.metrics()
 
     # Alert Management
+    @timed('db')
     def create_alert(self, alert_type, message, severity='medium'):
         """Create new system alert"""
         with self._get_connection() as conn:
@@ -126,9 +453,10 @@ class AdminDatabase:
             ''', (alert_type, severity, message))
             alert_id = cursor.lastrowid
             conn.commit()
-        logger.warning(f"New alert created: {alert_type} (ID: {alert_id})")
+        logger.warning("New alert created: %s (ID: %s)", alert_type, alert_id)
         return alert_id
 
+    @timed('db')
     def get_unresolved_alerts(self):
         """Get all unresolved alerts"""
         with self._get_connection() as conn:
@@ -140,16 +468,120 @@ class AdminDatabase:
             ''')
             return cursor.fetchall()
 
+    @timed('db')
+    def get_alert_page(self, before_id=None, after_id=None, limit=10, severity=None):
+        """One page of unresolved alerts, newest first, keyed on alert_id"""
+        filters = {'resolved': 0}
+        if severity is not None:
+            filters['severity'] = severity
+        return self._keyset_page('alerts', 'alert_id', filters, before_id, after_id, limit)
+
+    def iter_unresolved_alerts(self, severity=None, chunk_size=200):
+        """Stream unresolved alerts newest first, one page in memory at a time"""
+        return self._iter_keyset(self.get_alert_page, 'alert_id', chunk_size, severity=severity)
+
+    @timed('db')
+    def resolve_alert(self, alert_id):
+        """Mark an alert resolved; returns False if it was already resolved"""
+        with self._get_connection() as conn:
+            cursor = conn.execute('''
+                UPDATE alerts
+                SET resolved = 1, resolved_at = CURRENT_TIMESTAMP
+                WHERE alert_id = ? AND resolved = 0
+            ''', (alert_id,))
+            conn.commit()
+        if cursor.rowcount:
+            logger.info("Alert resolved (ID: %s)", alert_id)
+        return bool(cursor.rowcount)
+
     # Utility Methods
+    @timed('db')
     def get_user(self, user_id):
-        """Get user by ID"""
+        """Get user by ID (cached; unknown IDs are answered by a bloom filter)"""
+        row = self._user_cache.get(user_id)
+        if row is not None:
+            return row
+        if user_id not in self._known_user_ids():
+            self._user_cache.negative_hits += 1
+            return None
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-            return cursor.fetchone()
+            row = cursor.fetchone()
+        if row is not None:
+            self._user_cache.put(user_id, row)
+        return row
+
+    def _known_user_ids(self):
+        """Bloom filter of every user_id, streamed from the table once"""
+        if self._known_users is None:
+            with self._known_users_lock:
+                if self._known_users is None:
+                    known = BloomFilter()
+                    with self._get_connection() as conn:
+                        for (user_id,) in conn.execute('SELECT user_id FROM users'):
+                            known.add(user_id)
+                    self._known_users = known
+        return self._known_users
+
+    @timed('db')
+    def get_user_ids(self, after_id=0, limit=1000):
+        """Up to ``limit`` user IDs above ``after_id``, ascending"""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                'SELECT user_id FROM users WHERE user_id > ? ORDER BY user_id LIMIT ?',
+                (after_id, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def iter_user_ids(self, after_id=0, chunk_size=1000):
+        """Stream every user ID above ``after_id`` in keyset-paged chunks"""
+        while True:
+            chunk = self.get_user_ids(after_id, chunk_size)
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            after_id = chunk[-1]
+
+    def get_admin_ids(self):
+        """IDs of every user with is_admin set"""
+        with self._get_connection() as conn:
+            return [row[0] for row in conn.execute(
+                'SELECT user_id FROM users WHERE is_admin = 1'
+            )]
+
+    def get_auth_version(self):
+        """Counter bumped (by trigger) on every change to users.is_admin"""
+        with self._get_connection() as conn:
+            row = conn.execute('SELECT version FROM auth_state WHERE id = 1').fetchone()
+        return row[0] if row else 0
+
+    @timed('db')
+    def set_admin(self, user_id, is_admin):
+        """Set or clear is_admin, creating the user row if needed"""
+        with self._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO users (user_id, username, is_admin)
+                VALUES (?, '', ?)
+                ON CONFLICT(user_id) DO UPDATE SET is_admin = excluded.is_admin
+            ''', (user_id, int(bool(is_admin))))
+            conn.commit()
+        self._user_cache.invalidate(user_id)
+        self._known_user_ids().add(user_id)
+
+    def invalidate_user(self, user_id):
+        """Drop a user from the cache after an out-of-band change"""
+        self._user_cache.invalidate(user_id)
 
+    def user_cache_stats(self):
+        """Hit/miss counts and hit rate of the user cache"""
+        return self._user_cache.stats()
+
+    @timed('db')
     def get_recent_activities(self, limit=10):
         """Get recent system activities"""
+        self.flush_activity()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
@@ -159,13 +591,150 @@ class AdminDatabase:
             ''', (limit,))
             return cursor.fetchall()
 
-# Database instance for import
-db = AdminDatabase()
+    @timed('db')
+    def get_activity_page(self, before_id=None, after_id=None, limit=10,
+                          user_id=None, activity_type=None):
+        """One page of activities, newest first, keyed on log_id (no OFFSET)
+
+        before_id pages towards older rows, after_id towards newer ones.
+        """
+        self.flush_activity()
+        filters = {}
+        if user_id is not None:
+            filters['user_id'] = user_id
+        if activity_type is not None:
+            filters['activity_type'] = activity_type
+        return self._keyset_page('activity_log', 'log_id', filters, before_id, after_id, limit)
+
+    def iter_activities(self, user_id=None, activity_type=None, chunk_size=500):
+        """Stream activities newest first, one page in memory at a time"""
+        return self._iter_keyset(
+            self.get_activity_page, 'log_id', chunk_size,
+            user_id=user_id, activity_type=activity_type
+        )
+
+    @timed('db')
+    def search_activities(self, query, limit=10, offset=0, since=None, until=None,
+                          activity_type=None, newest=False):
+        """Activities matching an FTS5 query, best match (or newest) first
+
+        Best match means best among the newest RANK_WINDOW matches. Rows
+        carry ``snippet`` (matches between MATCH_START and MATCH_END) and
+        ``score`` (bm25, lower is better; None when sorted by newest).
+        """
+        self.flush_activity()
+        return self._search('activity_fts', query, limit, offset, since, until,
+                            {'activity_type': activity_type}, newest)
+
+    @timed('db')
+    def search_alerts(self, query, limit=10, offset=0, since=None, until=None,
+                      alert_type=None, severity=None, newest=False):
+        """Alerts (open and resolved) matching an FTS5 query"""
+        return self._search('alerts_fts', query, limit, offset, since, until,
+                            {'alert_type': alert_type, 'severity': severity}, newest)
+
+    def _search(self, fts, query, limit, offset, since, until, filters, newest):
+        table, key, time_column, filter_columns = SEARCH_SOURCES[fts]
+        clauses, params = [f'{fts} MATCH ?'], [query]
+        with self._get_connection() as conn:
+            # Keys grow with time, so a time range narrows the key range that
+            # FTS5 walks. The hour of slack covers rows written slightly out
+            # of order; the exact time test is applied to the joined rows.
+            # Many rows share a second, so ties on the edge time go to the
+            # outermost key.
+            for bound, op, slack, direction, key_op in (
+                (since, '>=', '-1 hour', 'ASC', '>='), (until, '<', '+1 hour', 'DESC', '<=')
+            ):
+                if bound is None:
+                    continue
+                edge = conn.execute(f'''
+                    SELECT {key} FROM {table} WHERE {time_column} {op} datetime(?, '{slack}')
+                    ORDER BY {time_column} {direction}, {key} {direction} LIMIT 1
+                ''', (bound,)).fetchone()
+                if edge is None:
+                    return []
+                clauses.append(f'{fts}.rowid {key_op} ?')
+                clauses.append(f't.{time_column} {op} ?')
+                params += [edge[0], bound]
+            for column in filter_columns:
+                if filters.get(column) is not None:
+                    clauses.append(f't.{column} = ?')
+                    params.append(filters[column])
+            where = ' AND '.join(clauses)
+            if newest:
+                # Walks the doclist backwards and stops after one page
+                order, score = f'{fts}.rowid DESC', 'NULL'
+            else:
+                floor = conn.execute(f'''
+                    SELECT {fts}.rowid FROM {fts} JOIN {table} t ON t.{key} = {fts}.rowid
+                    WHERE {where} ORDER BY {fts}.rowid DESC LIMIT 1 OFFSET ?
+                ''', params + [RANK_WINDOW - 1]).fetchone()
+                if floor is not None:
+                    where += f' AND {fts}.rowid >= ?'
+                    params.append(floor[0])
+                order, score = 'rank', 'rank'
+            return conn.execute(f'''
+                SELECT t.*, snippet({fts}, 0, ?, ?, '…', 16) AS snippet, {score} AS score
+                FROM {fts} JOIN {table} t ON t.{key} = {fts}.rowid
+                WHERE {where}
+                ORDER BY {order} LIMIT ? OFFSET ?
+            ''', [MATCH_START, MATCH_END] + params + [limit, offset]).fetchall()
+
+    def _keyset_page(self, table, key, filters, before_id, after_id, limit):
+        # table, key and filter names are fixed by the callers; values are bound
+        clauses = [f'{column} = ?' for column in filters]
+        params = list(filters.values())
+        if after_id is not None:
+            clauses.append(f'{key} > ?')
+            params.append(after_id)
+            order = 'ASC'
+        else:
+            if before_id is not None:
+                clauses.append(f'{key} < ?')
+                params.append(before_id)
+            order = 'DESC'
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f'SELECT * FROM {table} {where} ORDER BY {key} {order} LIMIT ?',
+                params + [limit]
+            ).fetchall()
+        return rows[::-1] if after_id is not None else rows
+
+    @staticmethod
+    def _iter_keyset(get_page, key, chunk_size, **filters):
+        before_id = None
+        while True:
+            rows = get_page(before_id=before_id, limit=chunk_size, **filters)
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            before_id = rows[-1][key]
+
+# Shared database instance, created on first use
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    """Process-wide AdminDatabase (opened and migrated on first call)"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = AdminDatabase()
+    return _db
+
+def __getattr__(name):
+    # Keeps `from app.database import db` working without import-time I/O
+    if name == 'db':
+        return get_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Example usage:
 if __name__ == '__main__':
     # Initialize logger
     logging.basicConfig(level=logging.DEBUG)
+    db = get_db()
     
     # Test database operations
     test_user = {
@@ -0,0 +1,252 @@
+# AdminPanel/app/export.py
+"""
+Streaming export of activity_log, alerts and users.
+
+Rows are read with one cursor in ``fetchmany`` chunks and written chunk by
+chunk, so memory use does not depend on the size of the table. Output is
+CSV, JSONL or Parquet (needs pyarrow). CSV and JSONL can be compressed
+while writing (gzip, bz2 or xz); Parquet compresses each column itself.
+
+    python -m app.export activity_log activity.csv.gz --since 2024-01-01 --type error
+    python -m app.export alerts alerts.parquet --compression zstd
+"""
+
+import bz2
+import csv
+import gzip
+import json
+import logging
+import lzma
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: CSV and JSONL only
+    pyarrow = None
+
+from app.database import get_db
+from app.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+# table -> (timestamp column, type column) used by the filters
+TABLES = {
+    'activity_log': ('timestamp', 'activity_type'),
+    'alerts': ('created_at', 'alert_type'),
+    'users': ('join_date', None),
+}
+FORMATS = ('csv', 'jsonl', 'parquet')
+COMPRESSORS = {
+    'gzip': lambda path: gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6),
+    'bz2': lambda path: bz2.open(path, 'wt', encoding='utf-8', newline=''),
+    'xz': lambda path: lzma.open(path, 'wt', encoding='utf-8', newline='', preset=1),
+}
+EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+CHUNK_SIZE = 10_000
+
+def parse_time(value):
+    """'YYYY-MM-DD[ HH:MM[:SS]]' as stored by CURRENT_TIMESTAMP"""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+
+def guess_format(path, compression=None):
+    """(format, compression) from a name like 'activity.jsonl.gz'"""
+    root, ext = os.path.splitext(path)
+    if ext in EXTENSIONS:
+        compression = compression or EXTENSIONS[ext]
+        root, ext = os.path.splitext(root)
+    fmt = ext.lstrip('.').lower()
+    return (fmt if fmt in FORMATS else 'csv'), compression
+
+def iter_chunks(database, table, since=None, until=None, kind=None, chunk_size=CHUNK_SIZE):
+    """Yield the column names, then lists of up to ``chunk_size`` row tuples"""
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    time_column, type_column = TABLES[table]
+    if kind is not None and type_column is None:
+        raise ValueError(f"{table} has no type to filter on")
+
+    conditions, params = [], []
+    if since is not None:
+        conditions.append(f"{time_column} >= ?")
+        params.append(parse_time(since))
+    if until is not None:
+        conditions.append(f"{time_column} < ?")
+        params.append(parse_time(until))
+    if kind is not None:
+        conditions.append(f"{type_column} = ?")
+        params.append(kind)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    if table == 'activity_log':
+        database.flush_activity()
+    with database._get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples; no sqlite3.Row per row
+        # No ORDER BY: rows stream in rowid (or index) order without a sort
+        cursor.execute(f"SELECT * FROM {table}{where}", params)
+        cursor.arraysize = chunk_size
+        yield [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                return
+            yield rows
+
+def column_types(database, table):
+    """Arrow types from the declared SQLite column types"""
+    with database._get_connection() as conn:
+        info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return {
+        row[1]: pyarrow.int64() if row[2].upper() in ('INTEGER', 'BOOLEAN') else pyarrow.string()
+        for row in info
+    }
+
+# Writers: write(columns, chunks) consumes the chunks and returns the row count
+def write_csv(out, columns, chunks):
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    rows = 0
+    for chunk in chunks:
+        writer.writerows(chunk)
+        rows += len(chunk)
+    return rows
+
+def write_jsonl(out, columns, chunks):
+    dumps = json.dumps
+    rows = 0
+    for chunk in chunks:
+        out.write(''.join(
+            dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in chunk
+        ))
+        rows += len(chunk)
+    return rows
+
+def write_parquet(path, columns, chunks, types, compression=None):
+    schema = pyarrow.schema([(name, types[name]) for name in columns])
+    rows = 0
+    # One row group per chunk
+    with pyarrow.parquet.ParquetWriter(path, schema, compression=compression or 'snappy') as writer:
+        for chunk in chunks:
+            arrays = [
+                pyarrow.array(values, type=field.type)
+                for values, field in zip(zip(*chunk), schema)
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+    return rows
+
+def export(database, table, path, fmt=None, since=None, until=None, kind=None,
+           compression=None, chunk_size=CHUNK_SIZE):
+    """Stream one table to ``path``; returns rows, seconds, rows/sec and bytes"""
+    guessed, compression = guess_format(path, compression)
+    fmt = fmt or guessed
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if fmt == 'parquet' and pyarrow is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    if fmt != 'parquet' and compression not in (None, *COMPRESSORS):
+        raise ValueError(f"Unknown compression: {compression}")
+
+    started = time.perf_counter()
+    chunks = iter_chunks(database, table, since, until, kind, chunk_size)
+    columns = next(chunks)
+    try:
+        if fmt == 'parquet':
+            rows = write_parquet(path, columns, chunks, column_types(database, table), compression)
+        else:
+            opener = COMPRESSORS[compression] if compression else (
+                lambda p: open(p, 'w', encoding='utf-8', newline='')
+            )
+            with opener(path) as out:
+                write = write_csv if fmt == 'csv' else write_jsonl
+                rows = write(out, columns, chunks)
+    finally:
+        chunks.close()  # returns the connection if the writer failed
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'table': table,
+        'format': fmt,
+        'compression': compression,
+        'rows': rows,
+        'elapsed': elapsed,
+        'rate': rows / elapsed if elapsed else 0.0,
+        'bytes': os.path.getsize(path),
+    }
+    logger.info("Exported %d %s rows to %s in %.1fs (%.0f rows/s)",
+                rows, table, path, elapsed, stats['rate'])
+    return stats
+
+def export_summary(stats):
+    return (
+        f"📦 {stats['rows']:,} {stats['table']} rows as {stats['format']}"
+        + (f" ({stats['compression']})" if stats['compression'] else '')
+        + f", {stats['bytes'] / 1_048_576:.1f} MB in {stats['elapsed']:.1f}s"
+        f" ({stats['rate']:,.0f} rows/s)"
+    )
+
+# Bot API limit for documents sent by bots
+UPLOAD_LIMIT = 50 * 1024 * 1024
+
+_export_lock = threading.Lock()
+
+def export_to_chat(bot, chat_id, table, fmt='csv', **filters):
+    """Export on a background thread and send the file as a document
+
+    CSV and JSONL are gzipped. Only one export runs at a time; returns
+    False if one is already running.
+    """
+    if not _export_lock.acquire(blocking=False):
+        return False
+
+    def run():
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                suffix = fmt if fmt == 'parquet' else f"{fmt}.gz"
+                name = f"{table}-{datetime.now():%Y%m%d-%H%M%S}.{suffix}"
+                path = os.path.join(tmp, name)
+                stats = export(get_db(), table, path, fmt, **filters)
+                if stats['bytes'] > UPLOAD_LIMIT:
+                    bot.send_message(chat_id=chat_id, text=(
+                        export_summary(stats) + "\n❌ Too large to send; narrow the "
+                        "filters or use python -m app.export"
+                    ))
+                    return
+                with open(path, 'rb') as document, timer('telegram', 'send_document'):
+                    bot.send_document(chat_id=chat_id, document=document, filename=name,
+                                      caption=export_summary(stats))
+        except Exception as e:
+            logger.error("Export of %s failed: %s", table, e)
+            bot.send_message(chat_id=chat_id, text=f"❌ Export failed: {e}")
+        finally:
+            _export_lock.release()
+
+    threading.Thread(target=run, name='export', daemon=True).start()
+    return True
+
+if __name__ == '__main__':
+    import argparse
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export a table to CSV, JSONL or Parquet")
+    parser.add_argument('table', choices=sorted(TABLES))
+    parser.add_argument('output', help="file name; the extension picks format and compression")
+    parser.add_argument('--format', choices=FORMATS)
+    parser.add_argument('--compression',
+                        help="gzip, bz2 or xz; for Parquet any pyarrow codec (zstd, gzip, ...)")
+    parser.add_argument('--since', help="YYYY-MM-DD[ HH:MM:SS], inclusive")
+    parser.add_argument('--until', help="YYYY-MM-DD[ HH:MM:SS], exclusive")
+    parser.add_argument('--type', help="activity_type or alert_type")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print(export_summary(export(
+        get_db(), args.table, args.output, args.format, args.since, args.until,
+        args.type, args.compression, args.chunk_size
+    )))
@@ -7,24 +7,16 @@ This file makes the 'app' directory a Python package and handles:
 - Database setup
 - Logger configuration
 - Global imports
+
+Importing the package has no side effects. Components are imported on first
+attribute access, and the first access also configures logging and records
+the package start in the activity log.
 """
 
+import importlib
 import logging
-from .database import db  # Database instance
-from .utilities import timestamp, rate_limited
-from .notifications import send_alert, send_status
-from .monitor import SystemMonitor
-from .admin_console import AdminConsole
-
-# Initialize package-level logger
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('admin_panel.log'),
-        logging.StreamHandler()
-    ]
-)
+import threading
+
 logger = logging.getLogger(__name__)
 
 # Package version
@@ -42,11 +34,58 @@ __all__ = [
     'logger'
 ]
 
-# Initialize components on import
-logger.info(f"Initializing Admin Panel v{__version__}")
-db.log_activity(0, 'system', 'Package initialized')
+# name -> (module, attribute) resolved on first access
+_LAZY_EXPORTS = {
+    'db': ('.database', 'get_db'),
+    'timestamp': ('.utilities', 'timestamp'),
+    'rate_limited': ('.utilities', 'rate_limited'),
+    'send_alert': ('.notifications', 'send_alert'),
+    'send_status': ('.notifications', 'send_status'),
+    'SystemMonitor': ('.monitor', 'SystemMonitor'),
+    'AdminConsole': ('.admin_console', 'AdminConsole'),
+}
+
+_initialized = False
+_init_lock = threading.Lock()
+
+def configure_logging():
+    """Package-level logging setup (queued, rotating admin_panel.log)"""
+    from .logging_setup import configure_logging as configure_pipeline
+    configure_pipeline('admin_panel.log')
+
+def initialize():
+    """Configure logging and record package start (runs once)
+
+    Other threads wait until setup has finished; if it raises, the next
+    call tries again.
+    """
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        configure_logging()
+        logger.info("Initializing Admin Panel v%s", __version__)
+        from .database import get_db
+        get_db().log_activity(0, 'system', 'Package initialized')
+        _initialized = True
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    initialize()
+    module_name, attribute = _LAZY_EXPORTS[name]
+    value = getattr(importlib.import_module(module_name, __package__), attribute)
+    if name == 'db':
+        value = value()
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # Example usage when imported:
 if __name__ == '__main__':
     print(f"Admin Panel Package v{__version__}")
-    print("Available components:", __all__)
\ No newline at end of file
+    print("Available components:", __all__)
@@ -0,0 +1,222 @@
+# AdminPanel/app/live_stats.py
+import atexit
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Active-user windows reported by /status, in minutes
+WINDOWS = {'5m': 5, '1h': 60, '24h': 24 * 60}
+
+class HyperLogLog:
+    """Distinct-count sketch; 2**p one-byte registers (~1.04/sqrt(2**p) error)"""
+
+    def __init__(self, p=10, registers=None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+
+    def add(self, item):
+        h = int.from_bytes(hashlib.blake2b(str(item).encode(), digest_size=8).digest(), 'big')
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = self.m
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(estimate)
+
+class Bucket:
+    """Events and distinct users for one minute or one hour"""
+    __slots__ = ('start', 'events', 'users')
+
+    def __init__(self, start, events=0, users=None):
+        self.start = start
+        self.events = events
+        self.users = users or HyperLogLog()
+
+class LiveStats:
+    """Activity counters kept up to date as events are logged
+
+    Distinct users are counted with HyperLogLog sketches in per-minute
+    buckets (last hour) and per-hour buckets (last day). The 5m/1h/24h
+    window sketches are rebuilt only when a bucket rolls over, and every
+    event is added to them directly, so reading them is O(1). Windows are
+    aligned to bucket boundaries; the 24h window has hour resolution.
+    """
+
+    def __init__(self, database=None, checkpoint_interval=60):
+        self.db = database
+        self.checkpoint_interval = checkpoint_interval
+        self._lock = threading.Lock()
+        self._minutes = deque(maxlen=60)
+        self._hours = deque(maxlen=24)
+        self._windows = {name: Bucket(0) for name in WINDOWS}
+        self.commands = Counter()
+        self.activity_types = Counter()
+        self.errors = 0
+        self.total_events = 0
+        self.last_activity = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Event intake
+    def record(self, user_id, activity_type, details=None, at=None):
+        at = time.time() if at is None else at
+        with self._lock:
+            self._roll(at)
+            for bucket in (self._minutes[-1], self._hours[-1], *self._windows.values()):
+                bucket.events += 1
+                bucket.users.add(user_id)
+
+            self.total_events += 1
+            self.activity_types[activity_type] += 1
+            if activity_type == 'command' and details:
+                self.commands[details.split()[0]] += 1
+            elif activity_type == 'error':
+                self.errors += 1
+            self.last_activity = at
+
+    def _roll(self, at):
+        minute = int(at // 60) * 60
+        if self._minutes and self._minutes[-1].start == minute:
+            return
+        self._minutes.append(Bucket(minute))
+        hour = int(at // 3600) * 3600
+        if not self._hours or self._hours[-1].start != hour:
+            self._hours.append(Bucket(hour))
+        self._rebuild_windows(minute)
+
+    def _rebuild_windows(self, now_minute):
+        for name, minutes in WINDOWS.items():
+            window = Bucket(now_minute)
+            since = now_minute - minutes * 60
+            if minutes <= 60:
+                buckets = [b for b in self._minutes if b.start > since]
+            else:
+                buckets = [b for b in self._hours if b.start + 3600 > since]
+            for bucket in buckets:
+                window.events += bucket.events
+                window.users.merge(bucket.users)
+            self._windows[name] = window
+
+    # Reads
+    def snapshot(self):
+        """Current counters; O(1) apart from the small command table"""
+        with self._lock:
+            self._roll(time.time())
+            return {
+                'active_users': {name: w.users.count() for name, w in self._windows.items()},
+                'events': {name: w.events for name, w in self._windows.items()},
+                'total_events': self.total_events,
+                'commands': dict(self.commands),
+                'errors': self.errors,
+                'last_activity': self.last_activity,
+            }
+
+    # Persistence
+    def checkpoint(self):
+        """Save counters and hourly buckets to SQLite"""
+        if self.db is None:
+            return
+        with self._lock:
+            state = {
+                'commands': dict(self.commands),
+                'activity_types': dict(self.activity_types),
+                'errors': self.errors,
+                'total_events': self.total_events,
+                'last_activity': self.last_activity,
+                'hours': [
+                    [b.start, b.events, b.users.registers.hex()] for b in self._hours
+                ],
+            }
+        with self.db._get_connection() as conn:
+            conn.execute('''
+                INSERT INTO live_stats (name, value, updated_at)
+                VALUES ('counters', ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            ''', (json.dumps(state),))
+            conn.commit()
+
+    def restore(self):
+        """Load the last checkpoint, or seed last_activity from activity_log"""
+        if self.db is None:
+            return
+        with self.db._get_connection() as conn:
+            row = conn.execute("SELECT value FROM live_stats WHERE name = 'counters'").fetchone()
+            if row is None:
+                latest = conn.execute('SELECT MAX(timestamp) FROM activity_log').fetchone()[0]
+        if row is None:
+            if latest:
+                logged_at = datetime.strptime(latest, '%Y-%m-%d %H:%M:%S')
+                self.last_activity = logged_at.replace(tzinfo=timezone.utc).timestamp()
+            return
+
+        state = json.loads(row['value'])
+        with self._lock:
+            self.commands.update(state['commands'])
+            self.activity_types.update(state['activity_types'])
+            self.errors += state['errors']
+            self.total_events += state['total_events']
+            self.last_activity = state['last_activity']
+            cutoff = time.time() - 24 * 3600
+            for start, events, registers in state['hours']:
+                if start >= cutoff:
+                    self._hours.append(Bucket(start, events, HyperLogLog(registers=bytes.fromhex(registers))))
+            self._minutes.clear()
+
+    def start(self):
+        """Restore state and checkpoint periodically in the background"""
+        if self._thread is None:
+            self.restore()
+            self._thread = threading.Thread(target=self._run, name='live-stats', daemon=True)
+            self._thread.start()
+            atexit.register(self.checkpoint)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+            atexit.unregister(self.checkpoint)
+        self.checkpoint()
+
+    def _run(self):
+        while not self._stop.wait(self.checkpoint_interval):
+            try:
+                self.checkpoint()
+            except Exception as e:
+                logger.error("Stats checkpoint failed: %s", e)
+
+_live_stats = None
+_live_stats_lock = threading.Lock()
+
+def get_live_stats():
+    """Process-wide LiveStats fed by AdminDatabase.log_activity"""
+    global _live_stats
+    if _live_stats is None:
+        with _live_stats_lock:
+            if _live_stats is None:
+                from app.database import get_db
+                db = get_db()
+                stats = LiveStats(db).start()
+                db.add_activity_listener(stats.record)
+                _live_stats = stats
+    return _live_stats
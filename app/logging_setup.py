@@ -0,0 +1,238 @@
+# AdminPanel/app/logging_setup.py
+"""
+One logging pipeline for the bot, the web server and the package.
+
+Loggers only put records on an in-memory queue (QueueHandler); a single
+background QueueListener thread formats them and writes the rotating log
+files and the console. Request threads therefore never wait on file I/O.
+
+Log calls should use lazy %-style arguments:
+
+    logger.info("New start command from %s", user.id)
+
+The message is then only built when the level is enabled, and the template
+is a stable key for sampling high-volume debug lines.
+
+LOG_LEVEL and LOG_FORMAT=json in the environment override the defaults.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not user-supplied `extra=` fields
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra=` fields"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        entry.update(
+            (key, value) for key, value in vars(record).items()
+            if key not in _RECORD_FIELDS
+        )
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class SamplingFilter(logging.Filter):
+    """Pass the first `burst` records per message template, then 1 in `rate`
+
+    Only records at or below `level` (DEBUG by default) are sampled. Kept
+    records carry ``sampled=rate`` once sampling has started.
+    """
+
+    def __init__(self, rate=100, burst=10, level=logging.DEBUG):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.level = level
+        self.dropped = 0
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.level or self.rate <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            seen = self._seen.get(key, 0) + 1
+            self._seen[key] = seen
+            if seen <= self.burst:
+                return True
+            if (seen - self.burst) % self.rate:
+                self.dropped += 1
+                return False
+        record.sampled = self.rate
+        return True
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full"""
+
+    def __init__(self, log_queue, maxsize=10_000):
+        super().__init__(log_queue)
+        self.maxsize = maxsize
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only merge the %-args here; timestamps, JSON and tracebacks are
+        # formatted on the listener thread. The root logger has no other
+        # handler, so the record is not copied first.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+class _DeferredFlushMixin:
+    """Write without flushing; the listener flushes once per batch"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+class RotatingFile(_DeferredFlushMixin, RotatingFileHandler):
+    pass
+
+class TimedRotatingFile(_DeferredFlushMixin, TimedRotatingFileHandler):
+    pass
+
+class Console(_DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that drains everything queued, then flushes once
+
+    After the first record of a batch it lingers briefly, so a burst of
+    records costs one wakeup and one write() rather than one per record.
+    """
+
+    batch_size = 500
+    linger = 0.01
+
+    def _monitor(self):
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            if batch[0] is not self._sentinel:
+                time.sleep(self.linger)
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(q.get_nowait())
+            except queue.Empty:
+                pass
+            for record in batch:
+                if record is self._sentinel:
+                    self._flush()
+                    return
+                self.handle(record)
+            self._flush()
+
+    def _flush(self):
+        for handler in self.handlers:
+            getattr(handler, 'flush_batch', handler.flush)()
+
+_listener = None
+_queue_handler = None
+_sampler = None
+_files = set()
+_lock = threading.Lock()
+
+def _file_handler(filename, max_bytes, backup_count, when):
+    if when:
+        return TimedRotatingFile(filename, when=when, backupCount=backup_count, encoding='utf-8')
+    return RotatingFile(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+
+def configure_logging(filename=None, level=None, json_format=None, console=True,
+                      max_bytes=10 * 1024 * 1024, backup_count=5, when=None,
+                      debug_sample_rate=100, queue_size=10_000):
+    """Route all logging through one queue and background listener
+
+    The first call installs the pipeline on the root logger; later calls
+    only add their log file to it, so each entry point keeps its own file.
+    Files rotate at `max_bytes`, or on a schedule when `when` is set
+    (TimedRotatingFileHandler units, e.g. 'midnight').
+    """
+    global _listener, _queue_handler, _sampler
+    if json_format is None:
+        json_format = os.environ.get('LOG_FORMAT', '').lower() == 'json'
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+
+    with _lock:
+        if _listener is not None:
+            if filename and os.path.abspath(filename) not in _files:
+                handler = _file_handler(filename, max_bytes, backup_count, when)
+                handler.setFormatter(formatter)
+                _listener.handlers = _listener.handlers + (handler,)
+                _files.add(os.path.abspath(filename))
+            return _listener
+
+        handlers = []
+        if filename:
+            handlers.append(_file_handler(filename, max_bytes, backup_count, when))
+            _files.add(os.path.abspath(filename))
+        if console:
+            handlers.append(Console())
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        _queue_handler = NonBlockingQueueHandler(queue.SimpleQueue(), maxsize=queue_size)
+        _sampler = SamplingFilter(rate=debug_sample_rate)
+        _queue_handler.addFilter(_sampler)
+
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        root.setLevel(level or os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+        _listener = BatchingQueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+def shutdown_logging():
+    """Flush queued records, stop the listener and close the log files"""
+    global _listener, _queue_handler, _sampler
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = _queue_handler = _sampler = None
+        _files.clear()
+
+def logging_metrics():
+    """Queue depth and records dropped by backpressure or sampling"""
+    if _queue_handler is None:
+        return {}
+    return {
+        'queued': _queue_handler.queue.qsize(),
+        'dropped_full': _queue_handler.dropped,
+        'dropped_sampled': _sampler.dropped,
+    }
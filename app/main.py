@@ -1,19 +1,23 @@
-from admin_panel import AdminPanel
+from app.admin_penel import AdminPanel
 import time
 import random
 
+# Also the synthetic stream of benchmarks/loadgen.py
+ACTIVITIES = (
+    "User login attempt",
+    "File upload detected",
+    "Database query executed",
+    "Configuration change",
+    "Security alert triggered"
+)
+
 def simulate_activity(admin_panel):
-    """Simulate various activities for testing"""
-    activities = [
-        "User login attempt",
-        "File upload detected",
-        "Database query executed",
-        "Configuration change",
-        "Security alert triggered"
-    ]
-    
+    """Simulate various activities for testing
+
+    For sustained load at a set rate use python -m benchmarks.loadgen.
+    """
     while True:
-        activity = random.choice(activities)
+        activity = random.choice(ACTIVITIES)
         admin_panel.monitor_activity(activity)
         time.sleep(random.randint(5, 15))
 
@@ -23,4 +27,4 @@ if __name__ == "__main__":
     try:
         simulate_activity(admin_panel)
     except KeyboardInterrupt:
-        print("\nAdmin Panel stopped")
\ No newline at end of file
+        print("\nAdmin Panel stopped")
@@ -0,0 +1,249 @@
+# AdminPanel/app/metrics.py
+"""
+Call counts, error counts and latency histograms for handlers, database
+calls, Telegram API calls and web routes.
+
+    @timed('db')
+    def get_user(self, user_id): ...
+
+    with timer('telegram', 'send_message'):
+        bot.send_message(...)
+
+Histograms use fixed 1-2-5 buckets from 10µs to 60s. Each thread counts
+into its own shard, so recording takes no lock; shards are summed when the
+metrics are read (the /metrics command and the Prometheus text endpoint).
+"""
+
+import asyncio
+import functools
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+# Upper bucket bounds in seconds; one more slot counts everything above
+BOUNDS = (
+    0.00001, 0.00002, 0.00005,
+    0.0001, 0.0002, 0.0005,
+    0.001, 0.002, 0.005,
+    0.01, 0.02, 0.05,
+    0.1, 0.2, 0.5,
+    1.0, 2.0, 5.0,
+    10.0, 30.0, 60.0,
+)
+_SUM = len(BOUNDS) + 1
+_ERRORS = _SUM + 1
+
+# family -> Prometheus help text
+FAMILIES = {
+    'handler': "Bot command handler latency",
+    'db': "AdminDatabase call latency",
+    'telegram': "Telegram Bot API call latency",
+    'http': "Web server request latency",
+    'webhook': "Time webhook updates wait for a worker",
+}
+
+class Histogram:
+    """Latency histogram with per-thread shards"""
+
+    def __init__(self, family, name):
+        self.family = family
+        self.name = name
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = [0] * (len(BOUNDS) + 1) + [0.0, 0]
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def observe(self, seconds, error=False):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[bisect_left(BOUNDS, seconds)] += 1
+        shard[_SUM] += seconds
+        if error:
+            shard[_ERRORS] += 1
+
+    def snapshot(self):
+        """{'buckets': counts per bound (+Inf last), 'count', 'sum', 'errors'}"""
+        with self._lock:
+            shards = list(self._shards)
+        totals = [sum(column) for column in zip(*shards)] if shards else [0] * (_ERRORS + 1)
+        buckets = totals[:_SUM]
+        return {
+            'buckets': buckets,
+            'count': sum(buckets),
+            'sum': totals[_SUM],
+            'errors': totals[_ERRORS],
+        }
+
+def quantile(snapshot, q):
+    """Upper bound of the bucket holding the q-th quantile (None if empty)"""
+    rank = q * snapshot['count']
+    seen = 0
+    for bound, count in zip(BOUNDS + (float('inf'),), snapshot['buckets']):
+        seen += count
+        if count and seen >= rank:
+            return bound
+    return None
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, family, name):
+        key = (family, name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(family, name))
+        return histogram
+
+    def histograms(self):
+        return sorted(self._histograms.values(), key=lambda h: (h.family, h.name))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+REGISTRY = MetricsRegistry()
+
+def timed(family, name=None, registry=REGISTRY):
+    """Decorator recording latency and errors of a function or coroutine"""
+    def decorator(func):
+        histogram = registry.histogram(family, name or func.__name__)
+        observe = histogram.observe
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    observe(perf_counter() - started, True)
+                    raise
+                observe(perf_counter() - started)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                observe(perf_counter() - started, True)
+                raise
+            observe(perf_counter() - started)
+            return result
+        return wrapper
+    return decorator
+
+class timer:
+    """Context manager form of timed()"""
+    __slots__ = ('_observe', '_started')
+
+    def __init__(self, family, name, registry=REGISTRY):
+        self._observe = registry.histogram(family, name).observe
+
+    def __enter__(self):
+        self._started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._observe(perf_counter() - self._started, exc_type is not None)
+        return False
+
+# Output
+def summary_lines(registry=REGISTRY):
+    """One line per histogram: calls, errors, mean and p50/p95/p99"""
+    lines = []
+    family = None
+    for histogram in registry.histograms():
+        snap = histogram.snapshot()
+        if not snap['count']:
+            continue
+        if histogram.family != family:
+            family = histogram.family
+            lines.append(f"[{family}]")
+        p50, p95, p99 = (quantile(snap, q) for q in (0.50, 0.95, 0.99))
+        lines.append(
+            f"{histogram.name}: {snap['count']} calls, {snap['errors']} errors, "
+            f"mean {snap['sum'] / snap['count'] * 1000:.2f}ms, "
+            f"p50≤{format_bound(p50)} p95≤{format_bound(p95)} p99≤{format_bound(p99)}"
+        )
+    return lines
+
+def format_bound(seconds):
+    if seconds == float('inf'):
+        return f">{BOUNDS[-1]:g}s"
+    if seconds >= 1:
+        return f"{seconds:g}s"
+    if seconds >= 0.001:
+        return f"{seconds * 1000:g}ms"
+    return f"{seconds * 1_000_000:g}µs"
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_text(registry=REGISTRY, prefix='adminpanel'):
+    """All histograms in the Prometheus text exposition format (0.0.4)"""
+    by_family = {}
+    for histogram in registry.histograms():
+        by_family.setdefault(histogram.family, []).append(histogram)
+
+    lines = []
+    for family, histograms in by_family.items():
+        metric = f"{prefix}_{family}_seconds"
+        errors = f"{prefix}_{family}_errors_total"
+        snapshots = [(h, h.snapshot()) for h in histograms]
+        lines.append(f"# HELP {metric} {FAMILIES.get(family, family)}")
+        lines.append(f"# TYPE {metric} histogram")
+        for histogram, snap in snapshots:
+            name = _label(histogram.name)
+            cumulative = 0
+            for bound, count in zip(BOUNDS, snap['buckets']):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{name="{name}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{name="{name}",le="+Inf"}} {snap["count"]}')
+            lines.append(f'{metric}_sum{{name="{name}"}} {snap["sum"]:.6f}')
+            lines.append(f'{metric}_count{{name="{name}"}} {snap["count"]}')
+        lines.append(f"# HELP {errors} Calls that raised, by {family}")
+        lines.append(f"# TYPE {errors} counter")
+        for histogram, snap in snapshots:
+            lines.append(f'{errors}{{name="{_label(histogram.name)}"}} {snap["errors"]}')
+    return "\n".join(lines) + "\n"
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics; nothing else"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404, "Not Found")
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port=9108, host='127.0.0.1'):
+    """Prometheus scrape endpoint on a daemon thread; returns the server"""
+    httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name='metrics-http', daemon=True).start()
+    return httpd
@@ -1,20 +1,187 @@
+import logging
+import threading
+import time
+from array import array
+
 import psutil
 from config.telegram_config import TelegramConfig
 
+logger = logging.getLogger(__name__)
+
+METRICS = ('cpu', 'memory', 'disk', 'net_sent', 'net_recv', 'proc_cpu', 'proc_rss')
+
+# Summary windows reported by /status, in seconds
+WINDOWS = {'1m': 60, '5m': 300, '15m': 900}
+
+class MetricRing:
+    """Fixed-size, array-backed ring buffer of timestamped samples"""
+
+    def __init__(self, fields, capacity):
+        self.fields = fields
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.columns = {field: array('d', bytes(8 * capacity)) for field in fields}
+        self.count = 0  # samples written so far
+        self._lock = threading.Lock()
+
+    def append(self, ts, values):
+        with self._lock:
+            index = self.count % self.capacity
+            self.times[index] = ts
+            for field in self.fields:
+                self.columns[field][index] = values[field]
+            self.count += 1
+
+    def latest(self):
+        """Most recent sample as a dict, or None before the first one"""
+        with self._lock:
+            if not self.count:
+                return None
+            index = (self.count - 1) % self.capacity
+            sample = {field: self.columns[field][index] for field in self.fields}
+            sample['time'] = self.times[index]
+        return sample
+
+    def window(self, field, seconds, now=None):
+        """Values of ``field`` sampled in the last ``seconds``, newest first"""
+        now = time.time() if now is None else now
+        since = now - seconds
+        values = []
+        with self._lock:
+            column = self.columns[field]
+            for offset in range(1, min(self.count, self.capacity) + 1):
+                index = (self.count - offset) % self.capacity
+                if self.times[index] < since:
+                    break
+                values.append(column[index])
+        return values
+
+def summarize(values):
+    """min/avg/max/p95 of a list of samples"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'min': ordered[0],
+        'avg': sum(ordered) / len(ordered),
+        'max': ordered[-1],
+        'p95': p95,
+    }
+
+class ResourceSampler:
+    """Background thread recording system and process metrics"""
+
+    def __init__(self, interval=1.0, history=900, disk_path='/'):
+        self.interval = interval
+        self.disk_path = disk_path
+        self.ring = MetricRing(METRICS, max(1, int(history / interval)))
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_net = None
+
+    def start(self):
+        if self._thread is None:
+            # Prime the CPU counters: the first call always returns 0.0
+            psutil.cpu_percent(interval=None)
+            self._process.cpu_percent(interval=None)
+            self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def sample(self):
+        now = time.time()
+        net = psutil.net_io_counters()
+        if self._last_net is None:
+            sent_rate = recv_rate = 0.0
+        else:
+            last_time, last = self._last_net
+            elapsed = max(now - last_time, 1e-6)
+            sent_rate = (net.bytes_sent - last.bytes_sent) / elapsed
+            recv_rate = (net.bytes_recv - last.bytes_recv) / elapsed
+        self._last_net = (now, net)
+
+        self.ring.append(now, {
+            # Average since the previous sample, not an instantaneous reading
+            'cpu': psutil.cpu_percent(interval=None),
+            'memory': psutil.virtual_memory().percent,
+            'disk': psutil.disk_usage(self.disk_path).percent,
+            'net_sent': sent_rate,
+            'net_recv': recv_rate,
+            'proc_cpu': self._process.cpu_percent(interval=None),
+            'proc_rss': self._process.memory_info().rss,
+        })
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error("Resource sampling failed: %s", e)
+
 class SystemMonitor:
-    @staticmethod
-    def check_resources():
-        """Monitor system resources"""
+    _sampler = None
+    _sampler_lock = threading.Lock()
+
+    @classmethod
+    def start_sampler(cls, interval=1.0, history=900):
+        """Start background sampling (``history`` seconds are retained)"""
+        with cls._sampler_lock:
+            if cls._sampler is None or not cls._sampler.running:
+                cls._sampler = ResourceSampler(interval, history).start()
+            return cls._sampler
+
+    @classmethod
+    def stop_sampler(cls):
+        with cls._sampler_lock:
+            if cls._sampler is not None:
+                cls._sampler.stop()
+                cls._sampler = None
+
+    @classmethod
+    def check_resources(cls):
+        """Monitor system resources (latest background sample)"""
+        sampler = cls.start_sampler() if cls._sampler is None else cls._sampler
+        latest = sampler.ring.latest()
+        if latest is not None:
+            return latest
+        # No sample yet: read directly once
         return {
             'cpu': psutil.cpu_percent(),
             'memory': psutil.virtual_memory().percent,
             'disk': psutil.disk_usage('/').percent
         }
 
+    @classmethod
+    def resource_stats(cls, fields=('cpu', 'memory', 'disk')):
+        """min/avg/max/p95 per field over the 1m/5m/15m windows"""
+        sampler = cls._sampler
+        if sampler is None:
+            return {}
+        now = time.time()
+        return {
+            field: {
+                name: summarize(sampler.ring.window(field, seconds, now))
+                for name, seconds in WINDOWS.items()
+            }
+            for field in fields
+        }
+
     @classmethod
     def resource_alert(cls):
         """Generate resource alerts"""
         resources = cls.check_resources()
         if resources['memory'] > 80:
             return f"⚠️ High Memory Usage: {resources['memory']}%"
-        return None
\ No newline at end of file
+        return None
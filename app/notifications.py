@@ -1,18 +1,24 @@
 from config.telegram_config import TelegramConfig
-from telegram import Bot
+from app.outbox import outbox_for
+from app.telegram_client import get_bot
 
-bot = Bot(token=TelegramConfig.BOT_TOKEN)
+def __getattr__(name):
+    # Keeps `from app.notifications import bot` working lazily
+    if name == 'bot':
+        return get_bot()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def send_alert(message):
-    """Send alert to admin"""
-    bot.send_message(
-        chat_id=TelegramConfig.ADMIN_ID,
-        text=f"🚨 ALERT: {message}"
+    """Queue alert to admin (bursts are merged into one digest)"""
+    outbox_for(get_bot()).send(
+        TelegramConfig.ADMIN_ID,
+        f"🚨 ALERT: {message}",
+        coalesce='alert'
     )
 
 def send_status(message):
-    """Send status update"""
-    bot.send_message(
-        chat_id=TelegramConfig.ADMIN_ID,
-        text=f"ℹ️ STATUS: {message}"
+    """Queue status update"""
+    outbox_for(get_bot()).send(
+        TelegramConfig.ADMIN_ID,
+        f"ℹ️ STATUS: {message}"
     )
\ No newline at end of file
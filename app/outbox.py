@@ -0,0 +1,238 @@
+# AdminPanel/app/outbox.py
+import atexit
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+
+from telegram.error import BadRequest, NetworkError, RetryAfter
+
+from app.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_LENGTH = 4096
+
+class OutboundMessage:
+    __slots__ = ('chat_id', 'text', 'kwargs', 'enqueued_at', 'attempts')
+
+    def __init__(self, chat_id, text, kwargs, enqueued_at):
+        self.chat_id = chat_id
+        self.text = text
+        self.kwargs = kwargs
+        self.enqueued_at = enqueued_at
+        self.attempts = 0
+
+class Outbox:
+    """Background sender for outbound Telegram messages
+
+    ``send`` queues a message and returns immediately. One worker thread
+    delivers the queue while respecting:
+
+    * a per-chat minimum interval and a global send rate (Telegram's flood
+      limits are about 1 msg/s per chat and 30 msg/s per bot);
+    * ``retry_after`` from 429 responses, then exponential backoff with
+      jitter for network errors;
+    * coalescing: messages sent with the same ``coalesce`` key to one chat
+      within ``coalesce_window`` seconds go out as a single digest.
+    """
+
+    def __init__(self, bot, per_chat_interval=1.0, global_rate=30,
+                 coalesce_window=2.0, max_queue=1000, max_retries=5):
+        self.bot = bot
+        self.per_chat_interval = per_chat_interval
+        self.global_interval = 1.0 / global_rate
+        self.coalesce_window = coalesce_window
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+
+        self._heap = []          # (not_before, seq, message)
+        self._digests = {}       # (chat_id, key) -> [due, first_enqueued, texts, kwargs]
+        self._chat_ready = {}    # chat_id -> earliest next send
+        self._next_send = 0.0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stopping = False
+
+        # Metrics
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+        atexit.register(self.close)
+
+    def _pending(self):
+        return len(self._heap) + sum(len(d[2]) for d in self._digests.values())
+
+    def send(self, chat_id, text, coalesce=None, **kwargs):
+        """Queue a message; returns False if it was dropped"""
+        now = time.monotonic()
+        with self._cond:
+            if self._stopping or self._pending() >= self.max_queue:
+                self.dropped += 1
+                logger.warning("Outbox full, dropped message to %s", chat_id)
+                return False
+
+            if coalesce is not None and self.coalesce_window > 0:
+                digest = self._digests.get((chat_id, coalesce))
+                if digest is None:
+                    self._digests[(chat_id, coalesce)] = [
+                        now + self.coalesce_window, now, [text], kwargs
+                    ]
+                else:
+                    digest[2].append(text)
+                    self.coalesced += 1
+            else:
+                self._push(OutboundMessage(chat_id, text, kwargs, now), now)
+
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='outbox', daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return True
+
+    def _push(self, message, not_before):
+        heapq.heappush(self._heap, (not_before, next(self._seq), message))
+
+    def _release_digests(self, now, force=False):
+        for key, (due, first, texts, kwargs) in list(self._digests.items()):
+            if force or due <= now:
+                del self._digests[key]
+                self._push(OutboundMessage(key[0], digest_text(texts), kwargs, first), now)
+
+    def _next_message(self):
+        """Block until a message may be sent; None once stopped and drained"""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._release_digests(now, force=self._stopping)
+
+                wake = None
+                if self._heap:
+                    not_before, _, message = self._heap[0]
+                    ready_at = max(not_before, self._next_send,
+                                   self._chat_ready.get(message.chat_id, 0.0))
+                    if ready_at <= now:
+                        heapq.heappop(self._heap)
+                        self._next_send = now + self.global_interval
+                        self._chat_ready[message.chat_id] = now + self.per_chat_interval
+                        return message
+                    if ready_at > not_before:
+                        # Chat or bot is throttled: requeue behind its limit
+                        heapq.heapreplace(self._heap, (ready_at, next(self._seq), message))
+                        continue
+                    wake = ready_at
+                elif self._stopping:
+                    return None
+
+                if self._digests:
+                    due = min(d[0] for d in self._digests.values())
+                    wake = due if wake is None else min(wake, due)
+                self._cond.wait(None if wake is None else max(0.0, wake - now))
+
+    def _run(self):
+        while True:
+            message = self._next_message()
+            if message is None:
+                return
+            self._deliver(message)
+
+    def _deliver(self, message):
+        try:
+            with timer('telegram', 'send_message'):
+                self.bot.send_message(chat_id=message.chat_id, text=message.text, **message.kwargs)
+        except RetryAfter as e:
+            # Flood control applies to the whole bot, not just this chat
+            self.retries += 1
+            with self._cond:
+                self._next_send = time.monotonic() + e.retry_after
+                self._push(message, self._next_send)
+            logger.warning("Flood control: retrying in %ss", e.retry_after)
+            return
+        except BadRequest as e:
+            # Subclass of NetworkError in PTB 13, but retrying will not help
+            self.failed += 1
+            logger.error("Rejected message to %s: %s", message.chat_id, e)
+            return
+        except NetworkError as e:
+            message.attempts += 1
+            if message.attempts > self.max_retries:
+                self.failed += 1
+                logger.error("Giving up on message to %s: %s", message.chat_id, e)
+                return
+            self.retries += 1
+            backoff = min(60.0, 2 ** message.attempts) * random.uniform(0.5, 1.0)
+            with self._cond:
+                self._push(message, time.monotonic() + backoff)
+            return
+        except Exception as e:
+            self.failed += 1
+            logger.error("Failed to send message to %s: %s", message.chat_id, e)
+            return
+
+        lag = time.monotonic() - message.enqueued_at
+        self.sent += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+    def close(self, timeout=5.0):
+        """Send out pending digests and drain the queue for up to ``timeout``"""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+        atexit.unregister(self.close)
+
+    def metrics(self):
+        with self._cond:
+            depth = self._pending()
+            oldest = min((m.enqueued_at for _, _, m in self._heap), default=None)
+        return {
+            'queue_depth': depth,
+            'queue_lag_s': round(time.monotonic() - oldest, 3) if oldest else 0.0,
+            'last_lag_s': round(self.last_lag, 3),
+            'max_lag_s': round(self.max_lag, 3),
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'retries': self.retries,
+            'failed': self.failed,
+            'dropped': self.dropped,
+        }
+
+def digest_text(texts):
+    """One message for several coalesced notifications"""
+    if len(texts) == 1:
+        return texts[0]
+    header = f"📬 {len(texts)} notifications\n━━━━━━━━━━━━━━\n"
+    lines = []
+    length = len(header)
+    for index, text in enumerate(texts):
+        line = f"• {text}"
+        more = f"\n…and {len(texts) - index} more"
+        if length + len(line) + 1 + len(more) > MAX_MESSAGE_LENGTH:
+            lines.append(more.strip())
+            break
+        lines.append(line)
+        length += len(line) + 1
+    return header + "\n".join(lines)
+
+_outboxes = {}
+_outboxes_lock = threading.Lock()
+
+def outbox_for(bot):
+    """Shared Outbox for a Bot instance"""
+    with _outboxes_lock:
+        outbox = _outboxes.get(id(bot))
+        if outbox is None:
+            outbox = _outboxes[id(bot)] = Outbox(bot)
+        return outbox
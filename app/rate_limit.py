@@ -0,0 +1,136 @@
+# AdminPanel/app/rate_limit.py
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class RateLimitExceeded(Exception):
+    """Raised when a key has no tokens left"""
+
+    def __init__(self, key, retry_after):
+        super().__init__(f"Rate limit exceeded for {key}, retry in {retry_after:.1f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+class MemoryBucketStore:
+    """In-process token bucket state, sharded by key
+
+    Each key holds one ``(tokens, updated)`` pair, so memory is constant per
+    key. Every shard is an LRU with its own lock, and idle keys are evicted
+    once ``max_keys`` is reached. An evicted key simply starts again with a
+    full bucket.
+    """
+
+    def __init__(self, max_keys=100_000, shards=16):
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self._per_shard = max(1, max_keys // shards)
+
+    def take(self, key, capacity, rate, cost=1):
+        """Spend ``cost`` tokens; returns seconds to wait, 0.0 if allowed"""
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            state = buckets.get(key)
+            if state is None:
+                tokens = capacity
+                if len(buckets) >= self._per_shard:
+                    buckets.popitem(last=False)
+            else:
+                tokens = min(capacity, state[0] + (now - state[1]) * rate)
+                buckets.move_to_end(key)
+
+            if tokens >= cost:
+                buckets[key] = (tokens - cost, now)
+                return 0.0
+            buckets[key] = (tokens, now)
+            return (cost - tokens) / rate
+
+    def __len__(self):
+        return sum(len(buckets) for _, buckets in self._shards)
+
+class SQLiteBucketStore:
+    """Token bucket state shared by several processes through SQLite
+
+    Use a distinct ``namespace`` for every limiter sharing one database file.
+    """
+
+    def __init__(self, db_path='rate_limits.db', namespace='default',
+                 idle_ttl=3600, purge_every=10_000):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.idle_ttl = idle_ttl
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._calls = 0
+        with self._connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, rate, cost=1):
+        """Spend ``cost`` tokens; returns seconds to wait, 0.0 if allowed"""
+        key = f"{self.namespace}:{key}"
+        now = time.time()  # wall clock: shared between processes
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated FROM rate_limits WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait:
+                tokens -= cost
+            conn.execute('''
+                INSERT INTO rate_limits (key, tokens, updated) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated
+            ''', (key, tokens, now))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._calls += 1
+        if self._calls % self.purge_every == 0:
+            self.purge(now)
+        return wait
+
+    def purge(self, now=None):
+        """Drop keys idle long enough to have refilled completely"""
+        cutoff = (now or time.time()) - self.idle_ttl
+        self._connection().execute('DELETE FROM rate_limits WHERE updated < ?', (cutoff,))
+
+class TokenBucketLimiter:
+    """Allow ``max_calls`` per ``time_frame`` seconds for each key"""
+
+    def __init__(self, max_calls, time_frame, store=None):
+        self.capacity = max_calls
+        self.rate = max_calls / time_frame
+        self.store = store or MemoryBucketStore()
+
+    def check(self, key, cost=1):
+        """Returns seconds until ``key`` may call again, 0.0 if allowed now"""
+        return self.store.take(key, self.capacity, self.rate, cost)
+
+    def acquire(self, key, cost=1):
+        """Spend tokens or raise RateLimitExceeded"""
+        wait = self.check(key, cost)
+        if wait:
+            raise RateLimitExceeded(key, wait)
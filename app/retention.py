@@ -0,0 +1,132 @@
+# AdminPanel/app/retention.py
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLUMNS = 'log_id, user_id, activity_type, details, ip_address, timestamp'
+
+class ActivityArchiver:
+    """Move old activity_log rows into per-month archive tables
+
+    Rows older than ``retention_days`` are copied to
+    ``activity_log_archive_YYYY_MM`` and deleted from ``activity_log`` in
+    chunks of ``chunk_size``. Each chunk is its own short transaction, so
+    live writers are only ever blocked for one chunk. With ``archive_path``
+    the archive tables live in a separate, attached database file.
+    """
+
+    def __init__(self, database, retention_days=90, chunk_size=5000,
+                 pause=0.01, archive_path=None):
+        self.db = database
+        self.retention_days = retention_days
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.archive_path = archive_path
+        self._known_tables = set()
+
+    def cutoff(self):
+        """Timestamp (CURRENT_TIMESTAMP format) before which rows are archived"""
+        limit = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        return limit.strftime('%Y-%m-%d %H:%M:%S')
+
+    def _table_name(self, month):
+        schema = 'archive.' if self.archive_path else ''
+        return f"{schema}activity_log_archive_{month}"
+
+    def _ensure_table(self, conn, table):
+        if table in self._known_tables:
+            return
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                log_id INTEGER PRIMARY KEY,
+                user_id INTEGER,
+                activity_type TEXT NOT NULL,
+                details TEXT,
+                ip_address TEXT,
+                timestamp TIMESTAMP
+            )
+        ''')
+        self._known_tables.add(table)
+
+    def archive_chunk(self, cutoff):
+        """Archive one chunk of rows older than cutoff; returns rows moved"""
+        with self.db._get_connection() as conn:
+            if self.archive_path:
+                conn.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+            try:
+                rows = conn.execute(f'''
+                    SELECT {ARCHIVE_COLUMNS}, strftime('%Y_%m', timestamp) AS month
+                    FROM activity_log
+                    WHERE timestamp < ?
+                    ORDER BY timestamp
+                    LIMIT ?
+                ''', (cutoff, self.chunk_size)).fetchall()
+                if not rows:
+                    return 0
+
+                by_month = defaultdict(list)
+                for row in rows:
+                    by_month[row['month'] or 'undated'].append(tuple(row)[:-1])
+
+                for month, month_rows in by_month.items():
+                    table = self._table_name(month)
+                    self._ensure_table(conn, table)
+                    conn.executemany(
+                        f'INSERT OR IGNORE INTO {table} ({ARCHIVE_COLUMNS}) '
+                        f'VALUES (?, ?, ?, ?, ?, ?)',
+                        month_rows
+                    )
+                conn.executemany(
+                    'DELETE FROM activity_log WHERE log_id = ?',
+                    [(row['log_id'],) for row in rows]
+                )
+                conn.commit()
+                return len(rows)
+            finally:
+                if self.archive_path:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    conn.execute('DETACH DATABASE archive')
+
+    def run(self, max_chunks=None):
+        """Archive everything past retention; returns total rows moved"""
+        cutoff = self.cutoff()
+        moved = chunks = 0
+        started = time.perf_counter()
+        while max_chunks is None or chunks < max_chunks:
+            count = self.archive_chunk(cutoff)
+            if not count:
+                break
+            moved += count
+            chunks += 1
+            # Let queued writers in between chunks
+            time.sleep(self.pause)
+
+        if moved:
+            logger.info(
+                "Archived %d activity rows older than %s in %d chunks (%.1fs)",
+                moved, cutoff, chunks, time.perf_counter() - started
+            )
+        return moved
+
+if __name__ == '__main__':
+    import argparse
+    from app.database import get_db
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Archive old activity_log rows")
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--archive-db', help="separate database file for archives")
+    args = parser.parse_args()
+
+    archiver = ActivityArchiver(
+        get_db(),
+        retention_days=args.days,
+        chunk_size=args.chunk_size,
+        archive_path=args.archive_db
+    )
+    print(f"Archived {archiver.run()} rows")
@@ -0,0 +1,319 @@
+# AdminPanel/app/rollups.py
+"""
+Pre-aggregated activity counts for /stats.
+
+activity_rollup holds event counts per minute, hour and day by
+activity_type (and, for 'command' events, the command itself, e.g.
+'/start'). user_activity_rollup holds the per-user counts by hour and day.
+Range queries read a few hundred rollup rows instead of scanning
+activity_log.
+
+The compactor folds new activity_log rows into the rollups in batches.
+Each batch is a single transaction that also advances the high-water
+log_id in rollup_state, so every row is counted exactly once.
+rebuild() backfills from history: it moves the high-water mark to the
+current newest row first, then aggregates older rows on parallel threads.
+The live compactor only counts rows above the mark, and all writes are
+additive, so the two never overlap. Buckets older than the oldest row
+still in activity_log are kept, since retention has archived their rows.
+
+    python -m app.rollups --rebuild --workers 4
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+# period -> length of the timestamp prefix that names its bucket
+PERIODS = {'minute': 16, 'hour': 13, 'day': 10}
+USER_PERIODS = ('hour', 'day')
+STEPS = {'minute': timedelta(minutes=1), 'hour': timedelta(hours=1), 'day': timedelta(days=1)}
+
+# One grouped scan per period; SQLite does the counting (and releases the
+# GIL while it does, so rebuild threads run in parallel)
+TOTALS_SQL = '''
+    SELECT ?, substr(timestamp, 1, ?) AS bucket, activity_type,
+           CASE WHEN activity_type = 'command'
+                THEN COALESCE(substr(details, 1, instr(details || ' ', ' ') - 1), '')
+                ELSE '' END AS command,
+           COUNT(*)
+    FROM activity_log
+    WHERE log_id > ? AND log_id <= ? AND timestamp IS NOT NULL
+    GROUP BY bucket, activity_type, command
+'''
+
+USERS_SQL = '''
+    SELECT ?, user_id, substr(timestamp, 1, ?) AS bucket, activity_type, COUNT(*)
+    FROM activity_log
+    WHERE log_id > ? AND log_id <= ? AND timestamp IS NOT NULL AND user_id IS NOT NULL
+    GROUP BY user_id, bucket, activity_type
+'''
+
+UPSERT_TOTALS = '''
+    INSERT INTO activity_rollup (period, bucket, activity_type, command, events)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(period, bucket, activity_type, command)
+    DO UPDATE SET events = events + excluded.events
+'''
+
+UPSERT_USERS = '''
+    INSERT INTO user_activity_rollup (period, user_id, bucket, activity_type, events)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(period, user_id, bucket, activity_type)
+    DO UPDATE SET events = events + excluded.events
+'''
+
+def aggregate(conn, low, high):
+    """Rollup increments for activity_log rows with low < log_id <= high
+
+    Returns (totals, users) as lists of upsert parameter tuples.
+    """
+    totals, users = [], []
+    for period, width in PERIODS.items():
+        totals.extend(conn.execute(TOTALS_SQL, (period, width, low, high)))
+    for period in USER_PERIODS:
+        users.extend(conn.execute(USERS_SQL, (period, PERIODS[period], low, high)))
+    return totals, users
+
+def counted(totals):
+    """Rows behind a batch of increments (each row is in every period)"""
+    return sum(row[-1] for row in totals) // len(PERIODS)
+
+def apply(conn, totals, users):
+    conn.executemany(UPSERT_TOTALS, (tuple(row) for row in totals))
+    conn.executemany(UPSERT_USERS, (tuple(row) for row in users))
+
+def bucket_of(moment, period):
+    return moment.strftime('%Y-%m-%d %H:%M')[:PERIODS[period]]
+
+def pick_period(span, user_id=None):
+    """Finest period that keeps a range to a readable number of buckets"""
+    if span <= timedelta(hours=3) and user_id is None:
+        return 'minute'
+    if span <= timedelta(days=3):
+        return 'hour'
+    return 'day'
+
+class RollupCompactor:
+    """Keeps the rollup tables up to date with activity_log"""
+
+    def __init__(self, database, interval=60, batch_size=50_000):
+        self.db = database
+        self.interval = interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def high_water(self):
+        with self.db._get_connection() as conn:
+            row = conn.execute(
+                "SELECT last_log_id FROM rollup_state WHERE name = 'activity'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    # Incremental
+    def compact(self, max_batches=None, blocking=True):
+        """Fold rows above the high-water mark in; returns rows counted
+
+        With blocking=False, returns 0 at once if a compaction is running.
+        """
+        if not self._lock.acquire(blocking):
+            return 0
+        try:
+            self.db.flush_activity()
+            total = batches = 0
+            while max_batches is None or batches < max_batches:
+                with self.db._get_connection() as conn:
+                    # Write lock first: another process may be compacting too
+                    conn.execute('BEGIN IMMEDIATE')
+                    low = conn.execute(
+                        "SELECT last_log_id FROM rollup_state WHERE name = 'activity'"
+                    ).fetchone()
+                    low = low[0] if low else 0
+                    newest = conn.execute('SELECT MAX(log_id) FROM activity_log').fetchone()[0] or 0
+                    if newest <= low:
+                        conn.rollback()
+                        break
+                    high = min(newest, low + self.batch_size)
+                    totals, users = aggregate(conn, low, high)
+                    apply(conn, totals, users)
+                    conn.execute('''
+                        INSERT INTO rollup_state (name, last_log_id) VALUES ('activity', ?)
+                        ON CONFLICT(name) DO UPDATE SET last_log_id = excluded.last_log_id
+                    ''', (high,))
+                    conn.commit()
+                total += counted(totals)
+                batches += 1
+            return total
+        finally:
+            self._lock.release()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='rollups', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error("Rollup compaction failed: %s", e)
+            if self._stop.wait(self.interval):
+                return
+
+    # Backfill
+    def rebuild(self, workers=4, chunk_size=200_000):
+        """Recount activity_log in parallel chunks; returns rows counted
+
+        Only buckets from the one holding the oldest live row onwards are
+        replaced; that boundary bucket loses any part already archived.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.db.flush_activity()
+            with self.db._get_connection() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                oldest, newest = conn.execute(
+                    'SELECT MIN(log_id), MAX(log_id) FROM activity_log'
+                ).fetchone()
+                first = conn.execute('SELECT MIN(timestamp) FROM activity_log').fetchone()[0]
+                if first is not None:
+                    for period, width in PERIODS.items():
+                        conn.execute(
+                            'DELETE FROM activity_rollup WHERE period = ? AND bucket >= ?',
+                            (period, first[:width])
+                        )
+                    for period in USER_PERIODS:
+                        conn.execute(
+                            'DELETE FROM user_activity_rollup WHERE period = ? AND bucket >= ?',
+                            (period, first[:PERIODS[period]])
+                        )
+                # From here on the compactor only counts rows above ``newest``
+                conn.execute('''
+                    INSERT INTO rollup_state (name, last_log_id) VALUES ('activity', ?)
+                    ON CONFLICT(name) DO UPDATE SET last_log_id = excluded.last_log_id
+                ''', (newest or 0,))
+                conn.commit()
+        if newest is None:
+            return 0
+
+        write_lock = threading.Lock()
+
+        def backfill(low):
+            high = min(newest, low + chunk_size)
+            with self.db._get_connection() as conn:
+                totals, users = aggregate(conn, low, high)
+                # Aggregating reads run in parallel; writes take turns here
+                # rather than in SQLite's busy-timeout backoff
+                with write_lock:
+                    apply(conn, totals, users)
+                    conn.commit()
+            return counted(totals)
+
+        with ThreadPoolExecutor(workers, thread_name_prefix='rollup-rebuild') as pool:
+            total = sum(pool.map(backfill, range(oldest - 1, newest, chunk_size)))
+        logger.info("Rebuilt rollups from %d rows in %.1fs", total, time.perf_counter() - started)
+        return total
+
+    # Queries
+    def series(self, since, until, period, activity_type=None, command=None, user_id=None):
+        """[(bucket, events)] for since <= bucket < until, oldest first"""
+        table, conditions, params = self._source(period, activity_type, command, user_id)
+        with self.db._get_connection() as conn:
+            return [tuple(row) for row in conn.execute(f'''
+                SELECT bucket, SUM(events) FROM {table}
+                WHERE {conditions} AND bucket >= ? AND bucket < ?
+                GROUP BY bucket ORDER BY bucket
+            ''', params + [bucket_of(since, period), bucket_of(until, period)])]
+
+    def top(self, since, until, period, activity_type=None, command=None, user_id=None, limit=10):
+        """Busiest activity types (or commands, within type 'command')"""
+        table, conditions, params = self._source(period, activity_type, command, user_id)
+        column = 'command' if activity_type == 'command' and user_id is None else 'activity_type'
+        with self.db._get_connection() as conn:
+            return [tuple(row) for row in conn.execute(f'''
+                SELECT {column}, SUM(events) AS total FROM {table}
+                WHERE {conditions} AND bucket >= ? AND bucket < ?
+                GROUP BY {column} ORDER BY total DESC LIMIT ?
+            ''', params + [bucket_of(since, period), bucket_of(until, period), limit])]
+
+    def _source(self, period, activity_type, command, user_id):
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+        conditions, params = ['period = ?'], [period]
+        if user_id is not None:
+            if period not in USER_PERIODS or command is not None:
+                raise ValueError("Per-user rollups are hourly and daily, without commands")
+            table = 'user_activity_rollup'
+            conditions.append('user_id = ?')
+            params.append(user_id)
+        else:
+            table = 'activity_rollup'
+        if activity_type is not None:
+            conditions.append('activity_type = ?')
+            params.append(activity_type)
+        if command is not None:
+            conditions.append('command = ?')
+            params.append(command)
+        return table, ' AND '.join(conditions), params
+
+def truncate(moment, period):
+    """Start of the bucket holding ``moment``"""
+    moment = moment.replace(second=0, microsecond=0)
+    if period in ('hour', 'day'):
+        moment = moment.replace(minute=0)
+    if period == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+def last(span, period, now=None):
+    """(since, until) covering the last ``span``, up to the current bucket"""
+    until = truncate(now or datetime.now(timezone.utc), period) + STEPS[period]
+    return until - span, until
+
+_compactor = None
+_compactor_lock = threading.Lock()
+
+def get_rollups():
+    """Process-wide RollupCompactor, compacting in the background"""
+    global _compactor
+    if _compactor is None:
+        with _compactor_lock:
+            if _compactor is None:
+                from app.database import get_db
+                _compactor = RollupCompactor(get_db()).start()
+    return _compactor
+
+if __name__ == '__main__':
+    import argparse
+    from app.database import get_db
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Maintain the activity rollup tables")
+    parser.add_argument('--rebuild', action='store_true', help="recount all history")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--chunk-size', type=int, default=200_000)
+    args = parser.parse_args()
+
+    compactor = RollupCompactor(get_db())
+    started = time.perf_counter()
+    if args.rebuild:
+        rows = compactor.rebuild(args.workers, args.chunk_size)
+    else:
+        rows = compactor.compact()
+    elapsed = time.perf_counter() - started
+    print(f"Counted {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)")
@@ -1,65 +1,240 @@
 # StudentTesting/scripts/server.py
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import os
 import sqlite3
+import threading
+import time
 from urllib.parse import urlparse, parse_qs
 import html
 import logging
 from config import SERVER_CONFIG, VULNERABILITIES
+from app.metrics import timer
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='server.log'
-)
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Logging is configured by run_server (queued, rotating server.log)
 logger = logging.getLogger(__name__)
 
-class VulnerableRequestHandler(BaseHTTPRequestHandler):
-    """Deliberately vulnerable HTTP handler for educational purposes"""
-    
-    # Initialize fake database
-    def init_db(self):
-        self.conn = sqlite3.connect(':memory:')
-        self.cursor = self.conn.cursor()
-        self.cursor.execute('''
+ROUTES = ('/', '/login', '/dashboard', '/search')
+
+class UsersDatabase:
+    """Fake in-memory users database, created once per server
+
+    Each worker thread gets its own connection to one shared-cache memory
+    database. The keeper connection holds it open for the server's lifetime.
+    """
+
+    def __init__(self):
+        self.uri = f'file:server_users_{id(self)}?mode=memory&cache=shared'
+        self._keeper = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        self._local = threading.local()
+        self._keeper.execute('''
             CREATE TABLE users (
                 id INTEGER PRIMARY KEY,
                 username TEXT,
                 password TEXT
             )
         ''')
-        self.cursor.execute("INSERT INTO users VALUES (1, 'admin', 'password123')")
-        self.cursor.execute("INSERT INTO users VALUES (2, 'user', 'qwerty')")
-        self.conn.commit()
+        self._keeper.execute("INSERT INTO users VALUES (1, 'admin', 'password123')")
+        self._keeper.execute("INSERT INTO users VALUES (2, 'user', 'qwerty')")
+        self._keeper.commit()
+
+    def cursor(self):
+        """Cursor on the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.uri, uri=True)
+        return conn.cursor()
+
+    def close(self):
+        self._keeper.close()
+
+class StaticAsset:
+    """A static file with complete, pre-encoded HTTP responses
+
+    Each encoding is its own representation with its own ETag (suffixed
+    -gz / -br), so a cached gzip body is never revalidated as identity.
+    """
+
+    SUFFIXES = {None: '', 'gzip': '-gz', 'br': '-br'}
+
+    def __init__(self, path, content_type, mtime_ns, body):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = len(body)
+        self.checked = time.monotonic()
+
+        bodies = {None: body}
+        compressed = gzip.compress(body, 9)
+        if len(compressed) < self.size:
+            bodies['gzip'] = compressed
+        if brotli is not None:
+            compressed = brotli.compress(body)
+            if len(compressed) < self.size:
+                bodies['br'] = compressed
+
+        self.etags, self.responses, self.not_modified = {}, {}, {}
+        for encoding, encoded in bodies.items():
+            etag = self.etags[encoding] = f'"{mtime_ns:x}-{self.size:x}{self.SUFFIXES[encoding]}"'
+            base = [
+                f'Content-Type: {content_type}',
+                f'ETag: {etag}',
+                'Cache-Control: no-cache',
+                'Vary: Accept-Encoding',
+            ]
+            self.not_modified[encoding] = self._response(304, base[1:], b'')
+            if encoding:
+                base.append(f'Content-Encoding: {encoding}')
+            self.responses[encoding] = self._response(200, base, encoded)
+
+    @staticmethod
+    def _response(status, headers, body):
+        reason = 'OK' if status == 200 else 'Not Modified'
+        head = [f'HTTP/1.1 {status} {reason}'] + headers
+        if status == 200:
+            head.append(f'Content-Length: {len(body)}')
+        return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+    @staticmethod
+    def _accepted(token):
+        """Coding name from an Accept-Encoding token, or None if its q is 0"""
+        coding, *params = token.split(';')
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    if float(value) <= 0:
+                        return None
+                except ValueError:
+                    return None
+        return coding.strip().lower()
+
+    def encoding(self, accept_encoding):
+        """Best available encoding for an Accept-Encoding header (None = identity)"""
+        if accept_encoding:
+            offered = {self._accepted(token) for token in accept_encoding.split(',')}
+            for encoding in ('br', 'gzip'):
+                if encoding in offered and encoding in self.responses:
+                    return encoding
+        return None
+
+    def response(self, accept_encoding):
+        """Best pre-encoded 200 response for an Accept-Encoding header"""
+        return self.responses[self.encoding(accept_encoding)]
+
+class StaticFileCache:
+    """Files loaded once and re-read only when their mtime changes"""
+
+    def __init__(self, content_type='text/html', check_interval=1.0):
+        self.content_type = content_type
+        self.check_interval = check_interval
+        self._assets = {}
+
+    def get(self, filename):
+        """Cached asset, or None if the file does not exist"""
+        asset = self._assets.get(filename)
+        now = time.monotonic()
+        if asset is not None and now - asset.checked < self.check_interval:
+            return asset
+
+        try:
+            stat = os.stat(filename)
+            if asset is not None and asset.mtime_ns == stat.st_mtime_ns and asset.size == stat.st_size:
+                asset.checked = now
+                return asset
+            with open(filename, 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            self._assets.pop(filename, None)
+            return None
+
+        asset = self._assets[filename] = StaticAsset(
+            filename, self.content_type, stat.st_mtime_ns, body
+        )
+        return asset
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """HTTP server that handles connections on a fixed pool of workers"""
+
+    def __init__(self, server_address, RequestHandlerClass, workers=16):
+        super().__init__(server_address, RequestHandlerClass)
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http')
+        self.users_db = UsersDatabase()
+        self.static_files = StaticFileCache()
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+        self.users_db.close()
+
+class VulnerableRequestHandler(BaseHTTPRequestHandler):
+    """Deliberately vulnerable HTTP handler for educational purposes"""
+    
+    # Keep-alive; idle connections give their worker back after `timeout`
+    protocol_version = 'HTTP/1.1'
+    timeout = 5
+    # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    
+    @property
+    def cursor(self):
+        return self.server.users_db.cursor()
+
+    def log_message(self, format, *args):
+        # Access log goes to server.log instead of an unbuffered stderr write
+        logger.info("%s - " + format, self.address_string(), *args)
+
+    def send_html(self, body, status=200):
+        """Send a complete HTML response with Content-Length"""
+        self.send_response(status)
+        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     # Handle GET requests
     def do_GET(self):
         parsed_path = urlparse(self.path)
         endpoint = parsed_path.path
         
-        # Route handling
-        if endpoint == '/':
-            self.serve_file('html/index.html')
-        elif endpoint == '/login':
-            self.serve_file('html/login.html')
-        elif endpoint == '/dashboard':
-            self.handle_dashboard(parsed_path.query)
-        elif endpoint == '/search':
-            self.handle_search(parsed_path.query)
-        else:
-            self.send_error(404, "Not Found")
+        # Latency per known route; unknown paths share one label
+        with timer('http', endpoint if endpoint in ROUTES else 'not_found'):
+            # Route handling
+            if endpoint == '/':
+                self.serve_file('html/index.html')
+            elif endpoint == '/login':
+                self.serve_file('html/login.html')
+            elif endpoint == '/dashboard':
+                self.handle_dashboard(parsed_path.query)
+            elif endpoint == '/search':
+                self.handle_search(parsed_path.query)
+            else:
+                self.send_error(404, "Not Found")
 
-    # Serve static files
+    # Serve static files (from memory, see StaticFileCache)
     def serve_file(self, filename):
-        try:
-            with open(filename, 'rb') as f:
-                content = f.read()
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            self.wfile.write(content)
-        except FileNotFoundError:
+        asset = self.server.static_files.get(filename)
+        if asset is None:
             self.send_error(404, "File Not Found")
+            return
+
+        encoding = asset.encoding(self.headers.get('Accept-Encoding'))
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and (if_none_match.strip() == '*' or asset.etags[encoding] in if_none_match):
+            self.wfile.write(asset.not_modified[encoding])
+            self.log_request(304)
+        else:
+            self.wfile.write(asset.responses[encoding])
+            self.log_request(200)
 
     # Vulnerable login handler (SQLi vulnerable)
     def handle_dashboard(self, query):
@@ -67,21 +242,23 @@ class VulnerableRequestHandler(BaseHTTPRequestHandler):
         username = params.get('username', [''])[0]
         password = params.get('password', [''])[0]
 
+        cursor = self.cursor
+        
         # Deliberately vulnerable SQL query
         if VULNERABILITIES['SQL_INJECTION']:
             query = f"SELECT * FROM users WHERE username='{username}' AND password='{password}'"
-            logger.warning(f"Executing vulnerable query: {query}")
+            logger.warning("Executing vulnerable query: %s", query)
             try:
-                self.cursor.execute(query)
-                user = self.cursor.fetchone()
+                cursor.execute(query)
+                user = cursor.fetchone()
             except sqlite3.Error as e:
-                logger.error(f"SQL Error: {e}")
+                logger.error("SQL Error: %s", e)
                 user = None
         else:
             # Secure version
             query = "SELECT * FROM users WHERE username=? AND password=?"
-            self.cursor.execute(query, (username, password))
-            user = self.cursor.fetchone()
+            cursor.execute(query, (username, password))
+            user = cursor.fetchone()
 
         if user:
             response = f"""
@@ -104,10 +281,7 @@ class VulnerableRequestHandler(BaseHTTPRequestHandler):
             </html>
             """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(response.encode())
+        self.send_html(response.encode())
 
     # XSS vulnerable search handler
     def handle_search(self, query):
@@ -124,20 +298,21 @@ class VulnerableRequestHandler(BaseHTTPRequestHandler):
         </html>
         """
         
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(response.encode())
+        self.send_html(response.encode())
 
-def run_server():
+def run_server(workers=None):
     """Start the vulnerable server"""
+    from app.logging_setup import configure_logging
+    configure_logging('server.log', console=False)
     server_address = (SERVER_CONFIG['HOST'], SERVER_CONFIG['PORT'])
-    httpd = HTTPServer(server_address, VulnerableRequestHandler)
-    
-    # Initialize fake database
-    httpd.RequestHandlerClass().init_db()
+    workers = workers or SERVER_CONFIG.get('WORKERS', 16)
+    httpd = PooledHTTPServer(server_address, VulnerableRequestHandler, workers=workers)
+    # Prometheus scrape endpoint on localhost only, e.g. METRICS_PORT=9109
+    if os.environ.get('METRICS_PORT'):
+        from app.metrics import start_metrics_server
+        start_metrics_server(int(os.environ['METRICS_PORT']))
     
-    logger.info(f"Starting vulnerable server on {SERVER_CONFIG['HOST']}:{SERVER_CONFIG['PORT']}")
+    logger.info("Starting vulnerable server on %s:%s (%d workers)", *server_address, workers)
     print(f"Server running at http://{SERVER_CONFIG['HOST']}:{SERVER_CONFIG['PORT']}")
     
     try:
@@ -148,4 +323,4 @@ def run_server():
         httpd.server_close()
 
 if __name__ == '__main__':
-    run_server()
\ No newline at end of file
+    run_server()
@@ -0,0 +1,81 @@
+# AdminPanel/app/telegram_client.py
+"""
+One Telegram Bot API client per process, shared by everything that sends.
+
+python-telegram-bot gives every Bot its own urllib3 connection pool, so
+each Bot()/Updater() built from a token opens (and TLS-handshakes) its own
+connections. get_bot() builds one send-only Bot whose pool keeps
+connections alive and is sized for the threads that send through it:
+dispatcher workers, the outbox, broadcast fan-out and exports.
+
+    TELEGRAM_POOL_SIZE   connections kept open (default 16)
+    TELEGRAM_API_URL     Bot API base URL, e.g. a local Bot API server
+
+Receiving is separate: updater_for() wraps the same Bot in an Updater, so
+polling borrows a connection from the shared pool instead of adding a
+second one. PTB 13's vendored urllib3 speaks HTTP/1.1 only; keep-alive is
+what saves the handshake per request.
+"""
+
+import logging
+import os
+import threading
+
+from config.telegram_config import TelegramConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 16
+# Updater needs a connection for getUpdates and a few for its own calls
+# on top of one per dispatcher worker
+UPDATER_CONNECTIONS = 4
+
+def pool_size():
+    """TELEGRAM_POOL_SIZE, else TelegramConfig.POOL_SIZE, else 16"""
+    value = os.environ.get('TELEGRAM_POOL_SIZE') or getattr(TelegramConfig, 'POOL_SIZE', None)
+    return int(value or DEFAULT_POOL_SIZE)
+
+def build_bot(token=None, size=None, base_url=None, timeout=None):
+    """A Bot with its own keep-alive pool of ``size`` connections
+
+    Use get_bot() in the app; this is for tools and benchmarks that need
+    a client of their own.
+    """
+    from telegram import Bot
+    from telegram.utils.request import Request
+
+    timeout = timeout or getattr(TelegramConfig, 'REQUEST_TIMEOUT', 5.0)
+    request = Request(
+        con_pool_size=size or pool_size(),
+        connect_timeout=timeout,
+        read_timeout=timeout,
+    )
+    return Bot(
+        token=token or TelegramConfig.BOT_TOKEN,
+        base_url=base_url or os.environ.get('TELEGRAM_API_URL') or None,
+        request=request,
+    )
+
+_bot = None
+_bot_lock = threading.Lock()
+
+def get_bot():
+    """Process-wide Bot client, created on first use"""
+    global _bot
+    if _bot is None:
+        with _bot_lock:
+            if _bot is None:
+                _bot = build_bot()
+                logger.info("Telegram client ready (pool of %d connections)",
+                            _bot.request.con_pool_size)
+    return _bot
+
+def updater_for(workers=4, **kwargs):
+    """Updater that receives with the shared Bot instead of a new client"""
+    from telegram.ext import Updater
+
+    bot = get_bot()
+    if bot.request.con_pool_size < workers + UPDATER_CONNECTIONS:
+        logger.warning("Telegram pool of %d is small for %d workers; set TELEGRAM_POOL_SIZE=%d",
+                       bot.request.con_pool_size, workers, workers + UPDATER_CONNECTIONS)
+    return Updater(bot=bot, workers=workers, use_context=True, **kwargs)
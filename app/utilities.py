@@ -1,24 +1,61 @@
-import time
+import asyncio
+import functools
+import math
 from datetime import datetime
+from app.rate_limit import RateLimitExceeded, TokenBucketLimiter
 
 def timestamp():
     """Get formatted timestamp"""
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-def rate_limited(max_calls, time_frame):
-    """Simple rate limiter decorator"""
+async def offload(func, *args, **kwargs):
+    """Await a blocking call on the running loop's default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+def update_user_key(*args, **kwargs):
+    """Rate limit key for handler calls: the user behind the update"""
+    update = args[0] if args else None
+    user = getattr(update, 'effective_user', None)
+    if user is not None:
+        return user.id
+    return 'global'
+
+def update_chat_key(*args, **kwargs):
+    """Rate limit key for handler calls: the chat behind the update"""
+    update = args[0] if args else None
+    chat = getattr(update, 'effective_chat', None)
+    if chat is not None:
+        return chat.id
+    return update_user_key(*args, **kwargs)
+
+def rate_limited(max_calls, time_frame, key=update_user_key, store=None):
+    """Per-key token bucket rate limiter decorator
+
+    Handler calls are limited per user by default. A limited Telegram update
+    gets a short reply instead of an exception (for a coroutine handler, a
+    coroutine that sends it through offload); other callers see
+    RateLimitExceeded. Pass a SQLiteBucketStore as ``store`` to share the
+    limit between bot processes.
+    """
+    limiter = TokenBucketLimiter(max_calls, time_frame, store=store)
+
     def decorator(func):
-        calls = []
-        
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            now = time.time()
-            calls.append(now)
-            
-            # Remove old calls
-            calls[:] = [call for call in calls if now - call < time_frame]
-            
-            if len(calls) > max_calls:
-                raise Exception("Rate limit exceeded")
+            limit_key = key(*args, **kwargs)
+            wait = limiter.check(limit_key)
+            if wait:
+                message = getattr(args[0], 'message', None) if args else None
+                if message is not None:
+                    text = f"⏳ Too many requests, try again in {math.ceil(wait)}s"
+                    if asyncio.iscoroutinefunction(func):
+                        # Sent from the event loop like any other async reply
+                        return offload(message.reply_text, text)
+                    message.reply_text(text)
+                    return None
+                raise RateLimitExceeded(limit_key, wait)
             return func(*args, **kwargs)
+        wrapper.limiter = limiter
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
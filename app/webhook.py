@@ -0,0 +1,236 @@
+# AdminPanel/app/webhook.py
+"""
+Webhook receiver: Telegram POSTs each update to us instead of being polled.
+
+The HTTP thread only checks the secret token, drops update_ids it has
+already seen (Telegram re-delivers when an acknowledgement is lost), puts
+the parsed JSON on a bounded queue and answers 200 at once. A fixed pool
+of workers takes updates off the queue and dispatches them. When the
+queue is full the receiver answers 503, and Telegram retries later.
+
+Try it locally by POSTing recorded updates (one JSON object per line):
+    python -m app.webhook --post updates.jsonl --url http://127.0.0.1:8443/telegram --secret s3cret
+"""
+
+import hmac
+import json
+import logging
+import queue
+import signal
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from app.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = 30
+
+    def do_POST(self):
+        receiver = self.server.receiver
+        # Refusals leave the body unread, so the connection cannot be reused
+        if self.path.split('?')[0] != receiver.path:
+            self.close_connection = True
+            self.respond(404)
+            return
+        if not receiver.authorized(self.headers.get(SECRET_HEADER)):
+            receiver.count('rejected')
+            self.close_connection = True
+            self.respond(403)
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > receiver.max_body:
+            self.close_connection = True
+            self.respond(413)
+            return
+        try:
+            data = json.loads(self.rfile.read(length))
+            update_id = int(data['update_id'])
+        except (ValueError, KeyError, TypeError):
+            self.respond(400)
+            return
+
+        self.respond(receiver.submit(update_id, data))
+
+    def respond(self, status):
+        self.send_response_only(status)
+        self.send_header('Content-Length', '0')
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+class WebhookReceiver:
+    """HTTP endpoint plus a bounded queue and worker pool for updates
+
+    ``process(data)`` is called on a worker thread with the update JSON.
+    """
+
+    def __init__(self, process, secret_token=None, listen='0.0.0.0', port=8443,
+                 path='/telegram', workers=4, queue_size=1000, dedup_size=10_000,
+                 max_body=1 << 20):
+        self.process = process
+        self.secret_token = secret_token
+        self.path = path
+        self.workers = workers
+        self.max_body = max_body
+        self.dedup_size = dedup_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.httpd = ThreadingHTTPServer((listen, port), WebhookRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.receiver = self
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stopped = threading.Event()
+        self._queue_wait = REGISTRY.histogram('webhook', 'queue_wait')
+        self.counts = dict.fromkeys(
+            ('accepted', 'duplicates', 'rejected', 'overloaded', 'processed', 'errors'), 0
+        )
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def authorized(self, token):
+        if not self.secret_token:
+            return True
+        return token is not None and hmac.compare_digest(token, self.secret_token)
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def submit(self, update_id, data):
+        """Queue an update; returns the HTTP status for Telegram"""
+        with self._lock:
+            if update_id in self._seen:
+                self.counts['duplicates'] += 1
+                return 200
+            try:
+                self.queue.put_nowait((time.perf_counter(), data))
+            except queue.Full:
+                # Not marked as seen: Telegram's retry must get through
+                self.counts['overloaded'] += 1
+                return 503
+            self._seen[update_id] = None
+            if len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+            self.counts['accepted'] += 1
+        return 200
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            queued_at, data = item
+            self._queue_wait.observe(time.perf_counter() - queued_at)
+            try:
+                self.process(data)
+                self.count('processed')
+            except Exception as e:
+                self.count('errors')
+                logger.error("Webhook update %s failed: %s", data.get('update_id'), e)
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'webhook-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        threading.Thread(target=self.httpd.serve_forever, name='webhook-http', daemon=True).start()
+        logger.info("Webhook receiver listening on %s:%s%s", *self.address, self.path)
+        return self
+
+    def stop(self):
+        """Stop accepting updates, then finish the queued ones"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=30)
+        self._threads = []
+        self._stopped.set()
+
+    def idle(self):
+        """Block until SIGINT/SIGTERM (like Updater.idle), then stop"""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: self._stopped.set())
+        self._stopped.wait()
+        self.stop()
+
+    def metrics(self):
+        with self._lock:
+            return dict(self.counts, queued=self.queue.qsize())
+
+def start_webhook(updater, url, secret_token, listen='0.0.0.0', port=8443, **kwargs):
+    """Serve a python-telegram-bot Updater's dispatcher from a webhook
+
+    Registers ``url`` with Telegram and returns the started receiver,
+    which also carries the updater's ``bot`` and ``dispatcher``.
+    """
+    from telegram import Update
+
+    bot = updater.bot
+    dispatcher = updater.dispatcher
+
+    def process(data):
+        dispatcher.process_update(Update.de_json(data, bot))
+
+    receiver = WebhookReceiver(
+        process, secret_token, listen, port, path=urlparse(url).path or '/', **kwargs
+    ).start()
+    receiver.bot = bot
+    receiver.dispatcher = dispatcher
+    # PTB 13.7 predates the secret_token parameter; pass it through
+    bot.set_webhook(url=url, max_connections=receiver.workers * 10,
+                    api_kwargs={'secret_token': secret_token} if secret_token else None)
+    return receiver
+
+def post_updates(url, updates, secret_token=None):
+    """POST update dicts to a webhook URL; returns [(status, seconds)]"""
+    import http.client
+
+    target = urlparse(url)
+    conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=10)
+    headers = {'Content-Type': 'application/json'}
+    if secret_token:
+        headers[SECRET_HEADER] = secret_token
+    results = []
+    for update in updates:
+        started = time.perf_counter()
+        conn.request('POST', target.path or '/', body=json.dumps(update), headers=headers)
+        response = conn.getresponse()
+        response.read()
+        results.append((response.status, time.perf_counter() - started))
+    conn.close()
+    return results
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="POST recorded updates to a webhook")
+    parser.add_argument('--post', required=True, help="file with one update JSON per line")
+    parser.add_argument('--url', default='http://127.0.0.1:8443/telegram')
+    parser.add_argument('--secret')
+    args = parser.parse_args()
+
+    with open(args.post) as f:
+        updates = [json.loads(line) for line in f if line.strip()]
+    results = post_updates(args.url, updates, args.secret)
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    slowest = max((seconds for _, seconds in results), default=0.0)
+    print(f"Posted {len(results)} updates: {statuses}, slowest ack {slowest * 1000:.1f} ms")
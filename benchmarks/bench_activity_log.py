@@ -0,0 +1,108 @@
+# AdminPanel/benchmarks/bench_activity_log.py
+"""
+Seed a large activity_log/alerts history and time the /log and /alerts queries.
+
+Run from the repository root (10M rows needs ~1.5 GB of disk):
+    python -m benchmarks.bench_activity_log --rows 10000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.database import AdminDatabase, MIGRATIONS
+from app.retention import ActivityArchiver
+
+SEED_BATCH = 50_000
+ACTIVITY_TYPES = ('command', 'login', 'upload', 'query', 'config', 'security')
+
+def seed(db, rows, days=365):
+    """Insert rows spread evenly over the last ``days`` days"""
+    start = datetime.utcnow() - timedelta(days=days)
+    step = (days * 86400) / rows
+    alerts_every = 100
+    with db._get_connection() as conn:
+        for offset in range(0, rows, SEED_BATCH):
+            count = min(SEED_BATCH, rows - offset)
+            conn.executemany(
+                'INSERT INTO activity_log (user_id, activity_type, details, timestamp) '
+                'VALUES (?, ?, ?, ?)',
+                (
+                    (
+                        random.randrange(100_000),
+                        random.choice(ACTIVITY_TYPES),
+                        'Seeded event',
+                        (start + timedelta(seconds=(offset + i) * step)).strftime('%Y-%m-%d %H:%M:%S')
+                    )
+                    for i in range(count)
+                )
+            )
+            # 1 alert per 100 events, 1% of those still open
+            conn.executemany(
+                'INSERT INTO alerts (alert_type, severity, message, resolved, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (
+                    (
+                        'resource',
+                        'medium',
+                        'Seeded alert',
+                        0 if random.random() < 0.01 else 1,
+                        (start + timedelta(seconds=(offset + i) * step)).strftime('%Y-%m-%d %H:%M:%S')
+                    )
+                    for i in range(0, count, alerts_every)
+                )
+            )
+            conn.commit()
+
+def time_query(func, repeat=20):
+    """Median latency in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def report(db, label):
+    log_ms = time_query(lambda: db.get_recent_activities(5))
+    alerts_ms = time_query(lambda: db.get_unresolved_alerts())
+    print(f"{label:>16}: /log {log_ms:8.2f} ms   /alerts {alerts_ms:8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--retention-days', type=int, default=90)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AdminDatabase(os.path.join(tmp, 'bench.db'))
+
+        started = time.perf_counter()
+        seed(db, args.rows)
+        print(f"Seeded {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+        report(db, 'indexed')
+        with db._get_connection() as conn:
+            conn.execute('DROP INDEX idx_activity_log_timestamp')
+            conn.execute('DROP INDEX idx_alerts_unresolved')
+            conn.commit()
+        report(db, 'no indexes')
+        with db._get_connection() as conn:
+            for statement in MIGRATIONS[0]:
+                conn.execute(statement)
+            conn.commit()
+
+        archiver = ActivityArchiver(db, retention_days=args.retention_days)
+        started = time.perf_counter()
+        moved = archiver.run()
+        elapsed = time.perf_counter() - started
+        print(f"Archived {moved:,} rows in {elapsed:.1f}s ({moved / elapsed:,.0f} rows/sec)")
+        report(db, 'after archiving')
+        db.close()
+
+if __name__ == '__main__':
+    main()
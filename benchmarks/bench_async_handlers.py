@@ -0,0 +1,61 @@
+# AdminPanel/benchmarks/bench_async_handlers.py
+"""
+Updates/sec of the sync and asyncio handler modes against a fake Telegram API.
+
+Run from the repository root:
+    python -m benchmarks.bench_async_handlers --updates 1000 --latency 0.05
+"""
+
+import argparse
+import time
+
+from app import bot_handlers
+from app.async_handlers import AsyncCommandRunner, setup_async_handlers
+from benchmarks.fake_telegram import FakeBot, FakeDispatcher, FakeUser, command_update
+from config.telegram_config import TelegramConfig
+
+def run(mode, updates, latency, commands, workers):
+    bot = FakeBot(api_latency=latency)
+    dispatcher = FakeDispatcher(workers=workers)
+    runner = None
+    if mode == 'async':
+        runner = setup_async_handlers(dispatcher, AsyncCommandRunner())
+    else:
+        bot_handlers.setup_handlers(dispatcher)
+
+    admin = FakeUser(int(TelegramConfig.ADMIN_ID))
+    batch = [
+        command_update(bot, admin, f'/{commands[i % len(commands)]}')
+        for i in range(updates)
+    ]
+
+    started = time.perf_counter()
+    for update, context in batch:
+        dispatcher.submit(update, context)
+    completed = bot.counter.wait_for(updates)
+    elapsed = time.perf_counter() - started
+
+    dispatcher.shutdown()
+    if runner is not None:
+        runner.stop()
+    if not completed:
+        print(f"{mode:>6}: only {bot.counter.count}/{updates} replies before timeout")
+    return bot.counter.count / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--updates', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help="simulated Bot API round trip in seconds")
+    parser.add_argument('--commands', default='alerts,log,status')
+    parser.add_argument('--workers', type=int, default=4,
+                        help="dispatcher worker threads (PTB default is 4)")
+    args = parser.parse_args()
+    commands = args.commands.split(',')
+
+    for mode in ('sync', 'async'):
+        rate = run(mode, args.updates, args.latency, commands, args.workers)
+        print(f"{mode:>6}: {rate:,.0f} updates/sec")
+
+if __name__ == '__main__':
+    main()
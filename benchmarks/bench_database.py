@@ -0,0 +1,62 @@
+# AdminPanel/benchmarks/bench_database.py
+"""
+Compare AdminDatabase throughput with and without connection pooling.
+
+Run from the repository root:
+    python -m benchmarks.bench_database --ops 5000 --threads 4
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from app.database import AdminDatabase
+
+class UnpooledDatabase(AdminDatabase):
+    """Original behaviour: open and close a connection per call"""
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+def run_workload(db, ops, threads):
+    """Mixed /start-style workload; returns ops/sec"""
+    def one(i):
+        user_id = 1_000_000 + i
+        db.add_user({'id': user_id, 'username': f'user{i}', 'first_name': 'Bench'})
+        db.get_user(user_id)
+        db.log_activity(user_id, 'command', '/start')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(ops)))
+    elapsed = time.perf_counter() - started
+    return (ops * 3) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ops', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    results = {}
+    for name, cls in (('unpooled', UnpooledDatabase), ('pooled', AdminDatabase)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = cls(os.path.join(tmp, 'bench.db'))
+            results[name] = run_workload(db, args.ops, args.threads)
+            db.close()
+        print(f"{name:>10}: {results[name]:,.0f} ops/sec")
+
+    print(f"{'speedup':>10}: {results['pooled'] / results['unpooled']:.2f}x")
+
+if __name__ == '__main__':
+    main()
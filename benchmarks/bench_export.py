@@ -0,0 +1,93 @@
+# AdminPanel/benchmarks/bench_export.py
+"""
+Export throughput and memory for app/export.py.
+
+Seeds --rows activity_log rows in a temporary database, then exports them
+in each format and reports rows/sec, output size and the peak growth of
+anonymous RSS, which should stay flat however many rows are exported.
+File-backed pages are left out: SQLite memory-maps up to mmap_size of the
+database, and those pages count towards plain RSS while the table is read.
+
+Run from the repository root:
+    python -m benchmarks.bench_export --rows 50000000 --formats csv.gz,jsonl.gz
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import threading
+
+from app.database import AdminDatabase
+from app.export import export, export_summary, pyarrow
+
+def seed_activity(db, rows):
+    with db._get_connection() as conn:
+        conn.execute('''
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+            INSERT INTO activity_log (user_id, activity_type, details, timestamp)
+            SELECT i % 10000,
+                   CASE i % 3 WHEN 0 THEN 'command' WHEN 1 THEN 'login' ELSE 'error' END,
+                   '/seed ' || i,
+                   datetime('2024-01-01', '+' || (i % 525600) || ' minutes')
+            FROM n
+        ''', (rows,))
+        conn.commit()
+
+def anon_rss_mb():
+    """Anonymous (heap) resident memory from /proc; Linux only"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('RssAnon:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+class PeakSampler:
+    """Highest anon_rss_mb() seen while running"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = anon_rss_mb()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, anon_rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+        self.peak = max(self.peak, anon_rss_mb())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--formats', default='csv,csv.gz,jsonl.gz,parquet',
+                        help="comma-separated file extensions to export to")
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AdminDatabase(os.path.join(tmp, 'export.db'), buffered_activity=False)
+        seed_activity(db, args.rows)
+        rss_before = anon_rss_mb()
+        for extension in args.formats.split(','):
+            if extension.startswith('parquet') and pyarrow is None:
+                print(f"{extension:>10}: skipped (pyarrow not installed)")
+                continue
+            path = os.path.join(tmp, f'activity.{extension}')
+            with PeakSampler() as sampler:
+                stats = export(db, 'activity_log', path, chunk_size=args.chunk_size)
+            print(f"{extension:>10}: {export_summary(stats)}, "
+                  f"peak anon RSS +{sampler.peak - rss_before:.1f} MB")
+            os.remove(path)
+        db.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# AdminPanel/benchmarks/bench_logging.py
+"""
+Handler latency with logging off, with a synchronous FileHandler, and queued.
+
+"sync" is the old basicConfig setup: every record is formatted and written
+to the log file on the handler thread. "queued" is app/logging_setup.py:
+the handler thread only enqueues the record. Each mode drives the real
+/start and /log handlers with fake Telegram objects.
+
+Run from the repository root:
+    python -m benchmarks.bench_logging --calls 5000 --level DEBUG
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from app import bot_handlers
+import app.database
+from app.database import AdminDatabase
+from app.logging_setup import configure_logging, logging_metrics, shutdown_logging
+from benchmarks.fake_telegram import FakeBot, FakeDispatcher, FakeUser, command_update
+from config.telegram_config import TelegramConfig
+
+MODES = ('off', 'sync', 'queued')
+
+def set_mode(mode, level, log_path):
+    root = logging.getLogger()
+    logging.disable(logging.NOTSET)
+    if mode == 'off':
+        logging.disable(logging.CRITICAL)
+    elif mode == 'sync':
+        handler = logging.FileHandler(log_path)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        root.addHandler(handler)
+        root.setLevel(level)
+    else:
+        configure_logging(log_path, level=level, console=False)
+
+def reset_logging():
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    logging.disable(logging.NOTSET)
+
+def run(mode, calls, level, workdir):
+    db = AdminDatabase(os.path.join(workdir, f'{mode}.db'))
+    app.database._db = db
+    bot = FakeBot()
+    dispatcher = FakeDispatcher(workers=1)
+    bot_handlers.setup_handlers(dispatcher)
+    admin = FakeUser(int(TelegramConfig.ADMIN_ID))
+
+    # Fresh users so /start never hits its rate limit
+    batch = [
+        command_update(bot, FakeUser(2_000_000 + i), '/start') if i % 2 else
+        command_update(bot, admin, '/log')
+        for i in range(calls)
+    ]
+
+    set_mode(mode, level, os.path.join(workdir, f'{mode}.log'))
+    latencies = []
+    try:
+        for update, context in batch:
+            started = time.perf_counter()
+            dispatcher.process_update(update, context)
+            latencies.append(time.perf_counter() - started)
+        metrics = logging_metrics()
+    finally:
+        reset_logging()
+        dispatcher.shutdown()
+        db.close()
+        app.database._db = None
+
+    latencies.sort()
+    return {
+        'mean': statistics.fmean(latencies),
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[int(len(latencies) * 0.99)],
+        'metrics': metrics,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--level', default='INFO', help="root log level, e.g. DEBUG")
+    parser.add_argument('--modes', default=','.join(MODES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in args.modes.split(','):
+            result = run(mode, args.calls, args.level.upper(), workdir)
+            line = (
+                f"{mode:>7}: mean {result['mean'] * 1e6:7.1f} µs"
+                f"  p50 {result['p50'] * 1e6:7.1f} µs"
+                f"  p99 {result['p99'] * 1e6:7.1f} µs"
+            )
+            if result['metrics']:
+                line += f"  (sampled out {result['metrics']['dropped_sampled']}, dropped {result['metrics']['dropped_full']})"
+            print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# AdminPanel/benchmarks/bench_search.py
+"""
+/find query latency over the activity_log FTS5 index.
+
+Seeds --rows activity_log rows spread over a year: one in ten is one of
+the app/main.py monitor events ("Security alert triggered", ...), the
+rest are commands with a random request token. The FTS index is filled
+by the migration 7 triggers while seeding. Then each query runs
+--repeat times through AdminDatabase.search_activities (one page of 10)
+and p50/p95 latency is reported. A single LIKE '%...%' scan is timed
+for comparison.
+
+Run from the repository root:
+    python -m benchmarks.bench_search --rows 10000000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.database import AdminDatabase
+from benchmarks.load_server import percentile
+
+MONITOR_EVENTS = (
+    "User login attempt",
+    "File upload detected",
+    "Database query executed",
+    "Configuration change",
+    "Security alert triggered",
+)
+COMMANDS = ('/start', '/status', '/alerts', '/log', '/stats', '/export')
+
+def choose(expression, values):
+    """SQL CASE picking values[expression % len(values)]"""
+    whens = ' '.join(f"WHEN {i} THEN '{value}'" for i, value in enumerate(values))
+    return f"CASE ({expression}) % {len(values)} {whens} END"
+
+def seed_activity(db, rows, days=365, batch=1_000_000):
+    seconds = days * 86400
+    with db._get_connection() as conn:
+        for start in range(0, rows, batch):
+            conn.execute(f'''
+                WITH RECURSIVE n(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+                INSERT INTO activity_log (user_id, activity_type, details, timestamp)
+                SELECT i % 50000,
+                       CASE WHEN i % 10 = 0 THEN 'monitor' ELSE 'command' END,
+                       CASE WHEN i % 10 = 0 THEN {choose('i / 10', MONITOR_EVENTS)}
+                            ELSE {choose('i', COMMANDS)} || ' req ' || lower(hex(randomblob(3)))
+                       END,
+                       datetime('now', '-{days} days', '+' || (i * {seconds} / ?) || ' seconds')
+                FROM n
+            ''', (start + 1, min(start + batch, rows), rows))
+            conn.commit()
+            print(f"seeded {min(start + batch, rows):,} rows", flush=True)
+
+def time_query(db, repeat, **kwargs):
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = db.search_activities(limit=10, **kwargs)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return len(rows), latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AdminDatabase(os.path.join(tmp, 'search.db'), buffered_activity=False)
+        started = time.perf_counter()
+        seed_activity(db, args.rows)
+        print(f"seeded and indexed {args.rows:,} rows in {time.perf_counter() - started:.0f}s")
+
+        with db._get_connection() as conn:
+            token = conn.execute(
+                "SELECT substr(details, -6) FROM activity_log WHERE activity_type = 'command' LIMIT 1"
+            ).fetchone()[0]
+        last_week = (datetime.now(timezone.utc) - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+        queries = (
+            ('rare token', {'query': f'"{token}"'}),
+            ('phrase, ranked', {'query': '"Security alert triggered"'}),
+            ('phrase, newest', {'query': '"Security alert triggered"', 'newest': True}),
+            ('phrase, last 7d', {'query': '"Security alert triggered"', 'since': last_week}),
+            ('term + type', {'query': 'start', 'activity_type': 'command', 'newest': True}),
+            ('prefix, ranked', {'query': 'config*'}),
+        )
+        for name, kwargs in queries:
+            count, latencies = time_query(db, args.repeat, **kwargs)
+            print(f"{name:>16}: {count:2d} rows  p50 {percentile(latencies, 0.50) * 1000:8.2f} ms"
+                  f"  p95 {percentile(latencies, 0.95) * 1000:8.2f} ms")
+
+        with db._get_connection() as conn:
+            started = time.perf_counter()
+            conn.execute(
+                "SELECT * FROM activity_log WHERE details LIKE '%Security alert triggered%'"
+                " ORDER BY log_id DESC LIMIT 10 OFFSET 100000"
+            ).fetchall()
+            print(f"{'LIKE scan':>16}: one full scan {(time.perf_counter() - started) * 1000:8.2f} ms")
+        db.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# AdminPanel/benchmarks/bench_telegram_client.py
+"""
+Bot API sends per second through differently pooled clients.
+
+--threads threads each call send_message against a local fake Bot API
+(benchmarks.fake_telegram.FakeBotApi), pausing up to 2 x --pause between
+sends the way handlers and the outbox send in bursts rather than back to
+back. Every new connection costs --handshake seconds before it is served,
+standing in for TCP plus TLS setup to api.telegram.org; every request
+costs --latency. Clients:
+
+- client per send: a fresh Bot for each message, i.e. a connection and
+  handshake every time
+- default pool: one Bot with PTB's default Request (con_pool_size=1), as
+  app/notifications.py used to build; concurrent sends beyond the first
+  open connections that are thrown away afterwards
+- shared pool: app.telegram_client.build_bot sized to the thread count,
+  the client get_bot() hands out
+
+Run from the repository root:
+    python -m benchmarks.bench_telegram_client --messages 2000 --threads 8 --handshake 0.03
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.telegram_client import build_bot
+from benchmarks.fake_telegram import FakeBotApi
+from benchmarks.load_server import percentile
+
+TOKEN = '123456:bench-token'
+
+def run(api, make_bot, messages, threads, pause):
+    """Returns (sends/sec, sorted latencies, connections opened)"""
+    api.reset()
+    shared = make_bot()
+    latencies = []
+    lock = threading.Lock()
+
+    def send(i):
+        bot = shared or make_bot(fresh=True)
+        started = time.perf_counter()
+        bot.send_message(chat_id=1000 + i, text=f"bench message {i}")
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+        if pause:
+            time.sleep(random.uniform(0, 2 * pause))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(send, range(messages)))
+    elapsed = time.perf_counter() - started
+    return messages / elapsed, sorted(latencies), api.counts['connections']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.002, help="seconds per request")
+    parser.add_argument('--handshake', type=float, default=0.03, help="seconds per new connection")
+    parser.add_argument('--pause', type=float, default=0.005, help="mean seconds between a thread's sends")
+    args = parser.parse_args()
+    # urllib3 warns each time the default pool discards a connection
+    logging.getLogger('telegram.vendor.ptb_urllib3.urllib3').setLevel(logging.ERROR)
+
+    api = FakeBotApi(args.latency, args.handshake).start()
+    url = api.base_url
+
+    def per_send(fresh=False):
+        return build_bot(TOKEN, 1, url) if fresh else None
+
+    def default_pool(fresh=False):
+        from telegram import Bot
+        return Bot(token=TOKEN, base_url=url)
+
+    def shared_pool(fresh=False):
+        return build_bot(TOKEN, args.threads, url)
+
+    clients = (
+        ('client per send', per_send, min(args.messages, 200)),
+        ('default pool', default_pool, args.messages),
+        (f'shared pool ({args.threads})', shared_pool, args.messages),
+    )
+    print(f"{args.threads} threads, {args.latency * 1000:.0f} ms per request, "
+          f"{args.handshake * 1000:.0f} ms per new connection, "
+          f"{args.pause * 1000:.0f} ms mean pause")
+    try:
+        for name, make_bot, messages in clients:
+            rate, latencies, connections = run(api, make_bot, messages, args.threads, args.pause)
+            print(f"{name:>18}: {messages:>5} sends {rate:>8.0f}/s  "
+                  f"p50 {percentile(latencies, 0.50) * 1000:6.1f} ms  "
+                  f"p95 {percentile(latencies, 0.95) * 1000:6.1f} ms  "
+                  f"{connections} connections")
+    finally:
+        api.stop()
+
+if __name__ == '__main__':
+    main()
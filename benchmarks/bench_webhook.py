@@ -0,0 +1,173 @@
+# AdminPanel/benchmarks/bench_webhook.py
+"""
+End-to-end command latency: webhook delivery vs long polling.
+
+Updates arrive at a fake Telegram at --rate per second, each a /start from
+a new user. The time from arrival to the bot's reply is measured for two
+ways of getting updates:
+
+- polling: a loop like Updater.start_polling. Each getUpdates takes a
+  network round trip (--rtt), and the loop sleeps --poll-interval between
+  calls, so updates that arrive in between wait for the next call.
+- webhook: Telegram POSTs each update, after half a round trip, to a
+  WebhookReceiver on localhost.
+
+Both modes run the real bot_handlers through the fake dispatcher against a
+temporary database.
+
+Run from the repository root:
+    python -m benchmarks.bench_webhook --updates 500 --rate 50 --poll-interval 0.5 --rtt 0.05
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import app.database
+from app import bot_handlers
+from app.database import AdminDatabase
+from app.webhook import SECRET_HEADER, WebhookReceiver
+from benchmarks.fake_telegram import (
+    FakeBot, FakeDispatcher, FakeUser, update_from_json, update_json
+)
+from benchmarks.load_server import percentile
+
+SECRET = 'bench-secret'
+
+class ReplyClock(FakeBot):
+    """Records when each chat got its first reply"""
+
+    def __init__(self):
+        super().__init__()
+        self.replied = {}
+
+    def send_message(self, chat_id, text, **kwargs):
+        self.replied.setdefault(chat_id, time.perf_counter())
+        return super().send_message(chat_id, text, **kwargs)
+
+class FakeTelegram:
+    """Pending updates, handed out by get_updates like the Bot API"""
+
+    def __init__(self):
+        self.pending = []
+        self.arrived = {}
+        self._cond = threading.Condition()
+
+    def publish(self, data):
+        with self._cond:
+            self.arrived[data['message']['chat']['id']] = time.perf_counter()
+            self.pending.append(data)
+            self._cond.notify_all()
+
+    def get_updates(self, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self.pending, timeout)
+            batch, self.pending = self.pending, []
+        return batch
+
+def make_updates(count, first_user=1):
+    users = (FakeUser(user_id) for user_id in range(first_user, first_user + count))
+    return [update_json(i, user, '/start') for i, user in enumerate(users, 1)]
+
+def arrive_at_rate(updates, rate, deliver):
+    """Call deliver(update) for each update on a fixed schedule"""
+    started = time.perf_counter()
+    for i, update in enumerate(updates):
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        deliver(update)
+
+def run_polling(updates, args):
+    bot = ReplyClock()
+    dispatcher = FakeDispatcher(workers=4)
+    bot_handlers.setup_handlers(dispatcher)
+    telegram = FakeTelegram()
+    done = threading.Event()
+
+    def poll():
+        while not done.is_set():
+            time.sleep(args.rtt / 2)  # request reaches Telegram
+            batch = telegram.get_updates(timeout=1.0)
+            if batch:
+                time.sleep(args.rtt / 2)  # response comes back
+            for data in batch:
+                dispatcher.submit(*update_from_json(bot, data))
+            time.sleep(args.poll_interval)
+
+    poller = threading.Thread(target=poll, name='poller', daemon=True)
+    poller.start()
+    arrive_at_rate(updates, args.rate, telegram.publish)
+    bot.counter.wait_for(len(updates))
+    done.set()
+    poller.join()
+    dispatcher.shutdown()
+    return latencies(telegram.arrived, bot.replied)
+
+def run_webhook(updates, args):
+    bot = ReplyClock()
+    dispatcher = FakeDispatcher(workers=4)
+    bot_handlers.setup_handlers(dispatcher)
+    receiver = WebhookReceiver(
+        lambda data: dispatcher.process_update(*update_from_json(bot, data)),
+        SECRET, listen='127.0.0.1', port=0, workers=4
+    ).start()
+    host, port = receiver.address
+    arrived = {}
+    local = threading.local()
+
+    def post(data):
+        time.sleep(args.rtt / 2)  # Telegram's POST reaches us
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(host, port, timeout=10)
+        conn.request('POST', receiver.path, body=json.dumps(data),
+                     headers={'Content-Type': 'application/json', SECRET_HEADER: SECRET})
+        conn.getresponse().read()
+
+    # Telegram keeps several connections open to a webhook (max_connections)
+    with ThreadPoolExecutor(max_workers=8, thread_name_prefix='telegram') as telegram:
+        def deliver(data):
+            arrived[data['message']['chat']['id']] = time.perf_counter()
+            telegram.submit(post, data)
+        arrive_at_rate(updates, args.rate, deliver)
+        bot.counter.wait_for(len(updates))
+    receiver.stop()
+    dispatcher.shutdown()
+    return latencies(arrived, bot.replied), receiver.metrics()
+
+def latencies(arrived, replied):
+    return sorted((replied[chat_id] - at) * 1000 for chat_id, at in arrived.items())
+
+def report(mode, values):
+    print(f"{mode:>8}: {len(values)} replies, mean {sum(values) / len(values):7.1f} ms, "
+          f"p50 {percentile(values, 0.50):7.1f} ms, p95 {percentile(values, 0.95):7.1f} ms, "
+          f"p99 {percentile(values, 0.99):7.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--updates', type=int, default=500)
+    parser.add_argument('--rate', type=float, default=50, help="arriving updates per second")
+    parser.add_argument('--poll-interval', type=float, default=0.5,
+                        help="sleep between getUpdates calls in seconds")
+    parser.add_argument('--rtt', type=float, default=0.05,
+                        help="network round trip to Telegram in seconds")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        app.database._db = AdminDatabase(os.path.join(tmp, 'webhook.db'))
+        report('polling', run_polling(make_updates(args.updates), args))
+        webhook, counts = run_webhook(make_updates(args.updates, args.updates + 1), args)
+        report('webhook', webhook)
+        print(f"receiver: {counts}")
+        app.database._db.close()
+
+if __name__ == '__main__':
+    main()
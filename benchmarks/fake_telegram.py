@@ -0,0 +1,268 @@
+# AdminPanel/benchmarks/fake_telegram.py
+"""
+Offline stand-ins for the Telegram objects the handlers touch.
+
+Only the attributes the handlers in app/ actually use are provided. The
+fake bot and message sleep for ``api_latency`` seconds per call to model
+the round trip to the Bot API. FakeBotApi is a local HTTP server for the
+real client instead: point a Bot's base_url at it.
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeUser:
+    def __init__(self, user_id, username=None, first_name='Bench', last_name=None):
+        self.id = user_id
+        self.username = username or f'user{user_id}'
+        self.first_name = first_name
+        self.last_name = last_name
+        self.name = f'@{self.username}'
+        self.full_name = first_name
+
+class ReplyCounter:
+    """Counts outbound messages so a benchmark can wait for completion"""
+
+    def __init__(self):
+        self.count = 0
+        self._cond = threading.Condition()
+
+    def increment(self):
+        with self._cond:
+            self.count += 1
+            self._cond.notify_all()
+
+    def wait_for(self, total, timeout=60):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.count < total:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+class FakeBot:
+    def __init__(self, api_latency=0.0, counter=None):
+        self.api_latency = api_latency
+        self.counter = counter or ReplyCounter()
+        self.sent = []
+        self._message_ids = itertools.count(1)
+
+    def send_message(self, chat_id, text, **kwargs):
+        if self.api_latency:
+            time.sleep(self.api_latency)
+        self.sent.append((chat_id, text))
+        self.counter.increment()
+        return FakeMessage(self, chat_id, text, message_id=next(self._message_ids))
+
+    def send_document(self, chat_id, document, **kwargs):
+        return self.send_message(chat_id, getattr(document, 'name', 'document'), **kwargs)
+
+class FakeMessage:
+    def __init__(self, bot, chat_id, text='', message_id=0):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.text = text
+        self.message_id = message_id
+
+    def reply_text(self, text, **kwargs):
+        return self.bot.send_message(self.chat_id, text, **kwargs)
+
+    def edit_text(self, text, **kwargs):
+        return self.bot.send_message(self.chat_id, text, **kwargs)
+
+class FakeUpdate:
+    _update_ids = itertools.count(1)
+
+    def __init__(self, bot, user, text):
+        self.update_id = next(self._update_ids)
+        self.effective_user = user
+        self.message = FakeMessage(bot, user.id, text)
+        self.effective_message = self.message
+        self.callback_query = None
+
+class FakeContext:
+    def __init__(self, bot, args=()):
+        self.bot = bot
+        self.args = list(args)
+        self.error = None
+
+class FakeCallbackQuery:
+    def __init__(self, bot, user, data, message):
+        self.bot = bot
+        self.from_user = user
+        self.data = data
+        self.message = message
+
+    def answer(self, text=None, **kwargs):
+        return True
+
+    def edit_message_text(self, text, **kwargs):
+        return self.message.edit_text(text, **kwargs)
+
+def command_update(bot, user, text):
+    """Build an update and context for a command like '/log 10'"""
+    parts = text.split()
+    return FakeUpdate(bot, user, text), FakeContext(bot, parts[1:])
+
+def update_json(update_id, user, text):
+    """A Bot API update dict for a text message, as Telegram would POST it"""
+    command = text.split()[0] if text.startswith('/') else None
+    message = {
+        'message_id': update_id,
+        'from': {'id': user.id, 'is_bot': False, 'first_name': user.first_name,
+                 'username': user.username},
+        'chat': {'id': user.id, 'type': 'private', 'first_name': user.first_name},
+        'date': int(time.time()),
+        'text': text,
+    }
+    if command:
+        message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(command)}]
+    return {'update_id': update_id, 'message': message}
+
+def update_from_json(bot, data):
+    """Update and context for an update dict from update_json()"""
+    sender = data['message']['from']
+    user = FakeUser(sender['id'], sender.get('username'), sender.get('first_name', 'Bench'))
+    update, context = command_update(bot, user, data['message']['text'])
+    update.update_id = data['update_id']
+    return update, context
+
+def callback_update(bot, user, data):
+    """Build an update and context for an inline button press"""
+    update = FakeUpdate(bot, user, '')
+    update.callback_query = FakeCallbackQuery(bot, user, data, update.message)
+    update.message = None
+    return update, FakeContext(bot)
+
+class FakeDispatcher:
+    """Routes command updates and button presses to registered callbacks
+
+    Mirrors python-telegram-bot 13, which runs callbacks on ``workers``
+    threads (4 by default).
+    """
+
+    def __init__(self, workers=4):
+        self.callbacks = {}
+        self.query_handlers = []
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dispatcher')
+
+    def add_handler(self, handler, group=0):
+        if hasattr(handler, 'command'):
+            for command in handler.command:
+                self.callbacks[command] = handler.callback
+        else:
+            # CallbackQueryHandler; pattern may be a string or compiled regex
+            self.query_handlers.append((re.compile(handler.pattern or ''), handler.callback))
+
+    def add_error_handler(self, callback):
+        pass
+
+    def process_update(self, update, context):
+        if update.callback_query is not None:
+            for pattern, callback in self.query_handlers:
+                if pattern.match(update.callback_query.data):
+                    return callback(update, context)
+            return None
+        command = update.message.text.split()[0].lstrip('/').lower()
+        return self.callbacks[command](update, context)
+
+    def submit(self, update, context):
+        return self.pool.submit(self.process_update, update, context)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+class FakeBotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def setup(self):
+        super().setup()
+        api = self.server.api
+        api.count('connections')
+        if api.handshake:
+            time.sleep(api.handshake)
+
+    def do_POST(self):
+        api = self.server.api
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        try:
+            params = json.loads(body) if body else {}
+        except ValueError:
+            params = {}  # multipart uploads; their fields are not needed
+        if api.latency:
+            time.sleep(api.latency)
+        payload = json.dumps({
+            'ok': True, 'result': api.result(self.path.rsplit('/', 1)[-1], params)
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeBotApi:
+    """Local Bot API answering every method with a plausible result
+
+    Each request sleeps ``latency`` seconds; each new connection sleeps
+    ``handshake`` seconds first, standing in for TCP and TLS setup.
+    """
+
+    def __init__(self, latency=0.0, handshake=0.0, host='127.0.0.1', port=0):
+        self.latency = latency
+        self.handshake = handshake
+        self.httpd = ThreadingHTTPServer((host, port), FakeBotApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.api = self
+        self.counts = {'connections': 0, 'requests': 0}
+        self._message_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/bot'
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def result(self, method, params):
+        self.count('requests')
+        if method == 'getMe':
+            return {'id': 1, 'is_bot': True, 'first_name': 'Bench', 'username': 'bench_bot'}
+        if method == 'getUpdates':
+            return []
+        if method.startswith('send') or method.startswith('edit'):
+            return {
+                'message_id': next(self._message_ids),
+                'date': int(time.time()),
+                'chat': {'id': params.get('chat_id', 0), 'type': 'private'},
+                'text': params.get('text', ''),
+            }
+        return True
+
+    def reset(self):
+        with self._lock:
+            self.counts = dict.fromkeys(self.counts, 0)
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name='fake-bot-api', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,98 @@
+# AdminPanel/benchmarks/load_server.py
+"""
+Closed-loop load test for app/server.py over keep-alive connections.
+
+Starts a local server on a free port (or targets --host/--port) and reports
+requests/sec plus p50/p99 latency for /, /dashboard and /search.
+
+Run from the repository root:
+    python -m benchmarks.load_server --clients 32 --requests 200 --workers 16
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from collections import defaultdict
+
+ROUTES = (
+    '/',
+    '/dashboard?username=admin&password=password123',
+    '/search?q=benchmark',
+)
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def client(host, port, requests, latencies, errors, lock):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    local = defaultdict(list)
+    failures = 0
+    for i in range(requests):
+        route = ROUTES[i % len(ROUTES)]
+        started = time.perf_counter()
+        try:
+            conn.request('GET', route)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            failures += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        local[route.split('?')[0]].append(time.perf_counter() - started)
+    conn.close()
+    with lock:
+        for route, samples in local.items():
+            latencies[route].extend(samples)
+        errors[0] += failures
+
+def start_local_server(workers):
+    from app.server import PooledHTTPServer, VulnerableRequestHandler
+    httpd = PooledHTTPServer(('127.0.0.1', 0), VulnerableRequestHandler, workers=workers)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200, help="per client")
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    httpd = None
+    if args.host is None:
+        httpd = start_local_server(args.workers)
+        host, port = httpd.server_address
+    else:
+        host, port = args.host, args.port or 80
+
+    latencies = defaultdict(list)
+    errors = [0]
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=client, args=(host, port, args.requests, latencies, errors, lock))
+        for _ in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"{total:,} requests in {elapsed:.2f}s: {total / elapsed:,.0f} req/sec, {errors[0]} errors")
+    for route, samples in sorted(latencies.items()):
+        samples.sort()
+        print(f"{route:>12}: p50 {percentile(samples, 0.50) * 1000:6.2f} ms   "
+              f"p99 {percentile(samples, 0.99) * 1000:6.2f} ms")
+
+    if httpd is not None:
+        httpd.shutdown()
+        httpd.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+# AdminPanel/benchmarks/loadgen.py
+"""
+Open-loop load generator for the admin panel, built on app/main.py's
+simulated activity.
+
+Events arrive on a schedule that does not wait for the system under test:
+- constant: evenly spaced, --rate per second
+- poisson: exponential gaps averaging --rate per second
+- burst: --burst events at once, every --burst / --rate seconds
+- replay: the timestamps of a recorded activity_log stream, --speed times
+  faster
+
+Each event goes to one of three targets (--mix sets their shares):
+- monitor: AdminPanel.monitor_activity with one of main.ACTIVITIES
+- db: AdminDatabase.log_activity
+- handler: a bot command run through the handlers by a fake dispatcher
+
+A scheduler thread queues every event at its due time and --threads workers
+run them. Queueing delay is start minus due time, so a system that falls
+behind shows up there; latency is the call itself. --processes splits the
+stream across processes sharing one database file.
+
+Telegram is stubbed locally: an in-process FakeBot, or with --http the
+real client from app.telegram_client against benchmarks.fake_telegram's
+FakeBotApi (needs python-telegram-bot).
+
+Run from the repository root:
+    python -m benchmarks.loadgen --rate 2000 --duration 10 --schedule poisson --threads 8
+    python -m benchmarks.loadgen --record stream.jsonl.gz --db admin_panel.db --since 2024-06-01
+    python -m benchmarks.loadgen --replay stream.jsonl.gz --speed 60 --threads 8
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import logging
+import lzma
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import app.auth
+import app.database
+import app.live_stats
+import app.rollups
+import app.telegram_client
+from app import bot_handlers
+from app.database import AdminDatabase
+from app.export import export, export_summary, guess_format
+from app.main import ACTIVITIES
+from benchmarks.fake_telegram import FakeBot, FakeBotApi, FakeDispatcher, FakeUser, command_update
+from benchmarks.load_server import percentile
+from config.telegram_config import TelegramConfig
+
+TARGETS = ('monitor', 'db', 'handler')
+SCHEDULES = ('constant', 'poisson', 'burst')
+# Replayed as plain activity rows: re-running them would change admins,
+# message users or write files
+STATE_CHANGING = frozenset(('grant', 'revoke', 'broadcast', 'export'))
+ACTIVITY_TYPES = ('command', 'login', 'upload', 'query', 'config', 'security')
+# (command, sent by the admin) for the synthetic handler events
+COMMANDS = (
+    ('/start', False),
+    ('/log', True),
+    ('/alerts', True),
+    ('/stats 1d', True),
+    ('/find login', True),
+)
+READERS = {None: open, 'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+# Arrival schedules: offsets in seconds from the start, one per event
+def constant(rate, count, rng=None):
+    return [i / rate for i in range(count)]
+
+def poisson(rate, count, rng):
+    offsets, t = [], 0.0
+    for _ in range(count):
+        t += rng.expovariate(rate)
+        offsets.append(t)
+    return offsets
+
+def burst(rate, count, rng=None, size=100):
+    period = size / rate
+    return [(i // size) * period for i in range(count)]
+
+# Events: (target, ...arguments)
+def parse_mix(text):
+    """'monitor=1,db=3' -> {'monitor': 1.0, 'db': 3.0}"""
+    mix = {}
+    for part in filter(None, text.split(',')):
+        name, _, weight = part.partition('=')
+        if name not in TARGETS:
+            raise ValueError(f"Unknown target: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def synthetic_events(count, mix, rng, users=10_000):
+    admin = int(TelegramConfig.ADMIN_ID)
+    targets = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    events = []
+    for i, target in enumerate(targets):
+        if target == 'monitor':
+            events.append(('monitor', rng.choice(ACTIVITIES)))
+        elif target == 'db':
+            events.append(('db', rng.randrange(1, users), rng.choice(ACTIVITY_TYPES), f"load event {i}"))
+        else:
+            command, as_admin = rng.choice(COMMANDS)
+            events.append(('handler', admin if as_admin else rng.randrange(1, users), command))
+    return events
+
+def replay_events(path, speed=1.0, limit=None):
+    """(offsets, events) from an activity_log JSONL recording
+
+    Timestamps have one-second resolution, so events within a second are
+    spread evenly across it.
+    """
+    _, compression = guess_format(path)
+    with READERS[compression](path, 'rt', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    rows = [row for row in rows if row.get('timestamp')]
+    rows.sort(key=lambda row: (row['timestamp'], row['log_id']))
+    rows = rows[:limit]
+    if not rows:
+        return [], []
+
+    start = datetime.fromisoformat(rows[0]['timestamp'])
+    offsets, events = [], []
+    i = 0
+    while i < len(rows):
+        j = i
+        while j < len(rows) and rows[j]['timestamp'] == rows[i]['timestamp']:
+            j += 1
+        second = (datetime.fromisoformat(rows[i]['timestamp']) - start).total_seconds()
+        for k in range(i, j):
+            offsets.append((second + (k - i) / (j - i)) / speed)
+            events.append(event_from_row(rows[k]))
+        i = j
+    return offsets, events
+
+def event_from_row(row):
+    details = row.get('details') or ''
+    if row['activity_type'] == 'monitor':
+        return ('monitor', details)
+    if row['activity_type'] == 'command' and details.startswith('/'):
+        command = (details[1:].split() or [''])[0].split('@')[0].lower()
+        if command not in STATE_CHANGING:
+            return ('handler', row['user_id'] or 0, details)
+    return ('db', row['user_id'], row['activity_type'], details)
+
+class LoadTarget:
+    """Database, AdminPanel and handlers wired to a stubbed Telegram"""
+
+    def __init__(self, db_path, http=False, api_latency=0.0, pool_size=16):
+        from app.admin_penel import AdminPanel
+
+        self.db = AdminDatabase(db_path)
+        app.database._db = self.db
+        self.api = None
+        if http:
+            self.api = FakeBotApi(api_latency).start()
+            self.bot = app.telegram_client.build_bot('123456:load-token', pool_size, self.api.base_url)
+        else:
+            self.bot = FakeBot(api_latency)
+        app.telegram_client._bot = self.bot
+        self.panel = AdminPanel()
+        self.dispatcher = FakeDispatcher(workers=1)
+        bot_handlers.setup_handlers(self.dispatcher)
+
+    def call(self, event):
+        target = event[0]
+        if target == 'monitor':
+            self.panel.monitor_activity(event[1])
+        elif target == 'db':
+            self.db.log_activity(*event[1:])
+        else:
+            self.dispatcher.process_update(*command_update(self.bot, FakeUser(event[1]), event[2]))
+
+    def close(self):
+        """Drain Telegram sends and flush the database; returns the outbox metrics"""
+        from app.outbox import outbox_for
+
+        outbox = outbox_for(self.bot)
+        outbox.close()
+        if app.live_stats._live_stats is not None:
+            app.live_stats._live_stats.stop()
+            app.live_stats._live_stats = None
+        if app.rollups._compactor is not None:
+            app.rollups._compactor.stop()
+            app.rollups._compactor = None
+        app.auth._auth = None
+        self.dispatcher.shutdown()
+        self.db.close()
+        app.database._db = None
+        app.telegram_client._bot = None
+        if self.api is not None:
+            self.api.stop()
+        return outbox.metrics()
+
+def drive(target, offsets, events, threads, start_at):
+    """Run events at their offsets from ``start_at`` (a time.time())
+
+    Returns ([(target, queue delay, latency, ok)], seconds until the last
+    event finished).
+    """
+    pending = queue.Queue()
+    results = []
+    lock = threading.Lock()
+
+    def work():
+        local = []
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            due, event = item
+            started = time.perf_counter()
+            try:
+                target.call(event)
+                ok = True
+            except Exception:
+                ok = False
+            local.append((event[0], started - due, time.perf_counter() - started, ok))
+        with lock:
+            results.extend(local)
+
+    workers = [threading.Thread(target=work, name=f'load-{i}', daemon=True) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    origin = time.perf_counter() + (start_at - time.time())
+    for offset, event in zip(offsets, events):
+        due = origin + offset
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        pending.put((due, event))
+    for _ in workers:
+        pending.put(None)
+    for worker in workers:
+        worker.join()
+    return results, time.perf_counter() - origin
+
+def run_process(db_path, offsets, events, threads, start_at, http, api_latency):
+    """One process's share of the stream; returns (results, elapsed, outbox metrics)"""
+    logging.disable(logging.CRITICAL)
+    target = LoadTarget(db_path, http, api_latency, pool_size=threads + 4)
+    try:
+        results, elapsed = drive(target, offsets, events, threads, start_at)
+    finally:
+        outbox = target.close()
+    return results, elapsed, outbox
+
+def report(results, elapsed, offered, outboxes):
+    lines = []
+    completed = len(results)
+    errors = sum(1 for *_, ok in results if not ok)
+    lines.append(f"achieved {completed / elapsed:,.0f}/s of {offered:,.0f}/s offered "
+                 f"({completed:,} events in {elapsed:.1f}s, {errors} errors)")
+    lines.append(f"{'ms':>8} {'events':>8}  {'queue p50':>9} {'p95':>7} {'p99':>7}"
+                 f"  {'latency p50':>11} {'p95':>7} {'p99':>7}")
+    groups = [(name, [r for r in results if r[0] == name]) for name in TARGETS] + [('all', results)]
+    for name, rows in groups:
+        if not rows:
+            continue
+        waits = [percentile(sorted(r[1] for r in rows), q) * 1000 for q in (0.50, 0.95, 0.99)]
+        latencies = [percentile(sorted(r[2] for r in rows), q) * 1000 for q in (0.50, 0.95, 0.99)]
+        lines.append(
+            f"{name:>8} {len(rows):>8,}  {waits[0]:>9.2f} {waits[1]:>7.2f} {waits[2]:>7.2f}"
+            f"  {latencies[0]:>11.2f} {latencies[1]:>7.2f} {latencies[2]:>7.2f}"
+        )
+    totals = {}
+    for outbox in outboxes:
+        for key in ('sent', 'coalesced', 'dropped', 'failed'):
+            totals[key] = totals.get(key, 0) + outbox[key]
+    lines.append("outbox: " + ', '.join(f"{key} {value:,}" for key, value in totals.items()))
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator and activity replay")
+    parser.add_argument('--rate', type=float, default=1000, help="events per second")
+    parser.add_argument('--duration', type=float, default=10, help="seconds")
+    parser.add_argument('--schedule', choices=SCHEDULES, default='poisson')
+    parser.add_argument('--burst', type=int, default=100, help="events per burst")
+    parser.add_argument('--mix', default='monitor=1,db=3,handler=1')
+    parser.add_argument('--threads', type=int, default=8, help="workers per process")
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--http', action='store_true',
+                        help="send through the real client to a local fake Bot API")
+    parser.add_argument('--api-latency', type=float, default=0.0, help="seconds per Telegram call")
+    parser.add_argument('--db', help="database file (default: a temporary one)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--record', metavar='PATH', help="write activity_log from --db as JSONL and exit")
+    parser.add_argument('--since', help="with --record: YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument('--until', help="with --record: YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument('--replay', metavar='PATH', help="replay a --record file instead of a schedule")
+    parser.add_argument('--speed', type=float, default=1.0, help="with --replay: time compression")
+    parser.add_argument('--limit', type=int, help="with --replay: first N events")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.db:
+            parser.error("--record needs --db")
+        db = AdminDatabase(args.db)
+        try:
+            print(export_summary(export(db, 'activity_log', args.record, 'jsonl',
+                                        args.since, args.until)))
+        finally:
+            db.close()
+        return
+
+    rng = random.Random(args.seed)
+    if args.replay:
+        offsets, events = replay_events(args.replay, args.speed, args.limit)
+        span = offsets[-1] if offsets else 0.0
+        offered = len(events) / span if span else float(len(events))
+        print(f"replaying {len(events):,} events over {span:.1f}s ({args.speed:g}x)")
+    else:
+        count = int(args.rate * args.duration)
+        if args.schedule == 'burst':
+            offsets = burst(args.rate, count, size=args.burst)
+        else:
+            offsets = (constant if args.schedule == 'constant' else poisson)(args.rate, count, rng)
+        events = synthetic_events(count, parse_mix(args.mix), rng)
+        offered = args.rate
+        print(f"{args.schedule} {args.rate:,.0f}/s for {args.duration:g}s, mix {args.mix}")
+    print(f"{args.threads} threads x {args.processes} processes, "
+          f"Telegram {'over HTTP' if args.http else 'in-process'}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = args.db or os.path.join(workdir, 'load.db')
+        # Migrate once here, not in every process at the same time
+        AdminDatabase(db_path).close()
+        # Lead time for the processes to set up, so the first events are not late
+        start_at = time.time() + (0.5 if args.processes == 1 else 2.0)
+        shards = [
+            (db_path, offsets[i::args.processes], events[i::args.processes], args.threads,
+             start_at, args.http, args.api_latency)
+            for i in range(args.processes)
+        ]
+        if args.processes == 1:
+            outcomes = [run_process(*shards[0])]
+        else:
+            with ProcessPoolExecutor(args.processes) as pool:
+                outcomes = list(pool.map(run_process, *zip(*shards)))
+
+    results = [row for outcome in outcomes for row in outcome[0]]
+    elapsed = max(outcome[1] for outcome in outcomes)
+    for line in report(results, elapsed, offered, [outcome[2] for outcome in outcomes]):
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# AdminPanel/benchmarks/startup_profile.py
+"""
+Import-time profile of the app entry points (python -X importtime breakdown).
+
+Each module is imported in a fresh interpreter inside an empty temporary
+directory. The report lists total import time, the slowest modules by
+cumulative time, and any files the import created (there should be none).
+
+Run from the repository root:
+    python -m benchmarks.startup_profile --top 15 --output startup_profile.txt
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ENTRY_MODULES = (
+    'app.init',
+    'app.database',
+    'app.notifications',
+    'app.telegram_client',
+    'app.bot_handlers',
+    'app.server',
+    'config.bot',
+)
+
+def profile(module, repo_root):
+    """Returns (rows, created_files, error); rows are (cumulative_us, self_us, name)"""
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, PYTHONPATH=repo_root)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=workdir, env=env, capture_output=True, text=True
+        )
+        created = sorted(os.listdir(workdir))
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    error = None
+    if result.returncode:
+        error = result.stderr.strip().splitlines()[-1]
+    return rows, created, error
+
+def report(modules, top, repo_root):
+    lines = []
+    for module in modules:
+        rows, created, error = profile(module, repo_root)
+        total = next((cumulative for cumulative, _, name in rows if name.strip() == module), None)
+        lines.append(f"== {module}")
+        if error:
+            lines.append(f"   import failed: {error}")
+        if total is not None:
+            lines.append(f"   total {total / 1000:.1f} ms")
+        lines.append(f"   files created: {', '.join(created) if created else 'none'}")
+        for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+            lines.append(f"   {cumulative / 1000:8.1f} ms cumulative {self_us / 1000:7.1f} ms self  {name.strip()}")
+        lines.append("")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=ENTRY_MODULES)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--output', help="also write the report to this file")
+    args = parser.parse_args()
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    text = report(args.modules, args.top, repo_root)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+
+if __name__ == '__main__':
+    main()
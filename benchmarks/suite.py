@@ -0,0 +1,289 @@
+# AdminPanel/benchmarks/suite.py
+"""
+Offline benchmark suite for the bot, database, rate limiter and web server.
+
+Drives the real bot_handlers commands (and the /log page buttons) with fake
+Telegram objects, AdminDatabase against a seeded temporary database,
+rate_limited, and the server routes over a keep-alive connection. Each case
+reports throughput and p50/p95/p99 latency. Logging is disabled while the
+cases run.
+
+Results can be saved as JSON and compared against a stored baseline; the
+run exits with status 1 when any case loses more than --tolerance of its
+throughput or p95 latency.
+
+Run from the repository root:
+    python -m benchmarks.suite --save-baseline
+    python -m benchmarks.suite --output results.json --compare
+    python -m benchmarks.suite --cases handler. --iterations 500
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import app.auth
+import app.database
+import app.live_stats
+import app.rollups
+from app import bot_handlers
+from app.database import AdminDatabase
+from app.utilities import rate_limited
+from benchmarks.fake_telegram import (
+    FakeBot, FakeDispatcher, FakeUser, callback_update, command_update
+)
+from benchmarks.load_server import percentile, start_local_server
+from config.telegram_config import TelegramConfig
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+CASES = {}
+
+def case(name):
+    """Register a case: setup(env) returns op(i), timed once per iteration"""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+class Environment:
+    """Seeded database, fake bot and (on demand) a local web server"""
+
+    def __init__(self, workdir, users=1000, activities=20_000, alerts=200):
+        logging.disable(logging.CRITICAL)
+        self.db = AdminDatabase(os.path.join(workdir, 'bench.db'))
+        app.database._db = self.db
+        self.bot = FakeBot()
+        self.dispatcher = FakeDispatcher(workers=1)
+        bot_handlers.setup_handlers(self.dispatcher)
+        self.admin = FakeUser(int(TelegramConfig.ADMIN_ID))
+        self.users = users
+        self._httpd = None
+        self._seed(users, activities, alerts)
+
+    def _seed(self, users, activities, alerts):
+        for user_id in range(1, users + 1):
+            self.db.add_user({'id': user_id, 'username': f'user{user_id}', 'first_name': 'Bench'})
+        for i in range(activities):
+            self.db.log_activity(1 + i % users, ('command', 'login', 'error')[i % 3], f'/seed {i}')
+        for i in range(alerts):
+            self.db.create_alert('cpu', f'Seeded alert {i}', ('low', 'medium', 'high')[i % 3])
+        self.db.flush_activity()
+
+    def run(self, update, context):
+        return self.dispatcher.process_update(update, context)
+
+    def server(self):
+        if self._httpd is None:
+            self._httpd = start_local_server(workers=4)
+        return self._httpd.server_address
+
+    def close(self):
+        # /status starts the live counters on this database
+        if app.live_stats._live_stats is not None:
+            app.live_stats._live_stats.stop()
+            app.live_stats._live_stats = None
+        app.auth._auth = None
+        if app.rollups._compactor is not None:
+            app.rollups._compactor.stop()
+            app.rollups._compactor = None
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        self.dispatcher.shutdown()
+        self.db.close()
+        app.database._db = None
+        logging.disable(logging.NOTSET)
+
+# Bot handlers
+@case('handler.start')
+def bench_start(env):
+    # A fresh user per call keeps /start under its per-user rate limit
+    return lambda i: env.run(*command_update(env.bot, FakeUser(5_000_000 + i), '/start'))
+
+@case('handler.status')
+def bench_status(env):
+    return lambda i: env.run(*command_update(env.bot, env.admin, '/status'))
+
+@case('handler.alerts')
+def bench_alerts(env):
+    return lambda i: env.run(*command_update(env.bot, env.admin, '/alerts'))
+
+@case('handler.log')
+def bench_log(env):
+    return lambda i: env.run(*command_update(env.bot, env.admin, '/log type=error'))
+
+@case('handler.log_older')
+def bench_log_older(env):
+    _, keyboard = bot_handlers.log_page()
+    data = keyboard.inline_keyboard[0][-1].callback_data
+    return lambda i: env.run(*callback_update(env.bot, env.admin, data))
+
+@case('handler.stats')
+def bench_stats(env):
+    return lambda i: env.run(*command_update(env.bot, env.admin, '/stats 7d'))
+
+# AdminDatabase
+@case('db.add_user')
+def bench_add_user(env):
+    # Repeat /start of known users: the cached no-change path
+    return lambda i: env.db.add_user({
+        'id': 1 + i % env.users, 'username': f'user{1 + i % env.users}', 'first_name': 'Bench'
+    })
+
+@case('db.get_user')
+def bench_get_user(env):
+    return lambda i: env.db.get_user(1 + (i * 7919) % (env.users * 2))
+
+@case('db.log_activity')
+def bench_log_activity(env):
+    return lambda i: env.db.log_activity(1 + i % env.users, 'command', '/bench')
+
+@case('db.activity_page')
+def bench_activity_page(env):
+    return lambda i: env.db.get_activity_page(limit=10, user_id=1 + i % env.users)
+
+@case('db.alert_page')
+def bench_alert_page(env):
+    return lambda i: env.db.get_alert_page(limit=10, severity='high')
+
+# Role checks
+@case('auth.allowed')
+def bench_auth_allowed(env):
+    auth = app.auth.get_auth()
+    for user_id in range(1, 51):
+        auth.grant(user_id)
+    commands = ('status', 'log', 'broadcast', 'grant')
+    return lambda i: auth.allowed(1 + (i * 7919) % (env.users * 2), commands[i % 4])
+
+# Rate limiter
+@case('rate_limited')
+def bench_rate_limited(env):
+    wrapped = rate_limited(1_000_000, 60, key=lambda i: i % 10_000)(lambda i: None)
+    return wrapped
+
+# Web server
+def server_case(path):
+    def setup(env):
+        host, port = env.server()
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+
+        def op(i):
+            conn.request('GET', path)
+            conn.getresponse().read()
+        return op
+    return setup
+
+case('server.index')(server_case('/'))
+case('server.dashboard')(server_case('/dashboard?username=admin&password=password123'))
+case('server.search')(server_case('/search?q=benchmark'))
+
+def measure(op, iterations, warmup):
+    for i in range(warmup):
+        op(i)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(warmup, warmup + iterations):
+        t0 = time.perf_counter()
+        op(i)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+def run_suite(names, iterations, warmup):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        env = Environment(workdir)
+        try:
+            for name in names:
+                results[name] = measure(CASES[name](env), iterations, warmup)
+                print(format_result(name, results[name]), flush=True)
+        finally:
+            env.close()
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'iterations': iterations,
+        },
+        'results': results,
+    }
+
+def format_result(name, result):
+    return (
+        f"{name:<20} {result['ops_per_sec']:>11,.0f} ops/s"
+        f"  p50 {result['p50_ms']:8.3f}  p95 {result['p95_ms']:8.3f}"
+        f"  p99 {result['p99_ms']:8.3f} ms"
+    )
+
+def compare(results, baseline, tolerance):
+    """Print changes against the baseline; returns the regressed case names"""
+    regressions = []
+    print(f"\nAgainst baseline from {baseline['meta']['created']} (tolerance {tolerance:.0%}):")
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            print(f"  {name:<20} new case")
+            continue
+        throughput = current['ops_per_sec'] / previous['ops_per_sec'] - 1
+        p95 = current['p95_ms'] / previous['p95_ms'] - 1 if previous['p95_ms'] else 0.0
+        regressed = throughput < -tolerance or p95 > tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<20} throughput {throughput:+7.1%}  p95 {p95:+7.1%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cases', default='',
+                        help="comma-separated name prefixes, e.g. handler.,db.")
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--compare', action='store_true',
+                        help="compare against --baseline; exit 1 on regression")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as the new --baseline")
+    parser.add_argument('--tolerance', type=float, default=0.20)
+    args = parser.parse_args()
+
+    prefixes = [p for p in args.cases.split(',') if p]
+    names = [name for name in CASES if not prefixes or name.startswith(tuple(prefixes))]
+    if not names:
+        parser.error(f"no cases match {args.cases!r}; available: {', '.join(CASES)}")
+
+    results = run_suite(names, args.iterations, args.warmup)
+    for path in filter(None, (args.output, args.baseline if args.save_baseline else None)):
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
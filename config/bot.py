@@ -1,24 +1,18 @@
 import logging
-from telegram import Update, Bot
-from telegram.ext import Updater, CommandHandler, CallbackContext
+import os
+import secrets
+from telegram import Update
+from telegram.ext import CommandHandler, CallbackContext
 from config.telegram_config import TelegramConfig  # Updated import
 
-# 1. Enhanced Logging Setup
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
+# 1. Enhanced Logging Setup (configured by setup_bot; see app/logging_setup.py)
 logger = logging.getLogger(__name__)
 
 # 2. New Command Handlers
 def start(update: Update, context: CallbackContext):
     """Enhanced start command with user tracking"""
     user = update.effective_user
-    logger.info(f"New user started bot: {user.id} - {user.name}")
+    logger.info("New user started bot: %s - %s", user.id, user.name)
     
     update.message.reply_text(
         f'✅ Admin Panel Bot Active\n'
@@ -36,25 +30,41 @@ def start(update: Update, context: CallbackContext):
 
 def error_handler(update: Update, context: CallbackContext):
     """Enhanced error handling"""
-    logger.error(f'Error: {context.error}', exc_info=True)
+    logger.error('Error: %s', context.error, exc_info=context.error)
+    try:
+        # Counted as an error by /status (see app/live_stats.py)
+        from app.database import get_db
+        user = getattr(update, 'effective_user', None)
+        get_db().log_activity(user.id if user else 0, 'error', str(context.error)[:500])
+    except Exception as e:
+        logger.error("Could not record bot error: %s", e)
     if update:
-        context.bot.send_message(
-            chat_id=TelegramConfig.ADMIN_ID,
-            text=f"❌ Bot Error:\n{context.error}"
+        from app.outbox import outbox_for
+        outbox_for(context.bot).send(
+            TelegramConfig.ADMIN_ID,
+            f"❌ Bot Error:\n{context.error}",
+            coalesce='error'
         )
 
 # 3. Improved Bot Setup
-def setup_bot():
-    """Enhanced bot initialization"""
+def setup_bot(mode=None):
+    """Enhanced bot initialization
+
+    mode is 'polling' or 'webhook' (default: BOT_UPDATE_MODE, else polling).
+    Webhook mode reads WEBHOOK_URL, WEBHOOK_SECRET, WEBHOOK_LISTEN and
+    WEBHOOK_PORT, and returns the receiver instead of the updater; both
+    have .bot and .idle().
+    """
+    mode = mode or os.environ.get('BOT_UPDATE_MODE', 'polling')
+    if mode not in ('polling', 'webhook'):
+        raise ValueError(f"Unknown update mode: {mode}")
+    from app.logging_setup import configure_logging
+    configure_logging('bot.log')
     try:
-        updater = Updater(
-            token=TelegramConfig.BOT_TOKEN,
-            use_context=True,
-            request_kwargs={
-                'read_timeout': TelegramConfig.REQUEST_TIMEOUT,
-                'connect_timeout': TelegramConfig.REQUEST_TIMEOUT
-            }
-        )
+        # Receives with the process-wide client (timeouts and pool size
+        # are set there)
+        from app.telegram_client import updater_for
+        updater = updater_for()
         
         dp = updater.dispatcher
         
@@ -67,10 +77,25 @@ def setup_bot():
         # Startup Notification
         updater.bot.send_message(
             chat_id=TelegramConfig.ADMIN_ID,
-            text="🤖 Bot started successfully!\n"
-                 f"Polling timeout: {TelegramConfig.POLLING_TIMEOUT}s"
+            text="🤖 Bot started successfully!\n" + (
+                f"Polling timeout: {TelegramConfig.POLLING_TIMEOUT}s"
+                if mode == 'polling' else "Receiving updates by webhook"
+            )
         )
         
+        if mode == 'webhook':
+            from app.webhook import start_webhook
+            receiver = start_webhook(
+                updater,
+                url=os.environ['WEBHOOK_URL'],
+                # Without a configured secret, register a random one
+                secret_token=os.environ.get('WEBHOOK_SECRET') or secrets.token_urlsafe(32),
+                listen=os.environ.get('WEBHOOK_LISTEN', '0.0.0.0'),
+                port=int(os.environ.get('WEBHOOK_PORT', 8443))
+            )
+            logger.info("Bot started in webhook mode")
+            return receiver
+        
         updater.start_polling(
             poll_interval=TelegramConfig.POLLING_INTERVAL,
             timeout=TelegramConfig.POLLING_TIMEOUT
@@ -79,7 +104,7 @@ def setup_bot():
         return updater
         
     except Exception as e:
-        logger.critical(f"Failed to start bot: {e}")
+        logger.critical("Failed to start bot: %s", e)
         raise
 
 if __name__ == '__main__':
@@ -0,0 +1,76 @@
+# AdminPanel/tests/test_auth.py
+"""
+Role checks in app/auth.py against a real, temporary AdminDatabase.
+
+Needs a filled-in config/telegram_config.py, like the app itself:
+    python -m pytest tests
+"""
+
+import pytest
+
+from app.auth import AuthService
+from app.database import AdminDatabase
+
+OWNER, ADMIN, USER = 1, 2, 3
+
+@pytest.fixture
+def db(tmp_path):
+    database = AdminDatabase(str(tmp_path / 'auth.db'))
+    database.set_admin(ADMIN, True)
+    yield database
+    database.close()
+
+@pytest.fixture
+def auth(db):
+    return AuthService(db, owners={OWNER})
+
+def test_roles(auth):
+    assert auth.role(OWNER) == 'owner'
+    assert auth.role(ADMIN) == 'admin'
+    assert auth.role(USER) == 'user'
+
+@pytest.mark.parametrize('user_id, command, allowed', [
+    (USER, 'start', True),
+    (USER, 'status', False),
+    (USER, 'grant', False),
+    (ADMIN, 'status', True),
+    (ADMIN, 'find', True),
+    (ADMIN, 'broadcast', False),
+    (ADMIN, 'grant', False),
+    (OWNER, 'status', True),
+    (OWNER, 'broadcast', True),
+    (OWNER, 'revoke', True),
+    (USER, 'unlisted', False),   # DEFAULT_ROLE is admin
+    (ADMIN, 'unlisted', True),
+])
+def test_allowed(auth, user_id, command, allowed):
+    assert auth.allowed(user_id, command) is allowed
+
+def test_grant_and_revoke(auth, db):
+    assert auth.grant(USER) is True
+    assert auth.allowed(USER, 'status')
+    assert USER in db.get_admin_ids()
+    assert auth.grant(USER) is False
+
+    assert auth.revoke(USER) is True
+    assert not auth.allowed(USER, 'status')
+    assert USER not in db.get_admin_ids()
+    assert auth.revoke(USER) is False
+
+def test_owner_cannot_be_revoked(auth):
+    with pytest.raises(ValueError):
+        auth.revoke(OWNER)
+    assert auth.role(OWNER) == 'owner'
+
+def test_sees_changes_from_another_process(db):
+    auth = AuthService(db, owners={OWNER}, refresh_interval=0)
+    other = AuthService(db, owners={OWNER}, refresh_interval=0)
+    version = auth.version
+
+    other.grant(USER)
+    assert auth.allowed(USER, 'status')
+    assert auth.version > version
+
+    # Direct writes to users.is_admin count too
+    db.set_admin(ADMIN, False)
+    assert not auth.allowed(ADMIN, 'status')
@@ -0,0 +1,38 @@
+# AdminPanel/tests/test_search.py
+"""
+Full-text search in app/database.py against a real, temporary AdminDatabase.
+
+Needs a filled-in config/telegram_config.py, like the app itself:
+    python -m pytest tests
+"""
+
+import pytest
+
+from app.database import AdminDatabase
+
+SECOND = '2024-05-01 12:00:00'
+
+@pytest.fixture
+def db(tmp_path):
+    database = AdminDatabase(str(tmp_path / 'search.db'))
+    with database._get_connection() as conn:
+        conn.executemany(
+            'INSERT INTO activity_log (user_id, activity_type, details, timestamp) VALUES (?, ?, ?, ?)',
+            [(1, 'security', f"security event {i}", SECOND) for i in range(50)]
+        )
+        conn.commit()
+    yield database
+    database.close()
+
+@pytest.mark.parametrize('bounds', [
+    {},
+    {'since': '2000-01-01'},
+    {'until': '2100-01-01'},
+    {'since': SECOND, 'until': '2024-05-01 12:00:01'},
+])
+def test_time_bounds_keep_rows_from_the_same_second(db, bounds):
+    assert len(db.search_activities('security', limit=100, **bounds)) == 50
+
+def test_time_bounds_exclude_rows_outside(db):
+    assert db.search_activities('security', since='2024-05-01 12:00:01') == []
+    assert db.search_activities('security', until=SECOND) == []